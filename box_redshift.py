@@ -33,7 +33,7 @@ import traceback
     "posting_agent":"Name of the column which will store source box file name as value in Table",
     "required_excel_features":"any extra attributes need to read_excel can be added here as a dict eg - {'method':'value'}",
     "required_csv_features":"any extra attributes need to read_csv can be added here as a dict eg - {'method':'value'}",
-    "load_type":"incremental/truncate_and_load/fullload",
+    "load_type":"incremental/truncate_and_load/swap/fullload",
     "s3_touch_file_name":"Name of the touch file to be created in S3",
     "touch_file_type":"File type",
     "touch_file_s3_profile":"S3 profile where touch file has to be created",
@@ -45,7 +45,9 @@ import traceback
     "utils_path":"Path to the utility py file which has logging and alert feature on failure compulsory input in config",
     "redshift_profile":"Redshift profile ",
     "archive_folder":"This has to only be added in config is archival is required or else this field can be removed completely",
-    "primary_key":"Only need for incremental should be kept as empty if not required config expects this parameter"
+    "primary_key":"Only need for incremental should be kept as empty if not required config expects this parameter",
+    "insert_method":"to_sql / copy - copy stages the data in S3 and loads it with a single COPY statement, by default it is to_sql",
+    "copy_config":"Only needed if insert_method is copy, eg - {'s3_profile':'S3 profile','bucket':'Staging bucket','prefix':'Staging prefix','iam_role':'Redshift IAM role arn','file_format':'parquet / csv'}"
 }
 
 
@@ -216,7 +218,7 @@ class DataFetcher:
                     df.columns = pd.Series(df.columns).str.lower()
                 df[self.config["ingestion_audit_field"]] = datetime.today()
                 if "schema_name" and "main_table" in self.config:
-                    Database(load_type=self.config["load_type"],logger=logger,config=self.config["redshift_config"],profile=self.config["redshift_profile"],data=df,schema=self.config["schema_name"],main_table_name=self.config["main_table"],stage_table_name=self.config["stage_table"],primary_key=self.config["primary_key"])
+                    Database(load_type=self.config["load_type"],logger=logger,config=self.config["redshift_config"],profile=self.config["redshift_profile"],data=df,schema=self.config["schema_name"],main_table_name=self.config["main_table"],stage_table_name=self.config["stage_table"],primary_key=self.config["primary_key"],insert_method=self.config.get("insert_method","to_sql"),copy_config=self.config.get("copy_config",None)).load()
                 if "archive_folder" in self.config:
                     self.move_to_archive(client,items)
                 if "s3_touch_file_name" and "touch_file_s3_bucket_name" in self.config:
@@ -31,7 +31,6 @@ import os
 from io import BytesIO
 from boxsdk import JWTAuth, Client
 import traceback
-import boto3
 import argparse
 import json
 
@@ -76,8 +75,8 @@ def box_s3(client, folder_id):
                     obj = config["s3_prefix"] + f"/year={year}/month={month}/day={day}/" + config["file_name"]
                 else:
                     obj = config["s3_prefix"] +"/"+ config["file_name"]
-                session = boto3.Session(profile_name=config["s3_profile"])
-                s3 = session.client('s3')
+                from s3_connector import S3Connector # Shared client, reused across files and runs in the process
+                s3 = S3Connector(logger=logger, profile_name=config["s3_profile"]).s3_client
                 s3.upload_fileobj(buffer,config["bucket_name"],obj)
                 logger.info(f"{config['file_name']} uploaded to S3 successfully")
                 break  # Exit loop after finding the file
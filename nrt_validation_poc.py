@@ -21,13 +21,14 @@ class Validation() :
             self.logger.error(f"S3 Connection Failed with error -> {str(e)}", exc_info=True)
             raise
         try:
-            from redshift_connector import get_connection
-            self.engine :object  = get_connection(filepath=config["db_config_path"], profile=config["db_profile"] ,logger=self.logger)
+            from engine_registry import get_engine
+            self.engine :object  = get_engine(config=config["db_config_path"], profile=config["db_profile"] ,logger=self.logger)
             self.logger.info("Database Connection Successful")
             self.files_metadata :pd.DataFrame  = self.metadata_filenames_fetcher()
             self.logger.info("Metadata Details fetched successfully")
             self.s3_landing_prefix :str= self.files_metadata["landing_path"].unique()[0]
             self.file_names_pattern :list = self.files_metadata["file_name_pattern"].tolist()
+            self.pending_moves :list = [] # (source_key, destination_key) pairs moved in bulk once the landing directory is validated
             self.source_file_fetcher()
         except Exception as e:
             self.logger.error(f"Database Connection Failed with error -> {str(e)}", exc_info=True)
@@ -89,18 +90,36 @@ class Validation() :
             self.logger.error(f"Failed to execute log_table_updation method with error -> {str(e)}", exc_info=True)
             raise
 
-    def move_s3_files(self, source_bucket :str, destination_bucket :str, source_key :str, destination_key :str):
+    def move_s3_files(self, source_bucket :str, destination_bucket :str, moves :list) -> list:
         """
         """
         try:
-            self.logger.info("Executed move_s3_files method")
-            self.logger.info(f"sourcebucket:{source_bucket} \n destinationbucket:{destination_bucket} \n sourcekey:{source_key} \n destinationkey:{destination_key}")
-            self.s3_session.s3_to_s3_move(source_bucket=source_bucket, dest_bucket=destination_bucket, source_key=source_key, dest_key=destination_key)
-            self.logger.info("File Moved Successfully")
+            self.logger.info(f"Executed move_s3_files method for {len(moves)} files")
+            for source_key, destination_key in moves:
+                self.logger.info(f"sourcebucket:{source_bucket} \n destinationbucket:{destination_bucket} \n sourcekey:{source_key} \n destinationkey:{destination_key}")
+            report = self.s3_session.bulk_move(pairs=[(source_bucket, source_key, destination_bucket, destination_key) for source_key, destination_key in moves])
+            failed = [result for result in report if result["status"] != "moved"]
+            if failed:
+                raise Exception(f"{len(failed)} of {len(report)} files failed to move \n {failed}")
+            self.logger.info("Files Moved Successfully")
+            return report
         except Exception as e:
             self.logger.error(f"Failed to execute move_s3_files method with error -> {str(e)}",exc_info=True)
             raise
 
+    def flush_pending_moves(self, raise_errors :bool = True):
+        """
+        """
+        if not self.pending_moves:
+            return
+        moves, self.pending_moves = self.pending_moves, []
+        try:
+            self.move_s3_files(source_bucket=config["s3_bucket_name"], destination_bucket=config["s3_bucket_name"], moves=moves)
+        except Exception as e:
+            if raise_errors:
+                raise
+            self.logger.error(f"Failed to move pending files after an earlier error with error -> {str(e)}")
+
     def metadata_filenames_fetcher(self) -> pd.DataFrame:
         """
         """
@@ -130,18 +149,23 @@ class Validation() :
             s3_response = s3_connector.list_objects_v2(Bucket = config["s3_bucket_name"],Prefix= self.s3_landing_prefix, Delimiter='/')
             contents = s3_response.get("Contents",None)
             if contents:
-                for content in contents:
-                    key :str= content.get("Key",None)
-                    if key:
-                        file_name = key.split("/")[-1]
-                        filepattern = file_name.split("-")[0]
-                        file_extension = file_name.split(".")[-1]
-                        if filepattern in self.file_names_pattern:
-                            file_types = {"txt": "text", "xlsx": "excel"}
-                            file_type = file_types.get(file_extension, file_extension)
-                            data_frame = self.s3_session.getobject_s3(bucket_name=config["s3_bucket_name"],key= key ,file_type=file_type)
-                            self.column_metadata_validation(df=data_frame, file_pattern=filepattern, file_name=file_name, s3_key=key)
-                    else:raise KeyError(f"Key missing in S3 response \n Contents: {contents}")
+                try:
+                    for content in contents:
+                        key :str= content.get("Key",None)
+                        if key:
+                            file_name = key.split("/")[-1]
+                            filepattern = file_name.split("-")[0]
+                            file_extension = file_name.split(".")[-1]
+                            if filepattern in self.file_names_pattern:
+                                file_types = {"txt": "text", "xlsx": "excel"}
+                                file_type = file_types.get(file_extension, file_extension)
+                                data_frame = self.s3_session.getobject_s3(bucket_name=config["s3_bucket_name"],key= key ,file_type=file_type)
+                                self.column_metadata_validation(df=data_frame, file_pattern=filepattern, file_name=file_name, s3_key=key)
+                        else:raise KeyError(f"Key missing in S3 response \n Contents: {contents}")
+                except Exception:
+                    self.flush_pending_moves(raise_errors=False) # Files already logged are moved even if a later file fails, without hiding its error
+                    raise
+                self.flush_pending_moves()
             else:raise KeyError(f"Contents missing in S3 response \n Response: {s3_response}")
         except Exception as e:
             self.logger.error(f"Failed to execute source_file_fetcher method with error -> {str(e)}",exc_info=True)
@@ -190,7 +214,7 @@ class Validation() :
                 load_status = "validation_success" if validation else "validation_failed"
                 self.logger.info(f"{load_status.title().replace('_',' ')} for {file_name} \n Moving to {'Processing Path' if validation else 'Rejected Path'} {config['s3_bucket_name']}/{destination_path}")
                 self.log_table_updation(entry_type=entry_type, load_status=load_status, stream_id=stream_id, file_name=file_name)
-            self.move_s3_files(source_bucket=config["s3_bucket_name"], destination_bucket=config["s3_bucket_name"], source_key=s3_key, destination_key=destination_path+file_name)
+            self.pending_moves.append((s3_key, destination_path+file_name))
         except Exception as e:
             self.logger.error(f"Failed to execute column_metadata_validation method for {file_name} with error -> {str(e)}",exc_info=True)
             raise
@@ -20,6 +20,7 @@
     "log_insert_sql_path":"Path to Insert Query SQL File",
     "s3_bucket_name":"S3 Bucket Name",
     "s3_profile_name":"S3 Profile Name",
+    "s3_cache_dir":"Optional local folder to cache landing files by ETag so reruns only re-validate with a HEAD request",
     "utils_path":"Path to utility folder where modules are deployed",
     "log_file":"Path to Log file folder where this script execution will be logged and saved",
     "add_on_email_stake_holders":"Additional email recipients to receive Success/Failure email along with pre-defined recipients"
@@ -55,8 +56,8 @@ class Validation() :
         - Moves files to the processing or rejected path based on the validation status.
 
     **_Note_**
-    - This class makes use of **_S3Operations_** and **_S3Connector_** classes imported from `s3_operations` and `s3_connector` Modules respectively.
-    - This class makes use of **_get_connection_** method imported from `redshift_connector` Module.
+    - This class makes use of **_S3Operations_** class imported from `s3_operations` Module.
+    - This class makes use of **_get_engine_** method imported from `engine_registry` Module.
     - This class makes use of **_setup_logger_** and **_send_email_notification_** functions imported from `utils` Module.
     - This class executes queries on database using only `.sql` files provide in config.
     """
@@ -82,14 +83,15 @@ class Validation() :
             self.s3_bucket_name = self.config["s3_bucket_name"]
             self.adjust_logging_levels(logger=self.logger)
             from s3_operations import S3Operations # Importing S3Operations class from s3_operations.py
-            self.s3_session :object = S3Operations(logger=self.logger, profile_name=self.s3_profile_name ,partition="N")
+            self.s3_session :object = S3Operations(logger=self.logger, profile_name=self.s3_profile_name ,partition="N", cache_dir=self.config.get("s3_cache_dir",None))
+            self.pending_moves :list = [] # (source_key, destination_key) pairs moved in bulk once the landing directory is validated
             self.logger.info("S3 Connection Successful")
         except Exception as e :
             self.logger.error(f"S3 Connection Failed with error -> {str(e)}", exc_info=True)
             raise
         try:
-            from redshift_connector import get_connection
-            self.engine :object= get_connection(filepath=self.config["db_config_path"], profile=self.config["db_profile"], logger=self.logger)
+            from engine_registry import get_engine
+            self.engine :object= get_engine(config=self.config["db_config_path"], profile=self.config["db_profile"], logger=self.logger)
             self.files_metadata :pd.DataFrame  = sql_query_executor(query=sql_file_reader(logger=self.logger, sql_file_path=self.config["metadata_fetcher"]).format(metadata_stream_control_table=config["metadata_stream_control_table"]), logger=self.logger, engine=self.engine)
             self.logger.info("Metadata Details fetched successfully")
             rounded_minutes = "00" if datetime.now().minute <= 30 else "30"
@@ -116,33 +118,60 @@ class Validation() :
         logging.getLogger('urllib3').setLevel(logging.WARNING)
         logger.info("Logger setup completed. Debug logs from boto3 are suppressed.")
 
-    def move_s3_files(self, source_bucket :str, destination_bucket :str, source_key :str, destination_key :str) -> None:
+    def move_s3_files(self, source_bucket :str, destination_bucket :str, moves :list) -> list:
         """
         Moves files from one S3 bucket to another.
 
-        This Method will first copy the file from **Source Path** to **Destination Path** and file will be **_DELETED_** in **Source Path**
+        This Method will first copy the files from **Source Path** to **Destination Path** concurrently and files will be **_DELETED_** in **Source Path** in batches.
 
         **_Note_**
-        - This method makes use of **_s3_to_s3_move_** method imported from `S3_Operations` Module.
+        - This method makes use of **_bulk_move_** method imported from `S3_Operations` Module.
 
         Parameters:
             source_bucket (str)      : Source S3 bucket name.
             destination_bucket (str) : Destination S3 bucket name.
-            source_key (str)         : File key in the source bucket.
-            destination_key (str)    : File key in the destination bucket.
+            moves (list)             : List of (source_key, destination_key) tuples.
+
+        Returns:
+            report (list) : Per file result of the move.
 
         Raises:
-            Exception : If the file move operation fails.
+            Exception : If the file move operation fails for any file.
         """
         try:
-            self.logger.info("Executed move_s3_files method")
-            self.logger.info(f"sourcebucket:{source_bucket} \n destinationbucket:{destination_bucket} \n sourcekey:{source_key} \n destinationkey:{destination_key}")
-            self.s3_session.s3_to_s3_move(source_bucket=source_bucket, dest_bucket=destination_bucket, source_key=source_key, dest_key=destination_key)
-            self.logger.info("File Moved Successfully")
+            self.logger.info(f"Executed move_s3_files method for {len(moves)} files")
+            for source_key, destination_key in moves:
+                self.logger.info(f"sourcebucket:{source_bucket} \n destinationbucket:{destination_bucket} \n sourcekey:{source_key} \n destinationkey:{destination_key}")
+            report = self.s3_session.bulk_move(pairs=[(source_bucket, source_key, destination_bucket, destination_key) for source_key, destination_key in moves])
+            failed = [result for result in report if result["status"] != "moved"]
+            if failed:
+                raise Exception(f"{len(failed)} of {len(report)} files failed to move \n {failed}")
+            self.logger.info("Files Moved Successfully")
+            return report
         except Exception as e:
             self.logger.error(f"Failed to execute move_s3_files method with error -> {str(e)}",exc_info=True)
             raise
 
+    def flush_pending_moves(self, raise_errors :bool = True) -> None:
+        """
+        Moves the files queued by column_metadata_validation in bulk and clears the queue.
+
+        Parameters:
+            raise_errors (bool) : Raises move failures when True, only logs them when False (used while another error is being raised).
+
+        Raises:
+            Exception : If any file fails to move and raise_errors is True.
+        """
+        if not self.pending_moves:
+            return
+        moves, self.pending_moves = self.pending_moves, []
+        try:
+            self.move_s3_files(source_bucket=self.s3_bucket_name, destination_bucket=self.s3_bucket_name, moves=moves)
+        except Exception as e:
+            if raise_errors:
+                raise
+            self.logger.error(f"Failed to move pending files after an earlier error with error -> {str(e)}")
+
     def source_file_fetcher(self) -> None:
         """
         Fetches files from S3 landing directory, matches file patterns, and triggers validation.
@@ -154,27 +183,25 @@ class Validation() :
         try:
             self.logger.info("Executing source_file_fetcher method")
             matched_files = []
-            from s3_connector import S3Connector # Importing S3Connector class from s3_connector.py
-            s3_connector :object = S3Connector(logger=logger, profile_name=self.s3_profile_name).s3_client
-            s3_response = s3_connector.list_objects_v2(Bucket=self.s3_bucket_name, Prefix= self.s3_landing_prefix, Delimiter='/')
-            contents = s3_response.get("Contents",None)
-            if contents:
-                for content in contents:
-                    key :str= content.get("Key",None)
-                    if key:
-                        file_name = key.split("/")[-1]
-                        filepattern = file_name.split("-")[0]
-                        file_extension = file_name.split(".")[-1]
-                        if filepattern in self.file_names_pattern:
-                            matched_files.append(filepattern)
-                            file_types = {"txt": "text", "xlsx": "excel"}
-                            file_type = file_types.get(file_extension, file_extension) # Defaults to file_extension if not found in dictionary: file_types
-                            data_frame = self.s3_session.getobject_s3(bucket_name=self.s3_bucket_name,key= key ,file_type=file_type)
-                            self.column_metadata_validation(df=data_frame, file_pattern=filepattern, file_name=file_name, s3_key=key)
-                    else:
-                        self.logger.warning(f"No Files found in s3://{self.s3_bucket_name}/{self.s3_landing_prefix}")
-            else:
-                raise KeyError(f"Contents missing in S3 response \n Response: {s3_response}")
+            listed_files = 0
+            try:
+                for key in self.s3_session.iter_files(bucket=self.s3_bucket_name, prefix=self.s3_landing_prefix): # Pages through the landing prefix lazily
+                    listed_files += 1
+                    file_name = key.split("/")[-1]
+                    filepattern = file_name.split("-")[0]
+                    file_extension = file_name.split(".")[-1]
+                    if filepattern in self.file_names_pattern:
+                        matched_files.append(filepattern)
+                        file_types = {"txt": "text", "xlsx": "excel"}
+                        file_type = file_types.get(file_extension, file_extension) # Defaults to file_extension if not found in dictionary: file_types
+                        data_frame = self.s3_session.getobject_s3(bucket_name=self.s3_bucket_name,key= key ,file_type=file_type)
+                        self.column_metadata_validation(df=data_frame, file_pattern=filepattern, file_name=file_name, s3_key=key)
+            except Exception:
+                self.flush_pending_moves(raise_errors=False) # Files already logged are moved even if a later file fails, without hiding its error
+                raise
+            self.flush_pending_moves()
+            if not listed_files:
+                raise KeyError(f"Contents missing in S3 response for s3://{self.s3_bucket_name}/{self.s3_landing_prefix}")
             no_files_processed = set(self.file_names_pattern) - set(matched_files)
             if no_files_processed:
                 log_file_size= os.path.getsize(log_path)
@@ -194,7 +221,7 @@ class Validation() :
 
     def column_metadata_validation(self, df :pd.DataFrame, file_pattern :str, s3_key :str, file_name :str) -> None:
         """
-        Validates column names of the file against the metadata table mapped column names and moves files accordingly.
+        Validates column names of the file against the metadata table mapped column names and queues the file to be moved accordingly, files are moved in bulk by **_source_file_fetcher_** once every file is validated.
 
         This method performs the following operations:
         - Fetches metadata from the metadata table based on the file pattern.
@@ -280,7 +307,7 @@ class Validation() :
                 source_count = source_count
                 )
             sql_query_executor(engine=self.engine, logger=self.logger, query=query)
-            self.move_s3_files(source_bucket=self.s3_bucket_name, destination_bucket=self.s3_bucket_name, source_key=s3_key, destination_key=destination_path+file_name)
+            self.pending_moves.append((s3_key, destination_path+file_name))
         except Exception as e:
             self.logger.error(f"Failed to execute column_metadata_validation method for {file_name} with error -> {str(e)}",exc_info=True)
             raise
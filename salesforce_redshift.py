@@ -21,7 +21,9 @@
         "schema_name":"target schema name",
         "pagination":"If pagination is required or not as Y/N ",
         "incremental_column":"Audit date column available in source used for incremental load",
-        "log_path":"Log folder path without file name"
+        "log_path":"Log folder path without file name",
+        "rate_limit":"Optional [requests per second, burst] shared by every job on the machine querying the same instance, not throttled if not provided",
+        "rate_limit_path":"Optional SQLite file where the rate limit state is shared between jobs, by default api_rate_limiter.sqlite in the temp folder"
 
 }
 
@@ -33,7 +35,7 @@ import requests,argparse,json
 import pandas as pd
 from datetime import datetime
 from sqlalchemy import types
-import urllib3,os,sys
+import urllib3,os,sys,re
 from io import BytesIO
 import boto3
 import pyarrow as pa
@@ -93,16 +95,29 @@ class DataFetcher():
         self.logger.info(f"Generated token to Connect Source - {source}")
         return session_id,instance_url
 
-    def paginate_data_from_saas(self):
+    def paginate_data_from_saas(self,session_id,instance_url,query,api_version):
         """
         A method to perform paginate the response given by Source to fetch all the records in all pages without data loss
 
-        This method is yet to be created by considering future requirement this will be added
-        Parameter:None
+        Pages are followed through nextRecordsUrl of the Salesforce REST query API lazily, the next page is requested while the current one is being normalized
+        Parameter:
+        session_id (str)   : Token generated by authentication to connect with instace_url
+        instance_url (str) : API url of the source post authentication
+        query (str)        : SOQL query to be executed
+        api_version (str)  : Salesforce API version
 
-        Returns:None
+        Returns:
+        df (DataFrame)     : Generator of one DataFrame per page
         """
-        self.logger.info("Paginate_function to be added")
+        paginator = SalesforcePaginator(self.logger, prefetch=True)
+        rate_limiter = get_rate_limiter(self.logger, default_limit=self.config["rate_limit"], state_path=self.config.get("rate_limit_path")) if self.config.get("rate_limit") else None
+        with ApiRequest(self.logger, rate_limiter=rate_limiter) as api:
+            for page in paginator.pages(api, f"{instance_url}/services/data/v{api_version}/query", headers={"Authorization": f"Bearer {session_id}"}, params={"q": query}):
+                records = paginator.records(page)
+                for record in records:
+                    record.pop('attributes', None)
+                self.logger.info(f"Fetched {len(records)} of {page.get('totalSize')} records")
+                yield pd.json_normalize(records)
 
     def get_data_from_saas(self,session_id,instance_url,loadtype,source):
         """
@@ -115,8 +130,8 @@ class DataFetcher():
         source (str)       : Source we are trying to connect to fetch response
 
         Returns:
+        pages (generator)  : Response of the object conneted to Source as one DataFrame per page, fetched while it is consumed
         fields (dict)      : Fieldname,DataType as key:value pair obtained from source for the respective object
-        df(DataFrame)      : Response of the object conneted to Source that has been converted to DataFrame
         lengths (dict)     : Fieldname,Data length as key:value pair obtained from source for the respective object
         """
         self.logger.info(f"Connecting to Source {source}")
@@ -132,52 +147,101 @@ class DataFetcher():
             self.logger.info(f"Proceeding with {loadtype}")
             query=self.engine.execute(f"select max({self.config['incremental_column']}) from {self.config['schema_name']}.{self.config['table_name']}")
             lastdate=query.scalar()
-            query_result = sf.query_all(f"{self.config['soql_query']} and {self.config['incremental_column']} > {str(lastdate).replace(' ','T')}")
+            query = f"{self.config['soql_query']} and {self.config['incremental_column']} > {str(lastdate).replace(' ','T')}"
         else:
             self.logger.info(f"Proceeding with {loadtype}")
-            query_result = sf.query_all(self.config["soql_query"])
-        for records in query_result['records']:
-            records.pop('attributes')
-        df=pd.json_normalize(query_result['records'])
-        return df,fields,lengths
+            query = self.config["soql_query"]
+        pages=self.paginate_data_from_saas(session_id,instance_url,query,sf.sf_version)
+        return pages,fields,lengths
+
+    @staticmethod
+    def soql_columns(query):
+        """
+        A static method to read the columns selected by a SOQL query, lower cased as they are loaded
 
-    def transformation(self, fields, dataframe,lengths):
+        Parameters:
+        query (str) : SOQL query
+
+        Returns:
+        columns (list) : Selected field paths (eg id, account.name) or None if the select list has subqueries, functions or aliases
+        """
+        match=re.match(r"\s*select\s+(.+?)\s+from\s", query, re.IGNORECASE | re.DOTALL)
+        if not match:
+            return None
+        columns=[column.strip().lower() for column in match.group(1).split(",")]
+        return columns if all(re.fullmatch(r"[a-z_][\w.]*", column) for column in columns) else None
+
+    def transformation(self, fields, pages,lengths):
         """
         A method to compare data types with source and do any conversions in the DataFrame if required and convert the DataFrame to Parquet file. If table is new, it will also create necessary tables to proceed with ingestion.
 
+        Pages are converted and written to the Parquet file one row group at a time, so only one page is held in memory.
+        The columns are the ones selected by the SOQL query (the first page's if the select list cannot be read), a page returning any other column fails the load.
+        Columns empty on the first page take the type of their Salesforce field, every page is cast to the same schema.
+
         Parameters:
         fields (dict)          : Fieldname, DataType as key:value pair obtained from source for the respective object
-        dataframe (DataFrame)  : DataFrame of the response data given by API call for the required object
+        pages (generator)      : DataFrame per page of the response data given by API call for the required object
         lengths (dict)         : Fieldname,Data length as key:value pair obtained from source for the respective object
 
         Returns:
-        parquet_data (parquet) : DataFrame converted into Parquet data post conversions
+        parquet_data (parquet) : DataFrame converted into Parquet data post conversions, None if no records were fetched
         """
         self.logger.info("Performing data type conversion")
-        for column, dtype in dataframe.dtypes.items():
-            field_type = fields.get(column)
-            if field_type:
-                if field_type == 'int' and not pd.api.types.is_integer_dtype(dtype):
-                    dataframe[column] = dataframe[column].astype('int')
-                elif field_type in ['double', 'currency', 'percent'] and not pd.api.types.is_float_dtype(dtype):
-                    dataframe[column] = dataframe[column].astype('float')
-                elif 'date' in field_type and not pd.api.types.is_datetime64_any_dtype(dtype):
-                    dataframe[column] = pd.to_datetime(dataframe[column])
-                elif 'boolean' == field_type and not pd.api.types.is_bool_dtype(dtype):
-                    dataframe[column]=dataframe[column].astype('bool')
-        dataframe["timestamp"]=pd.to_datetime(datetime.now())
-        dataframe.columns=pd.Series(dataframe.columns).str.lower()
-        self.logger.info("Converting DataFrame to Parquet file")
-        table = pa.Table.from_pandas(dataframe,preserve_index=False)
+        timestamp=pd.to_datetime(datetime.now())
+        arrow_types={'int': pa.int64(), 'double': pa.float64(), 'currency': pa.float64(), 'percent': pa.float64(), 'boolean': pa.bool_(), 'date': pa.timestamp('ns'), 'datetime': pa.timestamp('ns')}
+        field_types={name.lower(): field_type for name, field_type in fields.items()}
+        columns=self.soql_columns(self.config["soql_query"])
+        if columns is not None:
+            columns.append("timestamp")
         parquet_data = BytesIO()
-        pq.write_table(table, parquet_data)
+        writer=None
+        records=0
+        try:
+            for page_number, dataframe in enumerate(pages, start=1):
+                if dataframe.empty:
+                    continue
+                for column, dtype in dataframe.dtypes.items():
+                    field_type = fields.get(column)
+                    if field_type:
+                        if field_type == 'int' and not pd.api.types.is_integer_dtype(dtype):
+                            dataframe[column] = dataframe[column].astype('int')
+                        elif field_type in ['double', 'currency', 'percent'] and not pd.api.types.is_float_dtype(dtype):
+                            dataframe[column] = dataframe[column].astype('float')
+                        elif 'date' in field_type and not pd.api.types.is_datetime64_any_dtype(dtype):
+                            dataframe[column] = pd.to_datetime(dataframe[column])
+                        elif 'boolean' == field_type and not pd.api.types.is_bool_dtype(dtype):
+                            dataframe[column]=dataframe[column].astype('bool')
+                dataframe["timestamp"]=timestamp
+                dataframe.columns=pd.Series(dataframe.columns).str.lower()
+                if columns is None:
+                    columns=list(dataframe.columns)
+                # A null lookup comes back as the relationship itself (eg account) instead of its selected fields (eg account.name)
+                null_relationships={column for column in dataframe.columns if column not in columns and any(selected.startswith(f"{column}.") for selected in columns)}
+                unknown=set(dataframe.columns)-set(columns)-null_relationships
+                if unknown:
+                    raise ValueError(f"Columns {sorted(unknown)} returned on page {page_number} are not selected by the SOQL query / returned on the first page")
+                dataframe=dataframe.reindex(columns=columns)
+                page_table=pa.Table.from_pandas(dataframe,preserve_index=False)
+                if writer is None:
+                    first_page=dataframe.head(0)
+                    schema=pa.schema([pa.field(name, arrow_types.get(field_types.get(name), pa.string()) if column.null_count == len(column) else column.type) for name, column in zip(page_table.column_names, page_table.columns)])
+                    writer=pq.ParquetWriter(parquet_data, schema)
+                writer.write_table(pa.table([column.cast(field.type) for column, field in zip(page_table.columns, writer.schema)], schema=writer.schema))
+                records+=len(dataframe)
+                self.logger.info(f"Converted {records} records to Parquet file")
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            return None
         parquet_data.seek(0)
         query = self.engine.execute(f"""SELECT EXISTS (SELECT * FROM information_schema.tables WHERE table_schema='{self.config["schema_name"]}' and table_name='{self.config["table_name"]}_stg')""")
         result = query.scalar()
         if result==False:
-            dataframe.head(0).to_sql(name=f"{self.config['table_name']}",schema=self.config['schema_name'],if_exists='replace',index=False,con=self.con,dtype=self.sqlcol(dataframe,lengths))
+            first_page.to_sql(name=f"{self.config['table_name']}",schema=self.config['schema_name'],if_exists='replace',index=False,con=self.con,dtype=self.sqlcol(first_page,lengths))
             self.logger.info(f"{self.config['schema_name']}.{self.config['table_name']} has been created")
-            dataframe.head(0).to_sql(name=f"{self.config['table_name']}_stg",schema=self.config['schema_name'],if_exists='replace',index=False,con=self.con,dtype=self.sqlcol(dataframe,lengths))
+            first_page.to_sql(name=f"{self.config['table_name']}_stg",schema=self.config['schema_name'],if_exists='replace',index=False,con=self.con,dtype=self.sqlcol(first_page,lengths))
             self.logger.info(f"{self.config['schema_name']}.{self.config['table_name']}_stg has been created")
         return parquet_data
 
@@ -250,10 +314,10 @@ class DataFetcher():
         if self.config['pagination']=='N':
             data,fields,lengths = self.get_data_from_saas(session_id=session_id, instance_url=instance_url, loadtype=loadtype,source=source)
         # else:pass
-        if data.empty:
+        parq_data = self.transformation(fields=fields, pages=data,lengths=lengths)
+        if parq_data is None:
             self.logger.info("No incremental data to pull")
         else:
-            parq_data = self.transformation(fields=fields, dataframe=data,lengths=lengths)
             Bucket, Key = self.parq_to_s3(parquet_data=parq_data)
             self.copy_redshift(bucket=Bucket, key=Key,loadtype=loadtype)
             self.logger.info("Ingestion Completed")
@@ -269,6 +333,8 @@ if __name__=="__main__":
     parent_path = os.path.dirname(os.path.abspath(__file__))
     sys.path.append(ingestion_config['utils_path'])
     from utils import setup_logger,send_email_notification,get_connection
+    from api_connector import ApiRequest, SalesforcePaginator
+    from rate_limiter import get_rate_limiter
     log_filename = str(arguments.infile[1].name).split('/')[-1].replace('json', 'log')
     logger = setup_logger(os.path.join(ingestion_config["log_path"], log_filename))
     logger.info("Ingestion Started")
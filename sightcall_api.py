@@ -6,8 +6,9 @@ from utils import setup_logger, get_connection,send_email_notification
 import urllib3
 from sqlalchemy import types
 from datetime import datetime
-import aiohttp
 import asyncio
+from api_connector import AsyncApiRequest, NextLinkPaginator
+from rate_limiter import get_rate_limiter
  
 class DataFetcher:
     def __init__(self, config, engine, logger):
@@ -23,37 +24,35 @@ class DataFetcher:
                 dtypedict.update({i: types.VARCHAR(5000, collation='case_insensitive')})
         return dtypedict
  
-    async def fetch_data(self,api_url, headers, session):
+    async def fetch_data(self,api_url, headers, api):
         all_data = []
-        while api_url:
-            async with session.get(api_url, headers=headers,ssl=False) as response:
-                if response.status == 200:
-                    json_data = await response.json()
-                    current_page_data = json_data["data"]
-                    if current_page_data:
-                        all_data.extend(current_page_data)
-                    next_link = json_data.get("links", {}).get("next")
-                    api_url = next_link if next_link else None
-                else:
-                    self.logger.info(f"Failure Api response--> {response.status}")
-                    break
+        paginator = NextLinkPaginator(self.logger, next_path=("links", "next"), records_key="data", prefetch=True)
+        try:
+            async for json_data in paginator.apages(api, api_url, headers=headers):
+                all_data.extend(paginator.records(json_data))
+        except Exception as e:
+            self.logger.info(f"Failure Api response--> {e}")
         return all_data
      
-    async def process_url(self, url, headers, region,name):
-        async with aiohttp.ClientSession() as session:
-            all_data = await self.fetch_data(url, headers, session)
-            if all_data:
-                df = pd.json_normalize(all_data)
-                df.columns = pd.Series(df.columns).replace('attributes.', '', regex=True)
-                df.columns = pd.Series(df.columns).replace(' ', '_', regex=True)
-                df["source"] = region
-                df = df.applymap(lambda x: str(x) if isinstance(x, list) else x)
-                df['hvr_last_upd_tms'] = datetime.now()
-                self.logger.info(f"{name} for {region} fetched - {df.shape[0]} records")
-                return df
+    async def process_url(self, url, headers, region,name, api):
+        all_data = await self.fetch_data(url, headers, api)
+        if all_data:
+            df = pd.json_normalize(all_data)
+            df.columns = pd.Series(df.columns).replace('attributes.', '', regex=True)
+            df.columns = pd.Series(df.columns).replace(' ', '_', regex=True)
+            df["source"] = region
+            df = df.applymap(lambda x: str(x) if isinstance(x, list) else x)
+            df['hvr_last_upd_tms'] = datetime.now()
+            self.logger.info(f"{name} for {region} fetched - {df.shape[0]} records")
+            return df
  
     async def run(self):
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        rate_limiter = get_rate_limiter(self.logger, default_limit=self.config["rate_limit"], state_path=self.config.get("rate_limit_path")) if self.config.get("rate_limit") else None # Quota shared with every other SightCall job on the machine
+        async with AsyncApiRequest(self.logger, concurrency=self.config.get("concurrency",20), limit_per_host=self.config.get("limit_per_host",10), ssl=False, rate_limiter=rate_limiter) as api: # One session shared by every region and url
+            await self.fetch_all(api)
+
+    async def fetch_all(self, api):
         for url in self.config["search_url"]:
             tasks = []
             name = str(url.split("/")[-1].split("?")[0]).lower()
@@ -61,7 +60,7 @@ class DataFetcher:
             self.logger.info(f"Running Async calls for {name}")
             for header in self.config["headers"]:
                 for region in header.keys():
-                    tasks.append(self.process_url(url,header[region], region,name))
+                    tasks.append(self.process_url(url,header[region], region,name, api))
             result=await asyncio.gather(*tasks)
             main_df=pd.DataFrame()
             for res in result:main_df=pd.concat([main_df,res])
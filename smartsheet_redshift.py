@@ -14,6 +14,10 @@
     "sheet_id":"SmartSheet ID If multiple sheets to be ingested to single table then provide all as comma seperated values",
     "url":"API Url to access SmartSheet",
     "auth_token":"Token to access api url",
+    "max_retries":"Retries of a failed Smartsheet API call with backoff, by default 5",
+    "rate_limit":"Optional [requests per second, burst] shared by every job on the machine using the same Smartsheet host, eg [5, 10] for the 300 requests per minute quota. Not throttled if not provided",
+    "rate_limit_path":"Optional SQLite file where the rate limit state is shared between jobs, by default api_rate_limiter.sqlite in the temp folder",
+    "http_cache_dir":"Optional local folder where the sheet versions of the last successful load are kept, the run is skipped when no sheet changed since. Always loads if not provided",
     "ingestion_audit_field":"Name of the audit column that will be added in redshift table",
     "redshift_config":"Path where redshift credentials are stored",
     "redshift_profile":"Redshift profile",
@@ -28,7 +32,9 @@
     "table_name / main_table":"Provide any one key and input as table name",
     "load_type":"If not provided in config by default it will be truncate_and_load",
     "posting_agent":"If posting agent is required provide the input values that will be stored in posting agent column"
-    "utils_path":"path where utils py file is placed to import functions in t"
+    "utils_path":"path where utils py file is placed to import functions in t",
+    "insert_method":"to_sql / copy - copy stages the data in S3 and loads it with a single COPY statement, by default it is to_sql",
+    "copy_config":"Only needed if insert_method is copy, eg - {'s3_profile':'S3 profile','bucket':'Staging bucket','prefix':'Staging prefix','iam_role':'Redshift IAM role arn','file_format':'parquet / csv'}"
 }"""
 
 ########### Importing Packages ###############
@@ -53,47 +59,53 @@ def auth(id: str, token: str) -> requests.Response:
     try:
         logger.info("Executing auth method")
         headers = { "Authorization": f"Bearer {token}" }
-        payload = {}
         url = f"{config['url']}{id}"
-        response = requests.request("GET", url, headers=headers, data=payload)
-        if response.status_code == 200:
-            logger.info("Authentication Successfull")
-            return response
-        else:
-            logger.info("Authentication Failed")
-            try:
-                error_message = response.json().get("message", "No message provided")
-            except ValueError:
-                error_message = "No valid JSON response"
-            error_info = f"Authentication failed. Status code: {response.status_code}. Message: {error_message}"
-            logger.error(error_info)
-            raise Exception(error_info)
+        response = api_request.get_request(url, headers=headers, additional_get_parameters={"stream": True}) # Pooled session, retries 429 / 5xx with backoff and raises on failure, body is streamed by data method
+        logger.info("Authentication Successfull")
+        return response
     except Exception as e:
         logger.error(f"Failed to execute auth method , error --> {e} {traceback.format_exc()}")
         raise
 
 
 
-def data(response):
+def sheet_columns(id: str, token: str) -> dict:
+    """
+    A method to fetch the column titles of a sheet, so the sheet body only has to stream its rows.
+
+    Parameters:
+    id (str)    : Sheet ID to fetch columns from via API
+    token (str) : Authentication Token used to hit the API
+
+    Returns:
+    columns (dict) : Column title per column ID
+    """
+    try:
+        logger.info("Executing sheet_columns method")
+        headers = { "Authorization": f"Bearer {token}" }
+        response = api_request.get_request(f"{config['url']}{id}/columns", headers=headers, additional_get_parameters={"params": {"includeAll": "true"}})
+        return {column['id']: column['title'] for column in api_request.decode(response)['data']}
+    except Exception as e:
+        logger.error(f"Failed to execute sheet_columns method , error --> {e} {traceback.format_exc()}")
+        raise
+
+def data(response, columns):
     """
     A method to gather data from the response received by hitting with column names and data
 
     Parameter:
     response (str) : Response received by hitting API
+    columns (dict) : Column title per column ID, see sheet_columns
 
     Returns:
     df (DataFrame) : DataFrame with column-specific values as defined in the config
     """
     try:
         logger.info("Executing data method")
-        data_cols = response.json().get('columns', [])
-        data_rows = response.json().get('rows', [])
         value_field = config.get("smartsheet_parsing_value", "value")
         empty_value = config.get("empty_value", '')
         individual_parsing_value = config.get("individual_parsing_value", {})
-        columns = {item['id']: item['title'] for item in data_cols}
-        records = []
-        for row in data_rows:
+        def parse_row(row):
             record = {}
             for cell in row['cells']:
                 column_title = columns.get(cell['columnId'])
@@ -103,7 +115,8 @@ def data(response):
                     field_type = value_field
                 cell_value = cell.get(field_type, empty_value)
                 record[column_title] = cell_value
-            records.append(record)
+            return record
+        records = [parse_row(row) for _, row in api_request.stream_arrays(response, arrays=("rows",))] # Only the rows are streamed, each row is built inside the ijson C backend
         logger.info("Records Fetched")
         df = pd.DataFrame(records)
         return df
@@ -132,13 +145,37 @@ def dataframe_to_redshift(df):
         drop_null_values=config.get("drop_null_values","n")
         if drop_null_values.lower()=='y':
             df=df.dropna(how='all')
-        Database(load_type=config.get("load_type","truncate_and_load"),logger=logger,config=config["redshift_config"],profile=config["redshift_profile"],data=df,schema=config["schema_name"],main_table_name=table_name,stage_table_name=config.get("stage_table",None),primary_key=config.get("primary_key",None))
+        Database(load_type=config.get("load_type","truncate_and_load"),logger=logger,config=config["redshift_config"],profile=config["redshift_profile"],data=df,schema=config["schema_name"],main_table_name=table_name,stage_table_name=config.get("stage_table",None),primary_key=config.get("primary_key",None),insert_method=config.get("insert_method","to_sql"),copy_config=config.get("copy_config",None)).load()
         if "touch_file_name" in config:
             pass
     except Exception as e:
         logger.error(f"Failed to execute main method in dataframe_to_redshift method , error --> {e} {traceback.format_exc()}")
         raise
 
+def sheets_modified(sheets: list, token: str) -> bool:
+    """
+    A method to check with the lightweight version endpoint whether any sheet changed since the last successful load.
+
+    Parameters:
+    sheets (list) : Sheet IDs loaded together
+    token (str)   : Authentication Token used to hit the API
+
+    Returns:
+    modified (bool) : True if any sheet changed or has not been loaded yet, its version is staged in the HTTP cache until the load succeeds
+    """
+    try:
+        logger.info("Executing sheets_modified method")
+        headers = { "Authorization": f"Bearer {token}" }
+        modified = False
+        for sheet in sheets:
+            url = f"{config['url']}{sheet}"
+            version = api_request.get_request(f"{url}/version", headers=headers).json().get("version")
+            modified = http_cache.is_modified(url, {"version": version}, scope=f"{config['schema_name']}.{table_name}") or modified # Every sheet is checked so every new version is staged
+        return modified
+    except Exception as e:
+        logger.error(f"Failed to execute sheets_modified method , error --> {e} {traceback.format_exc()}")
+        raise
+
 def main():
     """
     A method to call other function accordingly to execute ingestion steps
@@ -149,10 +186,13 @@ def main():
     """
     try:
         logger.info("Executing main method")
+        if http_cache is not None and not sheets_modified(config["sheet_id"].split(','), config["auth_token"]):
+            logger.info("Source not modified since the last load, ingestion skipped")
+            return
         main_df=pd.DataFrame()
         for sheet in config["sheet_id"].split(','):
             api_response=auth(sheet,config["auth_token"])
-            df = pd.DataFrame(data(api_response))
+            df = pd.DataFrame(data(api_response, sheet_columns(sheet,config["auth_token"])))
             data_origin=config.get("data_origin",'default')
             if data_origin.lower()=='default':
                 df["data_orgin"]=sheet
@@ -163,6 +203,8 @@ def main():
             logger.info("Data Fetched")
             main_df=pd.concat([main_df,df])
         dataframe_to_redshift(main_df)
+        if http_cache is not None:
+            http_cache.commit() # Versions are only recorded once the load succeeded
         send_email_notification(message=f"Ingestion Sucessfull \n Script Path-> {os.path.abspath(__file__)} \n Config Path-> {arguments.infile[0].name}", subject=f"INFO - SUCCESS | {config['environment']} | {config.get('source','api')} Ingestion | SmartSheet ID - {config['sheet_id']} | {config['schema_name']}.{table_name} {config['redshift_profile']}",log_path=log_path,logger=logger,add_on_email_stake_holders=config.get("add_on_email_stake_holders", None))
         logger.info("Ingestion Completed")
     except Exception as e:
@@ -180,11 +222,17 @@ if __name__=="__main__":
         utils_path=os.path.join(utils_path,"utils/")
     sys.path.insert(0,utils_path)
     from utils import setup_logger, send_email_notification
+    from api_connector import ApiRequest
+    from rate_limiter import get_rate_limiter
+    from http_cache import get_http_cache
     from redshift_loader import Database
     log_filename = str(arguments.infile[0].name).split('/')[-1].replace('json', 'log')
     log_filename=str(log_filename.replace(".log",f"_{datetime.today().strftime('%Y_%m_%d_%H_%M_%S')}.log"))
     log_path=os.path.join(config["log_file"],log_filename)
     logger = setup_logger(log_path)
+    rate_limiter = get_rate_limiter(logger, default_limit=config["rate_limit"], state_path=config.get("rate_limit_path")) if config.get("rate_limit") else None
+    api_request = ApiRequest(logger=logger, max_retries=config.get("max_retries",5), rate_limiter=rate_limiter)
+    http_cache = get_http_cache(logger, config["http_cache_dir"]) if config.get("http_cache_dir") else None
     table_name=config.get("main_table")
     if not table_name:table_name=config["table_name"]
     try:
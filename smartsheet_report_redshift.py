@@ -14,6 +14,10 @@
     "sheet_id":"SmartSheet ID If multiple sheets to be ingested to single table then provide all as comma seperated values",
     "url":"API Url to access SmartSheet",
     "auth_token":"Token to access api url",
+    "max_retries":"Retries of a failed Smartsheet API call with backoff, by default 5",
+    "rate_limit":"Optional [requests per second, burst] shared by every job on the machine using the same Smartsheet host, eg [5, 10] for the 300 requests per minute quota. Not throttled if not provided",
+    "rate_limit_path":"Optional SQLite file where the rate limit state is shared between jobs, by default api_rate_limiter.sqlite in the temp folder",
+    "http_cache_dir":"Optional local folder where the report validators of the last successful load are kept, the run is skipped when no report changed since. Always loads if not provided",
     "ingestion_audit_field":"Name of the audit column that will be added in redshift table",
     "redshift_config":"Path where redshift credentials are stored",
     "redshift_profile":"Redshift profile",
@@ -24,59 +28,53 @@
     "table_name / main_table":"Provide any one key and input as table name",
     "load_type":"If not provided in config by default it will be truncate_and_load",
     "posting_agent":"If posting agent is required provide the input values that will be stored in posting agent column",
-    "utils_path":"path where utils py file is placed to import functions in t"
+    "utils_path":"path where utils py file is placed to import functions in t",
+    "insert_method":"to_sql / copy - copy stages the data in S3 and loads it with a single COPY statement, by default it is to_sql",
+    "copy_config":"Only needed if insert_method is copy, eg - {'s3_profile':'S3 profile','bucket':'Staging bucket','prefix':'Staging prefix','iam_role':'Redshift IAM role arn','file_format':'parquet / csv'}"
 }"""
 
 ########### Importing Packages ###############
-import requests,json
+import json
 import pandas as pd
 import argparse
 import os,sys
 from datetime import datetime
 import traceback
 
-def auth(id: str, token: str, page: int = 1) -> requests.Response:
+def auth(id: str, token: str):
     """
-    Fetches paginated response from Smartsheet API.
+    Fetches paginated response from Smartsheet API lazily, page by page.
 
     Parameters:
     id (str): Smartsheet ID to fetch data from.
     token (str): Authorization token for API access.
-    page (int): Page number to fetch.
 
-    Returns:
-    response (requests.Response): The response object from the API for the given page.
+    Yields:
+    payload (dict): Decoded pages of the report, the next page is requested while the current one is being processed.
     """
     try:
         logger.info("Executing auth method")
         headers = {"Authorization": f"Bearer {token}"}
-        url = f"{config['url']}{id}?pageSize=500&page={page}"
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            logger.info(f"Page {page} fetched successfully.")
-            return response
-        else:
-            logger.info("Authentication Failed")
-            error_message = response.json().get("message", "No message provided")
-            raise Exception(f"Authentication failed. Status code: {response.status_code}. Message: {error_message}")
+        paginator = PageNumberPaginator(logger, page_param="page", size_param="pageSize", page_size=500, records_key="rows", prefetch=True) # Stops on a page with less than 500 rows
+        yield from paginator.pages(api_request, f"{config['url']}{id}", headers=headers) # Failed page requests are raised here while the pages are consumed
     except Exception as e:
         logger.error(f"Failed to execute auth method, error --> {e} {traceback.format_exc()}")
         raise
 
-def data(response):
+def data(payload):
     """
     A method to gather data from the response received by hitting with column names and data
 
     Parameter:
-    response (str) : Response received by hitting API
+    payload (dict) : Decoded page received by hitting API
 
     Returns:
     records (List) : List of values as column:Value
     """
     try:
         logger.info("Executing data method")
-        data_cols = response.json()['columns']
-        data_rows = response.json()['rows']
+        data_cols = payload['columns']
+        data_rows = payload['rows']
         value = config.get("smartsheet_parsing_value","value")
         empty_value=config.get("empty_value",'')
         columns={}
@@ -118,13 +116,41 @@ def dataframe_to_redshift(df):
         drop_null_values=config.get("drop_null_values","n")
         if drop_null_values.lower()=='y':
             df=df.dropna(how='all')
-        Database(load_type=config.get("load_type","truncate_and_load"),logger=logger,config=config["redshift_config"],profile=config["redshift_profile"],data=df,schema=config["schema_name"],main_table_name=table_name,stage_table_name=config.get("stage_table",None),primary_key=config.get("primary_key",None))
+        Database(load_type=config.get("load_type","truncate_and_load"),logger=logger,config=config["redshift_config"],profile=config["redshift_profile"],data=df,schema=config["schema_name"],main_table_name=table_name,stage_table_name=config.get("stage_table",None),primary_key=config.get("primary_key",None),insert_method=config.get("insert_method","to_sql"),copy_config=config.get("copy_config",None)).load()
         if "touch_file_name" in config:
             pass
     except Exception as e:
         logger.error(f"Failed to execute main method in dataframe_to_redshift method , error --> {e} {traceback.format_exc()}")
         raise
 
+def reports_modified(reports: list, token: str) -> bool:
+    """
+    A method to check with a conditional one row page request (If-None-Match / If-Modified-Since) whether any report changed since the last successful load, comparing the ETag / Last-Modified headers and the version of the report when sent.
+
+    Parameters:
+    reports (list) : Report IDs loaded together
+    token (str)    : Authentication Token used to hit the API
+
+    Returns:
+    modified (bool) : True if any report changed, sends no validators or has not been loaded yet
+    """
+    try:
+        logger.info("Executing reports_modified method")
+        headers = {"Authorization": f"Bearer {token}"}
+        modified = False
+        for report in reports:
+            url = f"{config['url']}{report}"
+            try:
+                response = api_request.get_conditional(url, headers=headers, additional_get_parameters={"params": {"page": 1, "pageSize": 1}})
+            except NotModified:
+                continue # 304, the validators of the last load still hold
+            validators = {**HttpCache.response_validators(response), "version": response.json().get("version")}
+            modified = http_cache.is_modified(url, validators, scope=f"{config['schema_name']}.{table_name}") or modified # Every report is checked so every new validator is staged
+        return modified
+    except Exception as e:
+        logger.error(f"Failed to execute reports_modified method, error --> {e} {traceback.format_exc()}")
+        raise
+
 def main():
     """
     Calls other functions to execute ingestion steps with pagination.
@@ -133,12 +159,14 @@ def main():
     """
     try:
         logger.info("Executing main method")
+        if http_cache is not None and not reports_modified(config["sheet_id"].split(','), config["auth_token"]):
+            logger.info("Source not modified since the last load, ingestion skipped")
+            return
         main_df = pd.DataFrame()
         for sheet in config["sheet_id"].split(','):
-            page = 1
-            while True:
-                api_response = auth(sheet, config["auth_token"], page=page)
-                page_df = pd.DataFrame(data(api_response))
+            for page, payload in enumerate(auth(sheet, config["auth_token"]), start=1):
+                logger.info(f"Page {page} fetched successfully.")
+                page_df = pd.DataFrame(data(payload))
                 data_origin = config.get("data_origin", 'default')
                 if data_origin.lower() == 'default':
                     page_df["data_orgin"] = sheet
@@ -147,10 +175,9 @@ def main():
                 if "ingestion_audit_field" in config:
                     page_df[config["ingestion_audit_field"]] = datetime.today()
                 main_df = pd.concat([main_df, page_df], ignore_index=True)
-                if len(page_df)<500:
-                    break  # No more data to fetch
-                page += 1
         dataframe_to_redshift(main_df)
+        if http_cache is not None:
+            http_cache.commit() # Validators are only recorded once the load succeeded
         send_email_notification(message=f"Ingestion Sucessfull \n Script Path-> {os.path.abspath(__file__)} \n Config Path-> {arguments.infile[0].name}", subject=f"INFO - SUCCESS | {config['environment']} | {config.get('source','api')} Ingestion | SmartSheet ID - {config['sheet_id']} | {config['schema_name']}.{table_name} {config['redshift_profile']}",log_path=log_path,logger=logger,add_on_email_stake_holders=config.get("add_on_email_stake_holders", None))
         logger.info("Ingestion Completed")
     except Exception as e:
@@ -168,13 +195,19 @@ if __name__=="__main__":
         utils_path=os.path.join(utils_path,"utils/")
     sys.path.insert(0,utils_path)
     from utils import setup_logger, send_email_notification
+    from api_connector import ApiRequest, PageNumberPaginator
+    from rate_limiter import get_rate_limiter
+    from http_cache import HttpCache, NotModified, get_http_cache
     from redshift_loader import Database
     log_filename = str(arguments.infile[0].name).split('/')[-1].replace('json', 'log')
     log_filename=str(log_filename.replace(".log",f"_{datetime.today().strftime('%Y_%m_%d_%H_%M_%S')}.log"))
     log_path=os.path.join(config["log_file"],log_filename)
     logger = setup_logger(log_path)
+    rate_limiter = get_rate_limiter(logger, default_limit=config["rate_limit"], state_path=config.get("rate_limit_path")) if config.get("rate_limit") else None
     table_name=config.get("main_table")
     if not table_name:table_name=config["table_name"]
+    http_cache = get_http_cache(logger, config["http_cache_dir"]) if config.get("http_cache_dir") else None
+    api_request = ApiRequest(logger=logger, max_retries=config.get("max_retries",5), rate_limiter=rate_limiter, http_cache=http_cache, cache_scope=f"{config['schema_name']}.{table_name}")
     try:
         logger.info("Ingestion Started")
         sys.exit(main())
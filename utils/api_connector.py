@@ -9,8 +9,35 @@
 
 import configparser
 from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
 import requests
 import traceback
+import random
+import time
+import json
+from abc import ABC, abstractmethod
+from http_cache import HttpCache, NotModified
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(content):
+    """
+    Decodes a whole JSON document with orjson if installed, otherwise with the standard json module.
+
+    Parameters:
+    content (bytes / str) : JSON document
+
+    Returns:
+    payload : Decoded document
+    """
+    return orjson.loads(content) if orjson is not None else json.loads(content)
 
 class api_connect:
 
@@ -40,15 +67,230 @@ class api_connect:
 
 
 class ApiRequest:
-    def __init__(self, logger) -> None:
+    def __init__(self, logger, pool_maxsize=10, max_retries=5, backoff_factor=1, max_backoff=60, max_retry_after=300, retry_statuses=(429, 500, 502, 503, 504), timeout=(10, 300), decode_compressed=True, rate_limiter=None, rate_limit_key=None, http_cache=None, cache_scope=None) -> None:
         """
         The Constructor for ApiRequest class.
 
+        Every request goes through one pooled keep-alive `requests.Session`, so repeated calls to the same host reuse the TCP / TLS connection.
+
         Parameters:
-        logger (Logger): Logger object
+        logger (Logger)        : Logger object
+        pool_maxsize (int)     : Connections kept open per host, by default 10
+        max_retries (int)      : Retries of a failed request, by default 5
+        backoff_factor (float) : Base seconds of the exponential backoff, the wait before retry n is a random value up to backoff_factor * 2**n, by default 1
+        max_backoff (float)    : Max seconds waited between retries when Retry-After is not sent, by default 60
+        max_retry_after (float): Max seconds of a Retry-After header which are honored, by default 300
+        retry_statuses (tuple) : Status codes retried, POST is only retried on 429 / 503 as the server did not process it, by default 429, 500, 502, 503, 504
+                                 Connection errors and timeouts are retried too, for POST only a connect timeout or refused connection as the request never reached the server
+        timeout (tuple)        : Connect and read timeout in seconds, by default (10, 300)
+        decode_compressed (bool) : Ask for gzip (and brotli if the brotli package is installed) compressed responses, decoded transparently, by default True
+        rate_limiter (RateLimiter) : Shared token bucket every request waits on and adapts from the quota headers, see rate_limiter.get_rate_limiter, by default None
+        rate_limit_key (str)   : Bucket the requests are counted against, eg a credential shared by several hosts, by default the host of each URL
+        http_cache (HttpCache) : Validator store used by get_conditional, see http_cache.get_http_cache, by default None
+        cache_scope (str)      : Consumer of the sources in the HTTP cache, eg schema.table, by default None
         """
         self.logger = logger
         self.logger.info("Initiating ApiRequest Class")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = set(retry_statuses)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.rate_limit_key = rate_limit_key
+        self.http_cache = http_cache
+        self.cache_scope = cache_scope
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if decode_compressed:
+            encodings = ["gzip", "deflate"]
+            try:
+                import brotli
+                encodings.append("br")
+            except ImportError:
+                try:
+                    import brotlicffi
+                    encodings.append("br")
+                except ImportError:
+                    pass
+            self.session.headers["Accept-Encoding"] = ", ".join(encodings)
+        else:
+            self.session.headers["Accept-Encoding"] = "identity"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled connections of the session.
+        """
+        self.session.close()
+
+    def retry_delay(self, response, attempt):
+        """
+        Returns the seconds to wait before the next attempt, the Retry-After header if sent (seconds or HTTP date) otherwise full jitter exponential backoff.
+
+        Parameters:
+        response (requests.Response): HTTP response object, None if the request failed with a connection error
+        attempt (int): Attempt number starting from 0
+
+        Returns:
+        delay (float) : Seconds to wait
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0), self.max_retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def limit_key(self, api_url):
+        """
+        Returns the rate limiter bucket of a URL, rate_limit_key if provided otherwise the host.
+        """
+        return self.rate_limit_key or urlparse(api_url).netloc
+
+    @staticmethod
+    def not_sent(error):
+        """
+        A static method to tell whether a failed request never reached the server, a connect timeout or a refused / unresolved connection
+
+        Parameters:
+        error (Exception): ConnectionError or Timeout raised by requests
+
+        Returns:
+        not_sent (bool) : True if the request is safe to retry whatever its method
+        """
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def request(self, method, api_url, **kwargs):
+        """
+        Sends the request through the pooled session, retrying connection errors and retryable status codes with backoff.
+        POST is not idempotent, so it is only retried on errors where the server did not process it (429 / 503, connect timeout, refused connection).
+        With a rate limiter every attempt first waits for a token of the bucket and the quota headers of the response are fed back to it.
+
+        Parameters:
+        method (str): HTTP method
+        api_url (str): API endpoint URL
+        kwargs (dict): Arguments passed to requests (headers, params, data, json, timeout...)
+
+        Returns:
+        response : The last response received
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        retry_statuses = self.retry_statuses if method.upper() != "POST" else self.retry_statuses & {429, 503}
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self.limit_key(api_url))
+            try:
+                response = self.session.request(method, api_url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries or (method.upper() == "POST" and not self.not_sent(e)):
+                    raise
+                delay = self.retry_delay(None, attempt)
+                self.logger.warning(f"{method} {api_url} failed with {type(e).__name__}, retry {attempt + 1} of {self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(self.limit_key(api_url), response.status_code, response.headers, self.max_retry_after)
+            if response.status_code not in retry_statuses or attempt == self.max_retries:
+                return response
+            delay = self.retry_delay(response, attempt)
+            self.logger.warning(f"{method} {api_url} returned {response.status_code}, retry {attempt + 1} of {self.max_retries} in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+
+    @staticmethod
+    def decode(response):
+        """
+        Decodes the whole JSON body of a response once, with orjson if installed.
+
+        Parameters:
+        response (requests.Response): HTTP response object
+
+        Returns:
+        payload : Decoded document
+        """
+        return json_loads(response.content)
+
+    def stream_arrays(self, response, arrays=("rows", "records", "data"), chunk_size=64 * 1024):
+        """
+        Iterates the items of top level arrays of a streamed response as they arrive from the socket, so the whole document is never held in memory.
+
+        The response should be requested with stream=True. ijson (with its C backend if available) is used as incremental parser,
+        if it is not installed the document is decoded once as a whole and the items are yielded from it.
+
+        Parameters:
+        response (requests.Response): HTTP response object
+        arrays (tuple): Keys of the top level arrays to iterate, by default rows / records / data
+        chunk_size (int): Bytes read from the socket at a time, by default 64 KB
+
+        Returns:
+        item (tuple) : Generator of (array key, item) in document order
+        """
+        try:
+            try:
+                import ijson
+            except ImportError:
+                self.logger.warning("ijson is not installed, decoding the whole response instead of streaming it")
+                payload = self.decode(response)
+                for array in arrays:
+                    for item in payload.get(array) or []:
+                        yield array, item
+                return
+            response.raw.decode_content = True
+            if len(arrays) == 1:
+                # A single array is built entirely inside the parser backend, the fastest streaming path
+                for item in ijson.items(response.raw, f"{arrays[0]}.item", buf_size=chunk_size, use_float=True):
+                    yield arrays[0], item
+                return
+            targets = {f"{array}.item": array for array in arrays}
+            builder, current = None, None
+            for prefix, event, value in ijson.parse(response.raw, buf_size=chunk_size, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == current and event in ("end_map", "end_array"):
+                        yield targets[current], builder.value
+                        builder = None
+                elif prefix in targets:
+                    if event in ("start_map", "start_array"):
+                        builder, current = ijson.ObjectBuilder(), prefix
+                        builder.event(event, value)
+                    else:
+                        yield targets[prefix], value
+        finally:
+            response.close()
+
+    def get_stream(self, api_url, arrays=("rows", "records", "data"), headers=None, additional_get_parameters=None):
+        """
+        Performs a streamed GET request and iterates the items of the top level arrays of the response, see stream_arrays.
+
+        Parameters:
+        api_url (str): API endpoint URL
+        arrays (tuple): Keys of the top level arrays to iterate, by default rows / records / data
+        headers (dict): Optional HTTP headers
+        additional_get_parameters (dict): Optional GET parameters for the request
+
+        Returns:
+        item (tuple) : Generator of (array key, item) in document order
+        """
+        response = self.get_request(api_url, headers=headers, additional_get_parameters={**(additional_get_parameters or {}), "stream": True})
+        return self.stream_arrays(response, arrays=arrays)
 
     def get_request(self, api_url, headers=None, additional_get_parameters=None):
         """
@@ -64,13 +306,46 @@ class ApiRequest:
         """
         try:
             self.logger.info("Executing get_request method")
-            if additional_get_parameters:response = requests.get(api_url, headers=headers,**additional_get_parameters)
-            else:response = requests.get(api_url, headers=headers)
+            response = self.request("GET", api_url, headers=headers, **(additional_get_parameters or {}))
             return self.reponse_handler(response, method="GET")
         except Exception as e:
             self.logger.error(f"Failed to execute get_request method: {e} {traceback.format_exc()}")
             raise
 
+    def get_conditional(self, api_url, headers=None, additional_get_parameters=None):
+        """
+        Performs a conditional GET request with the validators of the last successful load (If-None-Match / If-Modified-Since).
+
+        The validators of the response are staged in the HTTP cache and written by http_cache.commit() once the load succeeded.
+        Without an HTTP cache it behaves as get_request.
+
+        Parameters:
+        api_url (str): API endpoint URL
+        headers (dict): Optional HTTP headers
+        additional_get_parameters (dict): Optional GET parameters for the request
+
+        Returns:
+        response : Generate API response only if it is successful, raises NotModified on 304
+        """
+        if self.http_cache is None:
+            return self.get_request(api_url, headers=headers, additional_get_parameters=additional_get_parameters)
+        try:
+            self.logger.info("Executing get_conditional method")
+            conditional_headers = {**(headers or {}), **self.http_cache.conditional_headers(api_url, self.cache_scope)}
+            response = self.request("GET", api_url, headers=conditional_headers, **(additional_get_parameters or {}))
+            if response.status_code == 304:
+                response.close()
+                self.logger.info(f"{api_url} not modified since the last load")
+                raise NotModified(api_url, self.http_cache.get(api_url, self.cache_scope))
+            response = self.reponse_handler(response, method="GET")
+            self.http_cache.stage(api_url, HttpCache.response_validators(response), self.cache_scope)
+            return response
+        except NotModified:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to execute get_conditional method: {e} {traceback.format_exc()}")
+            raise
+
     def post_request(self, api_url, headers=None, additional_post_parameters=None):
         """
         Performs a POST request to the provided API URL and returns the response.
@@ -85,10 +360,8 @@ class ApiRequest:
         """
         try:
             self.logger.info("Executing post_request method")
-            if additional_post_parameters:response = requests.post(api_url, headers=headers, **additional_post_parameters)
-            else:response = requests.pose(api_url, headers=headers)
-            print(response.json())
-            return self.reponse_handler(response, method="PUT")
+            response = self.request("POST", api_url, headers=headers, **(additional_post_parameters or {}))
+            return self.reponse_handler(response, method="POST")
         except Exception as e:
             self.logger.error(f"Failed to execute post_request method: {e} {traceback.format_exc()}")
             raise
@@ -99,12 +372,12 @@ class ApiRequest:
 
         Parameters:
         response (requests.Response): HTTP response object
-        method (str): The HTTP method used (e.g., "GET", "PUT")
+        method (str): The HTTP method used (e.g., "GET", "POST")
 
         Returns:
         response : Generate API response
         """
-        if response.status_code == 200:
+        if 200 <= response.status_code < 300:
             self.logger.info(f"{method} request successful.")
             return response
         else:
@@ -116,3 +389,477 @@ class ApiRequest:
             error_info = f"{method} request failed. Status code: {response.status_code}. Message: {error_message}"
             self.logger.error(error_info)
             raise Exception(error_info)
+
+
+class AsyncApiRequest:
+    def __init__(self, logger, concurrency=20, limit_per_host=10, limit=100, max_retries=5, backoff_factor=1, max_backoff=60, max_retry_after=300, retry_statuses=(429, 500, 502, 503, 504), timeout=300, ssl=None, rate_limiter=None, rate_limit_key=None) -> None:
+        """
+        The Constructor for AsyncApiRequest class, the asyncio counterpart of ApiRequest.
+
+        One aiohttp ClientSession is shared by every request, created on entering `async with` so it is bound to the running loop.
+
+        Parameters:
+        logger (Logger)        : Logger object
+        concurrency (int)      : Max requests in flight across every host, by default 20
+        limit_per_host (int)   : Max open connections per host, by default 10
+        limit (int)            : Max open connections in total, by default 100
+        max_retries (int)      : Retries of a failed request, by default 5
+        backoff_factor (float) : Base seconds of the exponential backoff, by default 1
+        max_backoff (float)    : Max seconds waited between retries when Retry-After is not sent, by default 60
+        max_retry_after (float): Max seconds of a Retry-After header which are honored, by default 300
+        retry_statuses (tuple) : Status codes retried, POST is only retried on 429 / 503, by default 429, 500, 502, 503, 504
+                                 Connection errors and timeouts are retried too, for POST only a failed connect (aiohttp ClientConnectorError)
+        timeout (float)        : Total timeout of a request in seconds, by default 300
+        ssl (bool)             : Passed to aiohttp, False skips certificate verification, by default None
+        rate_limiter (RateLimiter) : Shared token bucket every request waits on and adapts from the quota headers, by default None
+        rate_limit_key (str)   : Bucket the requests are counted against, by default the host of each URL
+        """
+        self.logger = logger
+        self.logger.info("Initiating AsyncApiRequest Class")
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.limit = limit
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = set(retry_statuses)
+        self.timeout = timeout
+        self.ssl = ssl
+        self.rate_limiter = rate_limiter
+        self.rate_limit_key = rate_limit_key
+        self.session = None
+        self.semaphore = None
+
+    retry_delay = ApiRequest.retry_delay
+    limit_key = ApiRequest.limit_key
+
+    async def __aenter__(self):
+        import aiohttp
+        import asyncio
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, ssl=self.ssl)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the shared session and its pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, api_url, **kwargs):
+        """
+        Sends the request through the shared session within the concurrency limit, retrying connection errors and retryable status codes with backoff.
+        POST is not idempotent, so it is only retried on 429 / 503 and when the connection could not be opened.
+
+        Parameters:
+        method (str): HTTP method
+        api_url (str): API endpoint URL
+        kwargs (dict): Arguments passed to aiohttp (headers, params, data, json...)
+
+        Returns:
+        response : The last response received, its body is already read so json() / text() can be awaited after it is released
+        """
+        import aiohttp
+        import asyncio
+        if self.session is None:
+            raise RuntimeError("AsyncApiRequest must be used with 'async with' before sending requests")
+        retry_statuses = self.retry_statuses if method.upper() != "POST" else self.retry_statuses & {429, 503}
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                # The SQLite bucket is updated off the event loop, the wait itself is an asyncio sleep
+                delay = await loop.run_in_executor(None, self.rate_limiter.reserve, self.limit_key(api_url))
+                if delay > 0:
+                    self.logger.info(f"Rate limit of {self.limit_key(api_url)} reached, waiting {delay:.2f}s")
+                    await asyncio.sleep(delay)
+            try:
+                async with self.semaphore:
+                    async with self.session.request(method, api_url, **kwargs) as response:
+                        await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries or (method.upper() == "POST" and not isinstance(e, aiohttp.ClientConnectorError)):
+                    raise
+                delay = self.retry_delay(None, attempt)
+                self.logger.warning(f"{method} {api_url} failed with {type(e).__name__}, retry {attempt + 1} of {self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            if self.rate_limiter is not None:
+                await loop.run_in_executor(None, self.rate_limiter.update, self.limit_key(api_url), response.status, response.headers, self.max_retry_after)
+            if response.status not in retry_statuses or attempt == self.max_retries:
+                return response
+            delay = self.retry_delay(response, attempt)
+            self.logger.warning(f"{method} {api_url} returned {response.status}, retry {attempt + 1} of {self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def get_request(self, api_url, headers=None, additional_get_parameters=None):
+        """
+        Performs a GET request to the provided API URL and returns the response.
+
+        Parameters:
+        api_url (str): API endpoint URL
+        headers (dict): Optional HTTP headers
+        additional_get_parameters (dict): Optional GET parameters for the request
+
+        Returns:
+        response : Generate API response only if it is successful
+        """
+        try:
+            response = await self.request("GET", api_url, headers=headers, **(additional_get_parameters or {}))
+            return await self.reponse_handler(response, method="GET")
+        except Exception as e:
+            self.logger.error(f"Failed to execute get_request method for {api_url}: {e}")
+            raise
+
+    async def post_request(self, api_url, headers=None, additional_post_parameters=None):
+        """
+        Performs a POST request to the provided API URL and returns the response.
+
+        Parameters:
+        api_url (str): API endpoint URL
+        headers (dict): Optional HTTP headers
+        additional_post_parameters (dict): Optional POST parameters for the request
+
+        Returns:
+        response : Generate API response only if it is successful
+        """
+        try:
+            response = await self.request("POST", api_url, headers=headers, **(additional_post_parameters or {}))
+            return await self.reponse_handler(response, method="POST")
+        except Exception as e:
+            self.logger.error(f"Failed to execute post_request method for {api_url}: {e}")
+            raise
+
+    async def reponse_handler(self, response, method):
+        """
+        Handles the HTTP response, checking for success and logging accordingly, same as ApiRequest.reponse_handler.
+
+        Parameters:
+        response (aiohttp.ClientResponse): HTTP response object
+        method (str): The HTTP method used (e.g., "GET", "POST")
+
+        Returns:
+        response : Generate API response
+        """
+        if 200 <= response.status < 300:
+            self.logger.info(f"{method} request successful.")
+            return response
+        else:
+            self.logger.warning(f"{method} request failed with status code {response.status}.")
+            try:
+                error_message = (await response.json(content_type=None)).get("message", "No message provided")
+            except (ValueError, AttributeError):
+                error_message = "No valid JSON in response"
+            error_info = f"{method} request failed. Status code: {response.status}. Message: {error_message}"
+            self.logger.error(error_info)
+            raise Exception(error_info)
+
+    async def gather_many(self, requests_list, method="GET", parse_json=False):
+        """
+        Sends many requests concurrently within the connection and concurrency limits.
+
+        Parameters:
+        requests_list (list) : URLs, or dicts with url and optional headers / params / json / data per request
+        method (str)         : HTTP method used for every request, by default GET
+        parse_json (bool)    : Return the decoded JSON body instead of the response, by default False
+
+        Returns:
+        results (list) : One entry per request in the same order, the response / JSON if it succeeded otherwise the exception raised for it
+        """
+        import asyncio
+
+        async def fetch(item):
+            item = {"url": item} if isinstance(item, str) else dict(item)
+            api_url = item.pop("url")
+            response = await self.request(method, api_url, **item)
+            response = await self.reponse_handler(response, method=method)
+            return await response.json(content_type=None, loads=json_loads) if parse_json else response
+
+        self.logger.info(f"Executing gather_many method for {len(requests_list)} requests")
+        results = await asyncio.gather(*(fetch(item) for item in requests_list), return_exceptions=True)
+        failed = sum(isinstance(result, Exception) for result in results)
+        self.logger.info(f"gather_many completed - {len(results) - failed} succeeded, {failed} failed")
+        return results
+
+
+class Paginator(ABC):
+    """
+    A base class Paginator which yields the pages of a paginated API lazily, strategies only define how the next request is built from the current page
+    """
+    def __init__(self, logger, records_key=None, prefetch=False, max_pages=None) -> None:
+        """
+        The Constructor for Paginator class.
+
+        Parameters:
+        logger (Logger)     : Logger object
+        records_key (str)   : Key of the records list in the page, pages are counted as records if not provided, by default None
+        prefetch (bool)     : Request the next page while the current one is being processed by the caller, by default False
+        max_pages (int)     : Max pages fetched, by default every page is fetched
+        """
+        self.logger = logger
+        self.records_key = records_key
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+
+    @staticmethod
+    def get_path(payload, path):
+        """
+        Returns the value at a key path of a nested page, None if any key is missing.
+
+        Parameters:
+        payload (dict) : Decoded page
+        path (tuple)   : Keys from the top of the page, a str is taken as a single key
+
+        Returns:
+        value : Value at the path
+        """
+        for key in ((path,) if isinstance(path, str) else path):
+            if not isinstance(payload, dict):
+                return None
+            payload = payload.get(key)
+        return payload
+
+    def records(self, payload):
+        """
+        Returns the records of a page.
+
+        Parameters:
+        payload (dict) : Decoded page
+
+        Returns:
+        records (list) : Records of the page
+        """
+        records = self.get_path(payload, self.records_key) if self.records_key else payload
+        return records or []
+
+    def first_request(self, api_url, params):
+        """
+        Returns the (url, params) of the first page.
+        """
+        return api_url, params
+
+    @abstractmethod
+    def next_request(self, payload, request):
+        """
+        Returns the (url, params) of the page after the current one, None once the last page is reached. Implemented by every strategy.
+
+        Parameters:
+        payload (dict)   : Decoded current page
+        request (tuple)  : (url, params) of the current page
+
+        Returns:
+        request (tuple) : (url, params) of the next page or None
+        """
+
+    def fetch(self, api, request, headers):
+        """
+        Fetches and decodes one page with an ApiRequest object.
+        """
+        api_url, params = request
+        return api.decode(api.get_request(api_url, headers=headers, additional_get_parameters={"params": params} if params else None))
+
+    async def afetch(self, api, request, headers):
+        """
+        Fetches and decodes one page with an AsyncApiRequest object.
+        """
+        api_url, params = request
+        response = await api.get_request(api_url, headers=headers, additional_get_parameters={"params": params} if params else None)
+        return await response.json(content_type=None, loads=json_loads)
+
+    def pages(self, api, api_url, headers=None, params=None):
+        """
+        Yields every page lazily with an ApiRequest object, with prefetch the next page is requested in a background thread before the current page is yielded.
+
+        Parameters:
+        api (ApiRequest) : ApiRequest object used to send the requests
+        api_url (str)    : API endpoint URL of the first page
+        headers (dict)   : Optional HTTP headers
+        params (dict)    : Optional query parameters of the first page
+
+        Returns:
+        payload (dict) : Generator of decoded pages
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        request = self.first_request(api_url, dict(params or {}))
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        pending = None
+        page_count = 0
+        try:
+            while request is not None:
+                payload = pending.result() if pending is not None else self.fetch(api, request, headers)
+                pending = None
+                page_count += 1
+                request = None if self.max_pages and page_count >= self.max_pages else self.next_request(payload, request)
+                if request is not None and executor is not None:
+                    pending = executor.submit(self.fetch, api, request, headers)
+                yield payload
+            self.logger.info(f"{page_count} pages fetched from {api_url}")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    async def apages(self, api, api_url, headers=None, params=None):
+        """
+        Yields every page lazily with an AsyncApiRequest object, with prefetch the next page is requested as a task before the current page is yielded.
+
+        Parameters:
+        api (AsyncApiRequest) : AsyncApiRequest object used to send the requests
+        api_url (str)         : API endpoint URL of the first page
+        headers (dict)        : Optional HTTP headers
+        params (dict)         : Optional query parameters of the first page
+
+        Returns:
+        payload (dict) : Async generator of decoded pages
+        """
+        import asyncio
+        request = self.first_request(api_url, dict(params or {}))
+        pending = None
+        page_count = 0
+        try:
+            while request is not None:
+                payload = await pending if pending is not None else await self.afetch(api, request, headers)
+                pending = None
+                page_count += 1
+                request = None if self.max_pages and page_count >= self.max_pages else self.next_request(payload, request)
+                if request is not None and self.prefetch:
+                    pending = asyncio.ensure_future(self.afetch(api, request, headers))
+                yield payload
+            self.logger.info(f"{page_count} pages fetched from {api_url}")
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    def iter_records(self, api, api_url, headers=None, params=None):
+        """
+        Yields the records of every page lazily, see pages.
+        """
+        for payload in self.pages(api, api_url, headers=headers, params=params):
+            yield from self.records(payload)
+
+
+class PageNumberPaginator(Paginator):
+    """
+    A class PageNumberPaginator which requests page=1,2,3... until a page returns fewer records than the page size
+    """
+    def __init__(self, logger, page_param="page", size_param="pageSize", page_size=500, start_page=1, **kwargs) -> None:
+        """
+        Parameters:
+        page_param (str) : Query parameter of the page number, by default page
+        size_param (str) : Query parameter of the page size, not sent if None, by default pageSize
+        page_size (int)  : Records requested per page, by default 500
+        start_page (int) : Number of the first page, by default 1
+        kwargs (dict)    : Arguments of Paginator
+        """
+        super().__init__(logger, **kwargs)
+        self.page_param = page_param
+        self.size_param = size_param
+        self.page_size = page_size
+        self.start_page = start_page
+
+    def first_request(self, api_url, params):
+        params.setdefault(self.page_param, self.start_page)
+        if self.size_param:
+            params.setdefault(self.size_param, self.page_size)
+        return api_url, params
+
+    def next_request(self, payload, request):
+        api_url, params = request
+        if len(self.records(payload)) < self.page_size:
+            return None
+        return api_url, {**params, self.page_param: int(params[self.page_param]) + 1}
+
+
+class OffsetPaginator(Paginator):
+    """
+    A class OffsetPaginator which requests offset=0,limit,2*limit... until a page returns fewer records than the limit
+    """
+    def __init__(self, logger, offset_param="offset", limit_param="limit", limit=1000, **kwargs) -> None:
+        """
+        Parameters:
+        offset_param (str) : Query parameter of the offset, by default offset
+        limit_param (str)  : Query parameter of the page size, by default limit
+        limit (int)        : Records requested per page, by default 1000
+        kwargs (dict)      : Arguments of Paginator
+        """
+        super().__init__(logger, **kwargs)
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.limit = limit
+
+    def first_request(self, api_url, params):
+        params.setdefault(self.offset_param, 0)
+        params.setdefault(self.limit_param, self.limit)
+        return api_url, params
+
+    def next_request(self, payload, request):
+        api_url, params = request
+        count = len(self.records(payload))
+        if count < self.limit:
+            return None
+        return api_url, {**params, self.offset_param: int(params[self.offset_param]) + count}
+
+
+class CursorPaginator(Paginator):
+    """
+    A class CursorPaginator which passes the cursor returned in each page as a query parameter until no cursor is returned
+    """
+    def __init__(self, logger, cursor_param="cursor", cursor_path=("next_cursor",), **kwargs) -> None:
+        """
+        Parameters:
+        cursor_param (str)  : Query parameter of the cursor, by default cursor
+        cursor_path (tuple) : Key path of the next cursor in the page, by default next_cursor
+        kwargs (dict)       : Arguments of Paginator
+        """
+        super().__init__(logger, **kwargs)
+        self.cursor_param = cursor_param
+        self.cursor_path = cursor_path
+
+    def next_request(self, payload, request):
+        api_url, params = request
+        cursor = self.get_path(payload, self.cursor_path)
+        if not cursor or cursor == params.get(self.cursor_param):
+            return None
+        return api_url, {**params, self.cursor_param: cursor}
+
+
+class NextLinkPaginator(Paginator):
+    """
+    A class NextLinkPaginator which follows the next page URL returned in each page until none is returned
+    """
+    def __init__(self, logger, next_path=("links", "next"), done_path=None, **kwargs) -> None:
+        """
+        Parameters:
+        next_path (tuple) : Key path of the next page URL in the page, relative URLs are resolved against the current one, by default links.next
+        done_path (tuple) : Key path of a flag which is true on the last page, by default None
+        kwargs (dict)     : Arguments of Paginator
+        """
+        super().__init__(logger, **kwargs)
+        self.next_path = next_path
+        self.done_path = done_path
+
+    def next_request(self, payload, request):
+        from urllib.parse import urljoin
+        api_url, params = request
+        next_link = self.get_path(payload, self.next_path)
+        if not next_link or (self.done_path and self.get_path(payload, self.done_path)):
+            return None
+        return urljoin(api_url, next_link), {} # the next link already carries the query
+
+
+class SalesforcePaginator(NextLinkPaginator):
+    """
+    A class SalesforcePaginator which follows nextRecordsUrl of the Salesforce REST query API until done is true
+    """
+    def __init__(self, logger, **kwargs) -> None:
+        """
+        Parameters:
+        kwargs (dict) : Arguments of Paginator
+        """
+        kwargs.setdefault("records_key", "records")
+        super().__init__(logger, next_path=("nextRecordsUrl",), done_path=("done",), **kwargs)
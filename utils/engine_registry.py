@@ -0,0 +1,75 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: Engine registry module to reuse pooled database engines across the process keyed by config path and profile
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import atexit
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from redshift_connector import get_connection
+
+engines = {}
+lock = threading.Lock()
+
+def get_engine(config :str, profile :str, logger :object, pool_size :int=5, max_overflow :int=5, pool_recycle :int=1800, pool_pre_ping :bool=True, connect_args :dict=None) -> object:
+    """
+    Returns the process-wide pooled engine for the config, profile and pool options provided, creating it on first use.
+
+    The engine is created on the URL of the engine returned by **_get_connection_** with a tunable `QueuePool`,
+    so every Database, sql_query_executor and Validation call in the process reuses warm connections instead of
+    paying the TCP, TLS and auth handshake each time. Callers asking for different pool options get their own engine.
+
+    Parameters:
+        config (str)         : Path of redshift credentials.
+        profile (str)        : Redshift profile.
+        logger (object)      : Logger object where log entries are to be made.
+        pool_size (int)      : Connections kept open in the pool, by default 5.
+        max_overflow (int)   : Connections allowed above pool_size, by default 5.
+        pool_recycle (int)   : Seconds after which a connection is replaced, by default 1800.
+        pool_pre_ping (bool) : Test connections on checkout and reconnect if stale, by default True.
+        connect_args (dict)  : DBAPI connect arguments which are not part of the URL (sslmode, timeouts...), by default None.
+
+    Returns:
+        engine (object) : SQLAlchemy engine object for Database connection.
+    """
+    key = (config, profile, pool_size, max_overflow, pool_recycle, pool_pre_ping, repr(sorted((connect_args or {}).items())))
+    with lock:
+        engine = engines.get(key)
+        if engine is not None:
+            logger.info(f"Reusing pooled engine for profile {profile}")
+            return engine
+        if any(existing[:2] == (config, profile) for existing in engines):
+            logger.warning(f"A pooled engine for profile {profile} already exists with other pool options, creating another one with pool_size {pool_size}, max_overflow {max_overflow}")
+        try:
+            logger.info(f"Creating pooled engine for profile {profile}")
+            base_engine = get_connection(config, profile, logger)
+            engine = create_engine(base_engine.url, connect_args=connect_args or {}, poolclass=QueuePool, pool_size=pool_size, max_overflow=max_overflow, pool_recycle=pool_recycle, pool_pre_ping=pool_pre_ping)
+            base_engine.dispose()
+            engines[key] = engine
+            logger.info(f"Pooled engine created for profile {profile}")
+            return engine
+        except Exception as e:
+            logger.error(f"Failed to execute get_engine method for profile {profile}, error --> {e}")
+            raise
+
+def dispose_engines(logger :object=None) -> None:
+    """
+    Disposes every pooled engine in the registry, closing their connections. Registered to run at interpreter exit.
+
+    Parameters:
+        logger (object) : Logger object where log entries are to be made, by default None.
+    """
+    with lock:
+        for (config, profile, *options), engine in list(engines.items()):
+            engine.dispose()
+            if logger:
+                logger.info(f"Pooled engine for profile {profile} disposed")
+        engines.clear()
+
+atexit.register(dispose_engines)
@@ -0,0 +1,216 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: HTTP cache module to keep the validators (ETag, Last-Modified, source version) of API sources on local disk and skip unchanged sources
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import os
+import json
+import hashlib
+import threading
+
+class NotModified(Exception):
+    """
+    Raised when a source has not changed since its last successful load, the ingestion can stop without extracting or loading
+    """
+    def __init__(self, url, validators=None):
+        self.url = url
+        self.validators = validators or {}
+        super().__init__(f"{url} not modified since the last load")
+
+class HttpCache:
+    """
+    A class HttpCache which stores the validators of every source URL per consumer scope on local disk, new validators are staged and only written once the load succeeded
+    """
+    def __init__(self, logger, cache_dir):
+        """
+        The constructor for HttpCache class
+
+        Parameters:
+        logger (object)       : Logger object where log entries are to be made
+        cache_dir (str)       : Local folder where the validators are stored
+        """
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.staged = {}
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(url, scope=None):
+        """
+        A static method to build the cache key of a URL, the scope (eg schema.table) keeps jobs loading the same source into different targets apart
+
+        Parameters:
+        url (str)   : Source URL
+        scope (str) : Consumer of the source, by default None
+
+        Returns:
+        key (str) : sha256 of scope and URL
+        """
+        return hashlib.sha256(f"{scope or ''}|{url}".encode("utf-8")).hexdigest()
+
+    def file_path(self, key):
+        """
+        A method to return the local file path of a cached entry
+
+        Parameters:
+        key (str) : Cache key
+
+        Returns:
+        path (str) : Path of the JSON entry in cache_dir
+        """
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def response_validators(response):
+        """
+        A static method to read the validators sent with a response
+
+        Parameters:
+        response (requests.Response): HTTP response object
+
+        Returns:
+        validators (dict) : etag and / or last_modified, empty if the source sends neither
+        """
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        return {name: value for name, value in validators.items() if value}
+
+    def get(self, url, scope=None):
+        """
+        A method to fetch the validators of the last successful load of a URL
+
+        Parameters:
+        url (str)   : Source URL
+        scope (str) : Consumer of the source, by default None
+
+        Returns:
+        validators (dict) : Stored validators or None if not cached
+        """
+        path = self.file_path(self.cache_key(url, scope))
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as file:
+                return json.load(file)["validators"]
+        except Exception as e:
+            self.logger.warning(f"Unable to read HTTP cache entry for {url}, error --> {e}")
+            return None
+
+    def conditional_headers(self, url, scope=None):
+        """
+        A method to build the If-None-Match / If-Modified-Since headers of a URL from its stored validators
+
+        Parameters:
+        url (str)   : Source URL
+        scope (str) : Consumer of the source, by default None
+
+        Returns:
+        headers (dict) : Conditional request headers, empty if the URL is not cached
+        """
+        validators = self.get(url, scope) or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def is_modified(self, url, validators, scope=None):
+        """
+        A method to compare the current validators of a URL (eg a Smartsheet version) with the stored ones and stage them if they changed
+
+        Parameters:
+        url (str)         : Source URL
+        validators (dict) : Current validators of the source
+        scope (str)       : Consumer of the source, by default None
+
+        Returns:
+        modified (bool) : False only if every current validator matches the stored one
+        """
+        validators = {name: value for name, value in validators.items() if value is not None}
+        if not validators:
+            self.logger.warning(f"{url} sent no ETag / Last-Modified / version, it is loaded on every run")
+            return True
+        stored = self.get(url, scope)
+        if stored and all(stored.get(name) == value for name, value in validators.items()):
+            self.logger.info(f"{url} not modified since the last load")
+            return False
+        self.stage(url, validators, scope)
+        return True
+
+    def stage(self, url, validators, scope=None):
+        """
+        A method to hold the validators of a response until the load built from it succeeds, see commit
+
+        Parameters:
+        url (str)         : Source URL
+        validators (dict) : Validators of the response
+        scope (str)       : Consumer of the source, by default None
+
+        Returns : None
+        """
+        if validators:
+            with self.lock:
+                self.staged[self.cache_key(url, scope)] = {"url": url, "scope": scope, "validators": validators}
+
+    def commit(self):
+        """
+        A method to write the staged validators once the load succeeded, so a failed load is fully extracted again on the next run
+
+        Parameters: None
+
+        Returns : None
+        """
+        with self.lock:
+            for key, entry in self.staged.items():
+                temp_path = f"{self.file_path(key)}.{os.getpid()}.tmp"
+                try:
+                    with open(temp_path, "w") as file:
+                        json.dump(entry, file)
+                    os.replace(temp_path, self.file_path(key))
+                except Exception as e:
+                    self.logger.warning(f"Unable to write HTTP cache entry for {entry['url']}, error --> {e}")
+            if self.staged:
+                self.logger.info(f"HTTP cache updated for {len(self.staged)} sources")
+            self.staged.clear()
+
+    def invalidate(self, url, scope=None):
+        """
+        A method to remove the validators of a URL so the next run extracts it in full
+
+        Parameters:
+        url (str)   : Source URL
+        scope (str) : Consumer of the source, by default None
+
+        Returns : None
+        """
+        key = self.cache_key(url, scope)
+        with self.lock:
+            self.staged.pop(key, None)
+            if os.path.exists(self.file_path(key)):
+                os.remove(self.file_path(key))
+        self.logger.info(f"HTTP cache invalidated for {url}")
+
+caches = {}
+
+def get_http_cache(logger, cache_dir):
+    """
+    A method to return the process-wide HttpCache for the cache_dir provided so every ApiRequest object shares it
+
+    Parameters:
+    logger (object)       : Logger object where log entries are to be made
+    cache_dir (str)       : Local folder where the validators are stored
+
+    Returns:
+    cache (HttpCache) : Shared HttpCache object
+    """
+    cache = caches.get(cache_dir)
+    if cache is None:
+        cache = caches[cache_dir] = HttpCache(logger, cache_dir)
+    cache.logger = logger
+    return cache
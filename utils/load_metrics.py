@@ -0,0 +1,123 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: Load metrics module to time each phase of a load with rows, bytes and statement counts and keep a run ledger
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import sqlite3
+import threading
+from time import perf_counter
+from datetime import datetime
+from contextlib import contextmanager
+import pandas as pd
+
+ledger_columns = ["run_id", "table_name", "load_type", "phase", "rows", "bytes", "seconds", "rows_per_sec", "statements", "started_at"]
+
+class LoadMetrics:
+    """
+    A class LoadMetrics which records wall time, rows, bytes, rows/s and statement count for each phase of a load
+    """
+    def __init__(self, logger, run_name, load_type=None, callback=None, ledger_path=None, ledger_table=None):
+        """
+        The constructor for LoadMetrics class
+
+        Parameters:
+        logger (object)     : Logger object where log entries are to be made
+        run_name (str)      : Name of the run, schema.table of the main table
+        load_type (str)     : Load type of the run
+        callback (function) : Function called with the metrics dict of every phase once it completes, by default None
+        ledger_path (str)   : Local SQLite file where the phases of every run are appended, by default None
+        ledger_table (str)  : schema.table in DB where the phases of every run are appended, by default None
+        """
+        self.logger = logger
+        self.run_id = f"{run_name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        self.load_type = load_type
+        self.callback = callback
+        self.ledger_path = ledger_path
+        self.ledger_table = ledger_table
+        self.phases = []
+        self.active = []
+
+    @contextmanager
+    def phase(self, name, table_name=None, rows=0, data_bytes=0):
+        """
+        A context manager to time a phase, rows can be updated on the yielded dict once known
+
+        Parameters:
+        name (str)       : Phase name (reflect / transform / truncate / to_sql / copy / merge ...)
+        table_name (str) : Table the phase runs against
+        rows (int)       : No of records handled by the phase
+        data_bytes (int) : Bytes handled by the phase
+
+        Returns:
+        record (dict) : Metrics of the phase
+        """
+        record = {"run_id": self.run_id, "table_name": table_name, "load_type": self.load_type, "phase": name, "rows": rows, "bytes": int(data_bytes), "statements": 0, "started_at": datetime.now()}
+        active = (threading.get_ident(), record)
+        self.active.append(active)
+        start = perf_counter()
+        try:
+            yield record
+        finally:
+            self.active = [item for item in self.active if item is not active]
+            record["seconds"] = round(perf_counter() - start, 3)
+            record["rows_per_sec"] = round(record["rows"] / record["seconds"], 1) if record["rows"] and record["seconds"] else 0
+            self.phases.append(record)
+            self.logger.info(f"Phase {name} on {table_name} - rows {record['rows']}, bytes {record['bytes']}, {record['seconds']}s, {record['rows_per_sec']} rows/s, {record['statements']} statements")
+            if self.callback:
+                try:
+                    self.callback(record)
+                except Exception as e:
+                    self.logger.warning(f"Metrics callback failed for phase {name}, error --> {e}")
+
+    def count_statement(self, *args, **kwargs):
+        """
+        A method to be registered as before_cursor_execute listener on the engine to count statements of the running phase
+
+        The engine is shared by every Database object in the process, so only statements executed on the thread which opened the phase are counted
+        """
+        thread = threading.get_ident()
+        for owner, record in reversed(self.active):
+            if owner == thread:
+                record["statements"] += 1
+                return
+
+    def summary(self):
+        """
+        A method to return the metrics of every phase completed in the run
+
+        Parameters: None
+
+        Returns:
+        summary (DataFrame) : One row per phase
+        """
+        return pd.DataFrame(self.phases, columns=ledger_columns)
+
+    def write_ledger(self, engine=None):
+        """
+        A method to append the phases of the run to the local SQLite ledger and / or the DB ledger table if configured
+
+        Parameters:
+        engine (object) : SQLAlchemy engine used to write to the DB ledger table
+
+        Returns : None
+        """
+        if not self.phases or not (self.ledger_path or self.ledger_table):
+            return
+        try:
+            summary = self.summary()
+            summary["started_at"] = summary["started_at"].astype(str)
+            if self.ledger_path:
+                with sqlite3.connect(self.ledger_path) as connection:
+                    summary.to_sql("load_ledger", connection, if_exists="append", index=False)
+                self.logger.info(f"Run {self.run_id} written to ledger {self.ledger_path}")
+            if self.ledger_table and engine is not None:
+                schema, table_name = self.ledger_table.split(".")
+                summary.to_sql(name=table_name, schema=schema, con=engine, if_exists="append", index=False, method="multi")
+                self.logger.info(f"Run {self.run_id} written to ledger table {self.ledger_table}")
+        except Exception as e:
+            self.logger.warning(f"Failed to write run ledger for {self.run_id}, error --> {e}")
@@ -0,0 +1,152 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: Object cache module to keep S3 objects and their parsed form on local disk keyed by bucket, key and ETag with LRU eviction
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import os
+import hashlib
+import threading
+
+class ObjectCache:
+    """
+    A class ObjectCache which stores raw S3 objects and their parsed Parquet form on local disk, content addressed by bucket/key/ETag
+    """
+    def __init__(self, logger, cache_dir, max_bytes=1024 * 1024 * 1024):
+        """
+        The constructor for ObjectCache class
+
+        Parameters:
+        logger (object)       : Logger object where log entries are to be made
+        cache_dir (str)       : Local folder where the entries are stored
+        max_bytes (int)       : Size in bytes above which the least recently used entries are evicted, by default 1 GB
+        """
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(bucket, key, etag, variant="raw"):
+        """
+        A static method to build the file name of an entry, a changed ETag gives a new name so stale entries are never read
+
+        Parameters:
+        bucket (str)  : Bucket name
+        key (str)     : Object key
+        etag (str)    : ETag of the object
+        variant (str) : raw for the object bytes, or an identifier of the parsed form
+
+        Returns:
+        name (str) : sha256 based file name of the entry
+        """
+        digest = hashlib.sha256(f"{bucket}/{key}/{etag.strip(chr(34))}".encode("utf-8")).hexdigest()
+        suffix = "raw" if variant == "raw" else hashlib.sha256(variant.encode("utf-8")).hexdigest()[:16] + ".parquet"
+        return f"{digest}.{suffix}"
+
+    def get(self, bucket, key, etag, variant="raw"):
+        """
+        A method to return the path of a cached entry and mark it as recently used
+
+        Parameters:
+        bucket (str)  : Bucket name
+        key (str)     : Object key
+        etag (str)    : ETag of the object
+        variant (str) : raw or an identifier of the parsed form, by default raw
+
+        Returns:
+        path (str) : Path of the cached entry or None if not cached
+        """
+        path = os.path.join(self.cache_dir, self.cache_key(bucket, key, etag, variant))
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        self.logger.info(f"Object cache hit for {bucket}/{key} ({variant})")
+        return path
+
+    def put(self, bucket, key, etag, writer, variant="raw"):
+        """
+        A method to add an entry, written to a temporary file first and renamed so readers never see a partial entry
+
+        Parameters:
+        bucket (str)        : Bucket name
+        key (str)           : Object key
+        etag (str)          : ETag of the object
+        writer (function)   : Function called with a temporary path which writes the entry to it
+        variant (str)       : raw or an identifier of the parsed form, by default raw
+
+        Returns:
+        path (str) : Path of the cached entry
+        """
+        path = os.path.join(self.cache_dir, self.cache_key(bucket, key, etag, variant))
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            writer(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.logger.info(f"Object cache updated for {bucket}/{key} ({variant}) - {os.path.getsize(path)} bytes")
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """
+        A method to remove the least recently used entries until the cache fits in max_bytes
+
+        Parameters:
+        keep (str) : Path of an entry which is not evicted, the entry just written, by default None
+
+        Returns : None
+        """
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for mtime, size, name in entries)
+            evicted = 0
+            for mtime, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if os.path.join(self.cache_dir, name) == keep:
+                    continue
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    total -= size
+                    evicted += 1
+                except OSError:
+                    continue
+            if evicted:
+                self.logger.info(f"Object cache evicted {evicted} entries, {total} bytes in use")
+
+caches = {}
+
+def get_object_cache(logger, cache_dir, max_bytes=1024 * 1024 * 1024):
+    """
+    A method to return the process-wide ObjectCache for the cache_dir provided so every S3Operations object shares it
+
+    Parameters:
+    logger (object)       : Logger object where log entries are to be made
+    cache_dir (str)       : Local folder where the entries are stored
+    max_bytes (int)       : Size in bytes above which the least recently used entries are evicted, by default 1 GB
+
+    Returns:
+    cache (ObjectCache) : Shared ObjectCache object
+    """
+    cache = caches.get(cache_dir)
+    if cache is None:
+        cache = caches[cache_dir] = ObjectCache(logger, cache_dir, max_bytes)
+    cache.logger, cache.max_bytes = logger, max_bytes
+    return cache
@@ -0,0 +1,239 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: Rate limiter module to share API request quotas per host or credential across threads and processes with a SQLite backed token bucket
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from email.utils import parsedate_to_datetime
+
+class RateLimiter:
+    """
+    A class RateLimiter which hands out tokens of a per key token bucket kept in a local SQLite file, so every job on the machine shares the quota
+    """
+    def __init__(self, logger, limits=None, default_limit=None, state_path=None, lock_timeout=60):
+        """
+        The constructor for RateLimiter class
+
+        Parameters:
+        logger (object)       : Logger object where log entries are to be made
+        limits (dict)         : Bucket per key (host or credential key) as {key: (requests per second, burst)}, by default None
+        default_limit (tuple) : (requests per second, burst) of keys not in limits, by default None which leaves them unthrottled
+        state_path (str)      : SQLite file shared by the processes, by default api_rate_limiter.sqlite in the temp folder
+        lock_timeout (float)  : Seconds a process waits for the SQLite write lock, by default 60
+        """
+        self.logger = logger
+        self.limits = {key: self.check_limit(limit, key) for key, limit in (limits or {}).items()}
+        self.default_limit = self.check_limit(default_limit) if default_limit else None
+        self.state_path = state_path or os.path.join(tempfile.gettempdir(), "api_rate_limiter.sqlite")
+        self.lock_timeout = lock_timeout
+        self.lock = threading.Lock()
+        with self.connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated_at REAL, blocked_until REAL)")
+
+    @staticmethod
+    def check_limit(limit, key=None):
+        """
+        A static method to validate a bucket, a rate or burst of zero or less would never refill it
+
+        Parameters:
+        limit (tuple) : (requests per second, burst)
+        key (str)     : Host or credential key of the bucket, by default None for the default limit
+
+        Returns:
+        limit (tuple) : (requests per second, burst) as floats
+        """
+        rate, burst = map(float, limit)
+        if rate <= 0 or burst <= 0:
+            raise ValueError(f"Rate limit of {key or 'default'} must have a rate and burst above 0, got {tuple(limit)}")
+        return rate, burst
+
+    def connect(self):
+        """
+        A method to open a connection to the state file, transactions are started explicitly by the callers
+
+        Parameters: None
+
+        Returns:
+        connection (object) : sqlite3 connection
+        """
+        return sqlite3.connect(self.state_path, timeout=self.lock_timeout, isolation_level=None)
+
+    def limit(self, key):
+        """
+        A method to return the bucket of a key
+
+        Parameters:
+        key (str) : Host or credential key
+
+        Returns:
+        limit (tuple) : (requests per second, burst) or None if the key is not throttled
+        """
+        return self.limits.get(key, self.default_limit)
+
+    def transaction(self, key, update):
+        """
+        A method to refill the bucket of a key and apply an update to it inside one exclusive SQLite transaction
+
+        Parameters:
+        key (str)           : Host or credential key
+        update (function)   : Function called with (tokens, blocked_until, now) returning (tokens, blocked_until, result)
+
+        Returns:
+        result : Third value returned by update
+        """
+        rate, burst = self.limit(key) or (0.0, 0.0)
+        with self.lock:
+            connection = self.connect()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                row = connection.execute("SELECT tokens, updated_at, blocked_until FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated_at, blocked_until = row if row else (burst, now, 0.0)
+                tokens = min(burst, tokens + max(now - updated_at, 0) * rate) if rate else tokens
+                tokens, blocked_until, result = update(tokens, blocked_until, now)
+                connection.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)", (key, tokens, now, blocked_until))
+                connection.execute("COMMIT")
+                return result
+            except Exception:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            finally:
+                connection.close()
+
+    def reserve(self, key, tokens=1):
+        """
+        A method to take tokens from the bucket of a key, the bucket may go below zero so callers queue up in the order they reserved
+
+        Parameters:
+        key (str)    : Host or credential key
+        tokens (int) : Tokens taken, by default 1
+
+        Returns:
+        delay (float) : Seconds the caller has to wait before sending the request
+        """
+        limit = self.limit(key)
+        if limit is None:
+            return 0.0
+        rate = limit[0]
+        def update(available, blocked_until, now):
+            available -= tokens
+            delay = max(blocked_until - now, -available / rate if available < 0 else 0.0, 0.0)
+            return available, blocked_until, delay
+        return self.transaction(key, update)
+
+    def acquire(self, key, tokens=1):
+        """
+        A method to take tokens from the bucket of a key and sleep until the request may be sent
+
+        Parameters:
+        key (str)    : Host or credential key
+        tokens (int) : Tokens taken, by default 1
+
+        Returns:
+        delay (float) : Seconds waited
+        """
+        delay = self.reserve(key, tokens)
+        if delay > 0:
+            self.logger.info(f"Rate limit of {key} reached, waiting {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    @staticmethod
+    def header_seconds(value, now):
+        """
+        A static method to convert a reset / Retry-After header value (seconds, epoch seconds or milliseconds, or HTTP date) to seconds from now
+
+        Parameters:
+        value (str) : Header value
+        now (float) : Current epoch time
+
+        Returns:
+        seconds (float) : Seconds from now or None if the value cannot be read
+        """
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                return parsedate_to_datetime(value).timestamp() - now
+            except (TypeError, ValueError):
+                return None
+        if seconds > 1e12:
+            return seconds / 1000 - now
+        if seconds > 1e9:
+            return seconds - now
+        return seconds
+
+    def update(self, key, status, headers, max_wait=300):
+        """
+        A method to adapt the bucket of a key from the quota headers of a response, X-RateLimit-Remaining / X-RateLimit-Reset (or RateLimit-*) and Retry-After
+
+        Parameters:
+        key (str)        : Host or credential key
+        status (int)     : Status code of the response
+        headers (dict)   : Headers of the response
+        max_wait (float) : Max seconds a header can block the key, by default 300
+
+        Returns : None
+        """
+        if self.limit(key) is None or not headers:
+            return
+        headers = {name.lower(): value for name, value in headers.items()}
+        remaining = headers.get("x-ratelimit-remaining", headers.get("ratelimit-remaining"))
+        reset = headers.get("x-ratelimit-reset", headers.get("ratelimit-reset"))
+        retry_after = headers.get("retry-after") if status in (429, 503) else None
+        try:
+            remaining = float(remaining) if remaining is not None else None
+        except ValueError:
+            remaining = None
+        if remaining is None and retry_after is None:
+            return
+        exhausted = retry_after is not None or remaining <= 0
+        def update(tokens, blocked_until, now):
+            wait = None
+            if retry_after is not None:
+                wait = self.header_seconds(retry_after, now)
+            elif reset is not None:
+                wait = self.header_seconds(reset, now)
+            if remaining is not None:
+                tokens = min(tokens, remaining)
+            if exhausted and wait is not None:
+                tokens = min(tokens, 0.0)
+                blocked_until = max(blocked_until, now + min(max(wait, 0), max_wait))
+            return tokens, blocked_until, exhausted
+        if self.transaction(key, update):
+            self.logger.warning(f"Quota of {key} exhausted (status {status}), requests on every job are held back")
+
+limiters = {}
+
+def get_rate_limiter(logger, limits=None, default_limit=None, state_path=None):
+    """
+    A method to return the process-wide RateLimiter for the state_path provided so every ApiRequest object shares it
+
+    Parameters:
+    logger (object)       : Logger object where log entries are to be made
+    limits (dict)         : Bucket per key as {key: (requests per second, burst)}, by default None
+    default_limit (tuple) : (requests per second, burst) of keys not in limits, by default None
+    state_path (str)      : SQLite file shared by the processes, by default api_rate_limiter.sqlite in the temp folder
+
+    Returns:
+    limiter (RateLimiter) : Shared RateLimiter object
+    """
+    limiter = limiters.get(state_path)
+    if limiter is None:
+        limiter = limiters[state_path] = RateLimiter(logger, limits, default_limit, state_path)
+    else:
+        limiter.limits.update({key: limiter.check_limit(limit, key) for key, limit in (limits or {}).items()})
+        if default_limit:
+            limiter.default_limit = limiter.check_limit(default_limit)
+    limiter.logger = logger
+    return limiter
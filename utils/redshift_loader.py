@@ -7,17 +7,36 @@
 #userstory:
 ########################################################
 
-from sqlalchemy import create_engine, MetaData, Table, INTEGER, BOOLEAN, TIMESTAMP, DATETIME, DATE, FLOAT,String,types
+from sqlalchemy import create_engine, MetaData, Table, Column, types, event
 from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from io import BytesIO
 import configparser
 import pandas as pd
-from redshift_connector import get_connection
+from engine_registry import get_engine
+from schema_cache import get_schema_cache
+from load_metrics import LoadMetrics
+
+# SQLAlchemy type families and the pandas dtype they are cast to, checked in order so dialect specific subclasses (BIGINT, SMALLINT, DOUBLE_PRECISION, VARCHAR(n), TIMESTAMPTZ...) resolve to their family
+# Integers use the nullable Int64 dtype so blank / null values survive the cast, NUMERIC / DECIMAL stay object so no precision is lost
+sqlalchemy_to_pandas_dtype = (
+    (types.Boolean, 'bool'),
+    (types.DateTime, 'datetime64[ns]'),
+    (types.Date, 'datetime64[ns]'),
+    (types.Integer, 'Int64'),
+    (types.Float, 'float64'),
+    (types.Numeric, 'object'),
+    (types.String, 'object'),
+)
+
+# Cast plans compiled per schema.table, shared by every Database object in the process and dropped whenever the table is reflected again or invalidated
+cast_plans = {}
 
 class Database:
     """
     A class Database which performs Truncate, Insert, and Upsert/Incremental operations on the provided tables
     """
-    def __init__(self, logger, config, profile, data, load_type, schema, main_table_name, stage_table_name=None, primary_key=None,log_table_primary_key=None,orderby_col=None,log_table=None):
+    def __init__(self, logger, config, profile, data, load_type, schema, main_table_name, stage_table_name=None, primary_key=None,log_table_primary_key=None,orderby_col=None,log_table=None,insert_method="to_sql",copy_config=None,schema_cache_ttl=3600,schema_cache_dir=None,cast_engine="pandas",upsert_method="merge",dedup_mode="server",swap_method="rename",transfer_method="insert_select",pool_options=None,metrics_callback=None,ledger_path=None,ledger_table=None):
         """
         The constructor for Database class
 
@@ -25,15 +44,30 @@ class Database:
         logger (object)        : Logger object where log entries are to be made
         config (str)           : Path of redshift credentials
         profile (str)          : Redshift profile
-        data (DataFrame)       : DataFrame constructed from the response fetched
-        load_type (str)        : truncate_and_load / incremental / fullload - input based on the requirement
+        data (DataFrame)       : DataFrame constructed from the response fetched, or an iterator of DataFrame chunks / Arrow record batches to load without holding the whole dataset in memory
+        load_type (str)        : truncate_and_load / swap / incremental / fullload - input based on the requirement, swap loads a shadow table and swaps it with main table so readers never see a half-loaded table
         schema (str)           : Schema name
         main_table_name (str)  : Main target table name
         stage_table_name (str) : Target Stage table name required if incremental load type or by default it is None
-        primary_key (str)      : Primary Key in the table if incremental load type or by default it is None
-        orderby_col (str)      : orderby_col in the table if remove_duplicates_and_load load type or by default it is None
+        primary_key (str/list) : Primary Key in the table if incremental load type, composite keys as list or comma separated values, by default it is None
+        orderby_col (str)      : orderby_col in the table if remove_duplicates_and_load load type or by default it is None, latest row per primary key is kept
         log_table_primary_key(str) : Primark key in the log table if soft_deletes load type or by default it is None
         log_table (str)        : log table name
+        insert_method (str)    : to_sql / copy - copy stages the data in S3 and loads it with a single COPY statement, by default it is to_sql
+        copy_config (dict)     : Required if insert_method is copy, keys - s3_profile, bucket, prefix, iam_role, file_format (parquet / csv, by default parquet), retain_files (y/n, by default n)
+        schema_cache_ttl (int) : Seconds for which reflected table metadata is reused, by default 3600
+        schema_cache_dir (str) : Local folder to persist reflected table metadata across runs, by default it is kept in memory only
+        cast_engine (str)      : pandas / arrow - engine used by transform to cast mismatched columns, by default pandas
+        upsert_method (str)    : merge / delete_insert - statement used by incremental_load, merge falls back to delete_insert only if the database does not support MERGE, by default merge
+        dedup_mode (str)       : server / dataframe - for remove_duplicates_and_load, dataframe dedups data in memory and loads only unique rows to stage table, server dedups the existing stage table in DB, by default server
+        swap_method (str)      : rename / append - for swap load type, rename swaps the tables in one transaction re-applying the grants of main table, append moves the shadow table blocks with ALTER TABLE APPEND keeping grants and dependent views but is not atomic (readers see an empty main table between TRUNCATE and APPEND), by default rename
+        transfer_method (str)  : insert_select / append - how staged rows are moved to main table for fullload with a stage table, append uses ALTER TABLE APPEND (leaves the stage table empty) and falls back to insert_select if the columns differ or the APPEND fails. delete_insert upserts always use insert_select so the delete and the insert commit together, by default insert_select
+        pool_options (dict)    : Tuning for the shared engine pool, keys - pool_size, max_overflow, pool_recycle, pool_pre_ping, connect_args
+        metrics_callback (function) : Function called with the metrics (rows, bytes, seconds, rows_per_sec, statements) of every load phase, by default None
+        ledger_path (str)      : Local SQLite file where phase metrics of every run are appended, by default None
+        ledger_table (str)     : schema.table in DB where phase metrics of every run are appended, by default None
+
+        The constructor only prepares the connection, load has to be called to run the load
         """
         self.logger = logger
         self.logger.info("Running Database Module")
@@ -43,15 +77,49 @@ class Database:
         self.primary_key = primary_key
         self.orderby_col = orderby_col
         self.load_type = load_type
-        self.engine = get_connection(config, profile, logger)
+        self.engine = get_engine(config, profile, logger, **(pool_options or {}))
         self.metadata = MetaData(bind=self.engine, schema=schema)
         self.Session = sessionmaker(bind=self.engine)
         self.schema=schema
         self.log_table_primary_key = log_table_primary_key
         self.log_table = log_table
-        self.initiate_load()
+        self.insert_method = insert_method
+        self.copy_config = copy_config or {}
+        self.copy_s3 = None
+        self.schema_cache = get_schema_cache(logger, schema_cache_ttl, schema_cache_dir)
+        self.cast_engine = cast_engine
+        self.upsert_method = upsert_method
+        self.dedup_mode = dedup_mode
+        self.swap_method = swap_method
+        self.transfer_method = transfer_method
+        self.metrics = LoadMetrics(logger, f"{schema}.{main_table_name}", load_type, metrics_callback, ledger_path, ledger_table)
+        event.listen(self.engine, "before_cursor_execute", self.metrics.count_statement)
+
+    def __enter__(self):
+        """
+        A method to use Database as a context manager, connections are released on exit
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        A method to release the connections when the context manager exits
+        """
         self.close()
 
+    def load(self):
+        """
+        A method to run the load based on the inputs received and release the connections once done
+
+        Parameters: None
+        Returns: None
+        """
+        try:
+            self.initiate_load()
+        finally:
+            self.metrics.write_ledger(self.engine)
+            self.close()
+
     def initiate_load(self):
         """
         A method to initiate type of load method based on the inputs received
@@ -62,19 +130,31 @@ class Database:
         try:
             if self.load_type == "truncate_and_load":
                 self.logger.info("Proceeding with truncate and load")
-                self.truncate_table(self.main_table)
-                self.insert_data(self.main_table, self.data)
+                self.load_chunks(self.main_table, self.data, truncate=True)
+            elif self.load_type == "swap":
+                self.logger.info("Proceeding with shadow table load and swap")
+                self.swap_load(self.main_table, self.data)
             elif self.load_type == "fullload":
                 self.logger.info("Proceeding with append only")
-                self.insert_data(self.main_table, self.data)
+                if self.transfer_method == "append" and self.stage_table:
+                    self.load_chunks(self.stage_table, self.data, truncate=True)
+                    self.transfer_rows(self.main_table, self.stage_table)
+                else:
+                    self.load_chunks(self.main_table, self.data)
             elif self.load_type == "incremental":
                 self.logger.info("Proceeding with incremental load")
-                self.truncate_table(self.stage_table)
-                self.insert_data(self.stage_table, self.data)
+                self.load_chunks(self.stage_table, self.data, truncate=True)
                 self.incremental_load(self.main_table, self.stage_table, self.primary_key)
             elif self.load_type == "remove_duplicates_and_load":
                 self.logger.info("Proceeding with remove duplicate_and_load load load to main table")
-                self.drop_duplicates(self.stage_table,self.primary_key,self.orderby_col)
+                if self.dedup_mode == "dataframe":
+                    chunks = (self.drop_duplicates_dataframe(chunk, self.primary_key, self.orderby_col) for chunk in self.iter_chunks(self.data))
+                    self.load_chunks(self.stage_table, chunks, truncate=True)
+                    if not isinstance(self.data, pd.DataFrame):
+                        self.logger.info("Data was loaded in chunks, removing duplicates across chunks in stage table")
+                        self.drop_duplicates(self.stage_table,self.primary_key,self.orderby_col)
+                else:
+                    self.drop_duplicates(self.stage_table,self.primary_key,self.orderby_col)
                 self.incremental_load(self.main_table, self.stage_table, self.primary_key)
             elif self.load_type =="log_based_soft_deletes":
                 self.logger.info("Proceeding with soft_deletes load")
@@ -83,6 +163,47 @@ class Database:
             self.logger.error(f"initiate_load method execution failed with error --> {e}")
             raise
 
+    @staticmethod
+    def compile_cast_plan(table):
+        """
+        A static method to compile the column to pandas dtype plan of a table, compiled once per table and reused for every transform
+
+        Parameters:
+        table (object) : Object of the table
+
+        Returns:
+        plan (dict) : Column name and expected pandas dtype as key:value pair
+        """
+        plan = cast_plans.get(table.fullname)
+        if plan is None:
+            plan = {}
+            for col in table.columns:
+                plan[col.name] = next((dtype for sqlalchemy_type, dtype in sqlalchemy_to_pandas_dtype if isinstance(col.type, sqlalchemy_type)), 'object')
+            cast_plans[table.fullname] = plan
+        return plan
+
+    @staticmethod
+    def arrow_cast(data, casts):
+        """
+        A static method to cast the mismatched columns through Arrow, releasing Arrow buffers while converting back to pandas
+
+        Parameters:
+        data (DataFrame) : Pandas DataFrame to be casted
+        casts (dict)     : Column name and expected pandas dtype as key:value pair for mismatched columns only
+
+        Returns:
+        data (DataFrame) : Pandas DataFrame with the mismatched columns casted
+        """
+        import pyarrow as pa
+        arrow_types = {'bool': pa.bool_(), 'datetime64[ns]': pa.timestamp('ns'), 'Int64': pa.int64(), 'float64': pa.float64(), 'object': pa.string()}
+        subset = pa.Table.from_pandas(data[list(casts)], preserve_index=False)
+        subset = subset.cast(pa.schema([(col, arrow_types[dtype]) for col, dtype in casts.items()]))
+        casted = subset.to_pandas(self_destruct=True, split_blocks=True, types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        del subset
+        for col in casts:
+            data[col] = casted[col].values
+        return data
+
     def transform(self, data, table):
         """
         A method to perform Data Type transformations if not matched with DataFrame and table created in DB
@@ -96,22 +217,15 @@ class Database:
         """
         self.logger.info(f"Executing transform method in Database class to perform type casting if required for {table}")
         try:
-            df_dtypes = data.dtypes.to_dict()
-            table_dtypes = {col.name: col.type for col in table.columns}
-            sqlalchemy_to_pandas_dtype = {
-                INTEGER: 'int64',
-                BOOLEAN: 'bool',
-                TIMESTAMP: 'datetime64[ns]',
-                DATETIME: 'datetime64[ns]',
-                DATE: 'datetime64[ns]',
-                FLOAT: 'float64',
-                String : 'object'
-
-            }
-            for col_name, sqlalchemy_type in table_dtypes.items():
-                expected_dtype = sqlalchemy_to_pandas_dtype.get(type(sqlalchemy_type), 'object')
-                if expected_dtype and df_dtypes[col_name] != expected_dtype:
-                    data[col_name] = data[col_name].astype(expected_dtype)
+            with self.metrics.phase("transform", table.name, len(data), data.memory_usage(index=False).sum()):
+                plan = self.compile_cast_plan(table)
+                casts = {col_name: expected_dtype for col_name, expected_dtype in plan.items() if col_name in data.columns and data[col_name].dtype != expected_dtype}
+                if casts:
+                    self.logger.info(f"Casting {len(casts)} columns using {self.cast_engine} - {casts}")
+                    if self.cast_engine == "arrow":
+                        data = self.arrow_cast(data, casts)
+                    else:
+                        data = data.astype(casts, copy=False)
             self.logger.info(f"transform method executed successfully - Returning data by checking for data types after doing any casting if required")
             return data
         except Exception as e:
@@ -120,7 +234,7 @@ class Database:
 
     def close(self):
         """
-        A method to close the DB connection
+        A method to close the DB sessions and return connections to the shared pool, the engine itself is disposed by engine_registry at exit
 
         Parameters : None
         Returns : None
@@ -128,26 +242,75 @@ class Database:
         self.logger.info("Closing DB connection by executing close method in Database class")
         try:
             self.Session.close_all()
-            self.engine.close()
+            if event.contains(self.engine, "before_cursor_execute", self.metrics.count_statement):
+                event.remove(self.engine, "before_cursor_execute", self.metrics.count_statement)
             self.logger.info("DB Connections closed")
         except Exception as e:
             self.logger.error(f"Failed to execute close method in Database class. DB connection was not closed, error --> {e}")
             raise
 
-    def truncate_table(self, table_name: str):
+    def get_table(self, table_name):
+        """
+        A method to return the table object using the schema cache, reflecting the table from DB only on a cache miss
+
+        Parameters:
+        table_name (str) : Name of the table
+
+        Returns:
+        table (object) : Object of the table
+        """
+        try:
+            key = f"{self.schema}.{table_name}"
+            if key in self.metadata.tables:
+                return self.metadata.tables[key]
+            columns = self.schema_cache.get(self.schema, table_name)
+            if columns is None:
+                cast_plans.pop(key, None) # Expired or invalidated entry, the plan is compiled again from the reflected columns
+                self.logger.info(f"Reflecting {key} from DB")
+                with self.metrics.phase("reflect", table_name):
+                    table = Table(table_name, self.metadata, autoload_with=self.engine)
+                self.schema_cache.put(self.schema, table_name, [(col.name, col.type) for col in table.columns])
+                return table
+            return Table(table_name, self.metadata, *[Column(name, col_type) for name, col_type in columns])
+        except Exception as e:
+            self.logger.error(f"Failed to execute get_table method in Database class for {table_name}, error --> {e}")
+            raise
+
+    def invalidate_table(self, table_name):
+        """
+        A method to drop the cached metadata of a table, to be called whenever the table is dropped or altered
+
+        Parameters:
+        table_name (str) : Name of the table
+
+        Returns : None
+        """
+        key = f"{self.schema}.{table_name}"
+        if key in self.metadata.tables:
+            self.metadata.remove(self.metadata.tables[key])
+        cast_plans.pop(key, None)
+        self.schema_cache.invalidate(self.schema, table_name)
+
+    def truncate_table(self, table_name: str, connection=None):
         """
         A method to execute truncate operation on the table provided as input
 
         Parameters:
-        table_name (str) : Name of the table which data has to be truncated
+        table_name (str)    : Name of the table which data has to be truncated
+        connection (object) : Open connection to run the delete in its transaction, by default it is committed in its own session
 
         Returns : None
         """
         self.logger.info(f"Executing truncate_table method in Database class for {table_name}")
         try:
-            table = Table(table_name, self.metadata, autoload_with=self.engine)
-            with self.Session() as session:
-                session.execute(table.delete())
+            table = self.get_table(table_name)
+            if connection is not None:
+                with self.metrics.phase("truncate", table_name) as record:
+                    record["rows"] = connection.execute(table.delete()).rowcount
+                self.logger.info(f"truncate_table method executed successfully - {table_name} has been truncated, commit pending with the load")
+                return
+            with self.Session() as session, self.metrics.phase("truncate", table_name) as record:
+                record["rows"] = session.execute(table.delete()).rowcount
                 self.logger.info(f"{table_name} has been truncated")
                 session.commit()
                 self.logger.info("Truncate operation has been committed")
@@ -172,84 +335,576 @@ class Database:
                 dtypedict.update({i: types.VARCHAR(collation='case_insensitive')})
         return dtypedict
 
-    def insert_data(self, table_name, data):
+    @staticmethod
+    def iter_chunks(data):
+        """
+        A static method to iterate the data provided as pandas DataFrame chunks
+
+        Parameters:
+        data (object) : DataFrame, Arrow Table / RecordBatch or an iterator of DataFrames / Arrow record batches
+
+        Returns:
+        chunk (DataFrame) : Generator of pandas DataFrame chunks
+        """
+        if isinstance(data, pd.DataFrame):
+            yield data
+            return
+        if hasattr(data, "to_batches"):
+            data = data.to_batches()
+        elif hasattr(data, "to_pandas"):
+            data = [data]
+        for chunk in data:
+            yield chunk if isinstance(chunk, pd.DataFrame) else chunk.to_pandas()
+
+    def load_chunks(self, table_name, data, truncate=False):
+        """
+        A method to load the data chunk by chunk into the table, truncating it once, and commit everything in a single transaction
+
+        Parameters:
+        table_name (str) : Name of the table which data has to be loaded
+        data (object)    : DataFrame or an iterator of DataFrame chunks / Arrow record batches
+        truncate (bool)  : Truncate the table before loading, by default False
+
+        Returns : None
+        """
+        self.logger.info(f"Executing load_chunks method in Database class for {table_name}")
+        try:
+            rows, chunks = 0, 0
+            with self.engine.begin() as connection:
+                if truncate:
+                    self.truncate_table(table_name, connection)
+                for chunk in self.iter_chunks(data):
+                    if chunk.empty:
+                        continue
+                    self.insert_data(table_name, chunk, connection)
+                    rows, chunks = rows + len(chunk), chunks + 1
+                    self.logger.info(f"Chunk {chunks} loaded to {table_name} - {rows} records so far")
+            self.logger.info(f"load_chunks method executed successfully - {rows} records in {chunks} chunks committed to {table_name}")
+        except Exception as e:
+            self.logger.error(f"Failed to execute load_chunks method in Database class for {table_name}, load has been rolled back, error --> {e}")
+            raise
+
+    def insert_data(self, table_name, data, connection=None):
         """
         A method to execute insert operation on the table provided as input with data
 
         Parameters:
-        table_name (str) : Name of the table which data has to be inserted
-        data (DataFrame) : Pandas DataFrame constructed from any type (csv,excel,parquet,text)
+        table_name (str)    : Name of the table which data has to be inserted
+        data (DataFrame)    : Pandas DataFrame constructed from any type (csv,excel,parquet,text)
+        connection (object) : Open connection to run the insert in its transaction, by default engine is used
 
         Returns : None
         """
         self.logger.info(f"Executing insert_data method in Database class for {table_name}")
         try:
-            table = Table(table_name, self.metadata, autoload_with=self.engine)
+            table = self.get_table(table_name)
             transformed_data = self.transform(data, table)
-            transformed_data.to_sql(name=table_name, schema=self.schema,con=self.engine, if_exists='append', index=False, chunksize=10000,method='multi',dtype=self.sqlcol(transformed_data))
+            with self.metrics.phase(self.insert_method, table_name, len(transformed_data), transformed_data.memory_usage(index=False).sum()):
+                if self.insert_method == "copy":
+                    self.copy_data(table_name, transformed_data, table, connection)
+                else:
+                    transformed_data.to_sql(name=table_name, schema=self.schema,con=connection if connection is not None else self.engine, if_exists='append', index=False, chunksize=10000,method='multi',dtype=self.sqlcol(transformed_data))
             self.logger.info(f"Insert into {table_name} completed - insert_data method executed successfully")
         except Exception as e:
             self.logger.error(f"Failed to execute insert_data method in Database class for {table_name}, error --> {e}")
             raise
 
-    def incremental_load(self, main_table, stage_table, primary_key):
+    @staticmethod
+    def parquet_schema(table, columns):
+        """
+        A static method to build the Parquet schema of the table columns, Parquet COPY rejects files whose physical types do not match the column types (eg INT64 for INTEGER, TIMESTAMP for DATE)
+
+        Parameters:
+        table (object) : Object of the table
+        columns (list) : Columns of the table which are staged, in table order
+
+        Returns:
+        schema (object) : pyarrow schema of the staged file
+        """
+        import pyarrow as pa
+        # Checked in order so subclasses (SMALLINT, BIGINT, REAL, DOUBLE_PRECISION) resolve before their family
+        arrow_types = (
+            (types.Boolean, lambda col_type: pa.bool_()),
+            (types.DateTime, lambda col_type: pa.timestamp('us', tz='UTC' if col_type.timezone else None)),
+            (types.Date, lambda col_type: pa.date32()),
+            (types.SmallInteger, lambda col_type: pa.int16()),
+            (types.BigInteger, lambda col_type: pa.int64()),
+            (types.Integer, lambda col_type: pa.int32()),
+            (types.REAL, lambda col_type: pa.float32()),
+            (types.Float, lambda col_type: pa.float64()),
+            (types.Numeric, lambda col_type: pa.decimal128(col_type.precision or 18, col_type.scale or 0)),
+        )
+        table_columns = {col.name: col for col in table.columns}
+        fields = []
+        for col_name in columns:
+            col_type = table_columns[col_name].type
+            fields.append(pa.field(col_name, next((build(col_type) for sqlalchemy_type, build in arrow_types if isinstance(col_type, sqlalchemy_type)), pa.string())))
+        return pa.schema(fields)
+
+    def stage_to_s3(self, s3, table_name, data, file_format, schema=None):
+        """
+        A method to write the DataFrame as a compressed file (snappy Parquet / gzip CSV) and stage it in S3 for COPY
+
+        Parameters:
+        s3 (object)       : S3Operations object used to upload the staged file
+        table_name (str)  : Name of the table which data will be copied to, used in the staged file name
+        data (DataFrame)  : Pandas DataFrame which has undergone Data Type casting
+        file_format (str) : parquet / csv
+        schema (object)   : pyarrow schema the Parquet file is cast to, see parquet_schema, by default the types inferred from the DataFrame
+
+        Returns:
+        bucket (str) : S3 bucket name where the file has been staged
+        key (str)    : Key inclusive of prefix and staged file name
+        """
+        self.logger.info(f"Executing stage_to_s3 method in Database class for {table_name}")
+        try:
+            buffer = BytesIO()
+            if file_format == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                arrow_table = pa.Table.from_pandas(data, preserve_index=False)
+                if schema is not None:
+                    # Timestamps staged into DATE columns drop their time part, every other cast raises instead of losing data
+                    arrow_table = pa.table([column.cast(field.type, safe=not (pa.types.is_timestamp(column.type) and pa.types.is_date(field.type))) for column, field in zip(arrow_table.columns, schema)], schema=schema)
+                pq.write_table(arrow_table, buffer, compression="snappy", coerce_timestamps="us", allow_truncated_timestamps=True)
+                file_name = f"{table_name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+            else:
+                data.to_csv(buffer, index=False, compression="gzip")
+                file_name = f"{table_name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.csv.gz"
+            buffer.seek(0)
+            bucket, prefix = self.copy_config["bucket"], self.copy_config.get("prefix", "")
+            s3.upload_file(file_name=file_name, file_type="rawfile", data=buffer, bucket=bucket, prefix=prefix)
+            self.logger.info(f"stage_to_s3 method executed successfully - {file_name} staged in {bucket}/{prefix}")
+            return bucket, prefix + file_name
+        except Exception as e:
+            self.logger.error(f"Failed to execute stage_to_s3 method in Database class for {table_name}, error --> {e}")
+            raise
+
+    def get_copy_s3(self):
+        """
+        A method to return the S3Operations object used to stage COPY files, created on first use and reused for every chunk
+
+        Parameters: None
+
+        Returns:
+        s3 (object) : S3Operations object
+        """
+        if self.copy_s3 is None:
+            from s3_operations import S3Operations
+            self.copy_s3 = S3Operations(logger=self.logger, profile_name=self.copy_config.get("s3_profile"), partition="N", region_name=self.copy_config.get("region"))
+        return self.copy_s3
+
+    def copy_data(self, table_name, data, table, connection=None):
+        """
+        A method to load the data into the table with a single COPY statement after staging it in S3
+
+        Parameters:
+        table_name (str)    : Name of the table which data has to be copied
+        data (DataFrame)    : Pandas DataFrame which has undergone Data Type casting
+        table (object)      : Object of the table
+        connection (object) : Open connection to run the COPY in its transaction, by default it is committed on its own
+
+        Returns : None
+        """
+        self.logger.info(f"Executing copy_data method in Database class for {table_name}")
+        bucket, key = None, None
+        try:
+            file_format = self.copy_config.get("file_format", "parquet").lower()
+            table_columns = [col.name for col in table.columns]
+            columns = [col for col in table_columns if col in data.columns]
+            if file_format == "parquet" and columns != table_columns:
+                self.logger.warning(f"DataFrame does not have all the columns of {table_name}, Parquet COPY maps columns by position - falling back to csv")
+                file_format = "csv"
+            s3 = self.get_copy_s3()
+            schema = self.parquet_schema(table, columns) if file_format == "parquet" else None
+            bucket, key = self.stage_to_s3(s3, table_name, data[columns], file_format, schema)
+            if file_format == "parquet":
+                copy_query = f"""COPY {self.schema}.{table_name} FROM 's3://{bucket}/{key}' iam_role '{self.copy_config["iam_role"]}' FORMAT AS PARQUET;"""
+            else:
+                copy_query = f"""COPY {self.schema}.{table_name} ({', '.join(columns)}) FROM 's3://{bucket}/{key}' iam_role '{self.copy_config["iam_role"]}' FORMAT AS CSV GZIP IGNOREHEADER 1 TIMEFORMAT 'auto' EMPTYASNULL;"""
+            if connection is not None:
+                connection.execute(copy_query)
+            else:
+                with self.engine.begin() as copy_connection:
+                    copy_connection.execute(copy_query)
+            self.logger.info(f"Copy completed from {bucket}/{key} to {self.schema}.{table_name}")
+            self.logger.info(f"copy_data method executed successfully for {table_name}")
+        except Exception as e:
+            self.logger.error(f"Failed to execute copy_data method in Database class for {table_name}, error --> {e}")
+            raise
+        finally:
+            if key is not None and str(self.copy_config.get("retain_files", "n")).lower() != "y":
+                try:
+                    self.copy_s3.s3_client.delete_object(Bucket=bucket, Key=key) # COPY has read the file once the statement returns, even before the commit
+                    self.logger.info(f"Staged file {bucket}/{key} has been removed")
+                except Exception as e:
+                    self.logger.warning(f"Unable to remove staged file {bucket}/{key}, error --> {e}")
+
+    def swap_load(self, main_table, data):
         """
-        A method to execute upsert/incremental operations on the tables provided as input
+        A method to load the data into a shadow table created like the main table and swap it in place of the main table
 
         Parameters:
-        main_table (str)  : Name of the main table to which incremental records have to be inserted
-        stage_table (str) : Name of the table which has incremental data pulled from source
-        primary_key (str) : Primary Key column which is present in both main_table and stage_table
+        main_table (str) : Name of the main table which data has to be replaced
+        data (object)    : DataFrame or an iterator of DataFrame chunks / Arrow record batches
 
         Returns : None
         """
+        self.logger.info(f"Executing swap_load method in Database class for {main_table}")
+        shadow_table = f"{main_table}_shadow"
+        main, shadow = f"{self.schema}.{main_table}", f"{self.schema}.{shadow_table}"
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(f"DROP TABLE IF EXISTS {shadow}")
+                connection.execute(f"CREATE TABLE {shadow} (LIKE {main})")
+            self.invalidate_table(shadow_table)
+            self.logger.info(f"Created shadow table {shadow} like {main}")
+            self.load_chunks(shadow_table, data)
+            if self.swap_method == "append":
+                # ALTER TABLE APPEND cannot run inside a transaction, so this mode is not atomic and is only used when asked for
+                self.logger.warning(f"swap_method append is not atomic, readers see an empty {main} until ALTER TABLE APPEND completes")
+                with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection, self.metrics.phase("swap_append", main_table):
+                    connection.execute(f"TRUNCATE {main}")
+                    connection.execute(f"ALTER TABLE {main} APPEND FROM {shadow}")
+                    connection.execute(f"DROP TABLE {shadow}")
+                self.logger.info(f"Moved {shadow} blocks into {main} using ALTER TABLE APPEND")
+            else:
+                with self.engine.begin() as connection:
+                    views = self.dependent_views(connection, main_table)
+                    if views:
+                        # Views bound to the main table follow it on rename and block the drop, the rows are replaced in place in one transaction instead
+                        self.logger.warning(f"{main} has dependent views {views}, replacing its rows from {shadow} in one transaction instead of renaming")
+                        with self.metrics.phase("swap_replace", main_table) as record:
+                            connection.execute(f"DELETE FROM {main}")
+                            record["rows"] = connection.execute(f"INSERT INTO {main} SELECT * FROM {shadow}").rowcount
+                            connection.execute(f"DROP TABLE {shadow}")
+                    else:
+                        grants = self.table_grants(connection, main_table)
+                        with self.metrics.phase("swap_rename", main_table):
+                            connection.execute(f"ALTER TABLE {main} RENAME TO {main_table}_old")
+                            connection.execute(f"ALTER TABLE {shadow} RENAME TO {main_table}")
+                            for grant in grants:
+                                connection.execute(grant)
+                            connection.execute(f"DROP TABLE {self.schema}.{main_table}_old")
+                        self.logger.info(f"Re-applied {len(grants)} grants of {main}")
+                self.logger.info(f"Swapped {shadow} in place of {main}")
+            self.invalidate_table(main_table)
+            self.invalidate_table(shadow_table)
+            self.logger.info(f"swap_load method executed successfully for {main_table}")
+        except Exception as e:
+            self.logger.error(f"Failed to execute swap_load method in Database class for {main_table}, error --> {e}")
+            raise
+
+    def dependent_views(self, connection, table_name):
+        """
+        A method to list the views bound to a table, late-binding views (WITH NO SCHEMA BINDING) are not listed as they do not depend on it
+
+        Parameters:
+        connection (object) : Open connection
+        table_name (str)    : Name of the table
+
+        Returns:
+        views (list) : schema.view names
+        """
+        rows = connection.execute(f"""SELECT DISTINCT vn.nspname || '.' || vc.relname FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid JOIN pg_class vc ON vc.oid = r.ev_class JOIN pg_namespace vn ON vn.oid = vc.relnamespace JOIN pg_class c ON c.oid = d.refobjid JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname = '{self.schema}' AND c.relname = '{table_name}' AND vc.oid <> c.oid""").fetchall()
+        return [row[0] for row in rows]
+
+    def table_grants(self, connection, table_name):
+        """
+        A method to build the GRANT statements which recreate the privileges of a table on a new table of the same name, CREATE TABLE LIKE does not copy them
+
+        Parameters:
+        connection (object) : Open connection
+        table_name (str)    : Name of the table
+
+        Returns:
+        grants (list) : GRANT statements
+        """
+        privileges = {"r": "SELECT", "a": "INSERT", "w": "UPDATE", "d": "DELETE", "x": "REFERENCES", "D": "DROP", "t": "TRIGGER", "R": "RULE"}
+        acl = connection.execute(f"""SELECT array_to_string(c.relacl, ',') FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname = '{self.schema}' AND c.relname = '{table_name}'""").scalar()
+        grants = []
+        for item in (acl or "").split(","):
+            if "=" not in item:
+                continue
+            grantee, rights = item.rsplit("=", 1)
+            rights = rights.split("/")[0].replace("*", "")
+            names = [privileges[right] for right in rights if right in privileges]
+            if not names:
+                continue
+            grantee = grantee.strip('"')
+            if not grantee:
+                grantee = "PUBLIC"
+            elif grantee.startswith("group "):
+                grantee = f'GROUP "{grantee[6:].strip(chr(34))}"'
+            else:
+                grantee = f'"{grantee}"'
+            grants.append(f"GRANT {', '.join(names)} ON {self.schema}.{table_name} TO {grantee}")
+        return grants
+
+    @staticmethod
+    def key_columns(primary_key):
+        """
+        A static method to return the primary key columns as a list
+
+        Parameters:
+        primary_key (str/list) : Primary Key column, composite keys as list or comma separated values
+
+        Returns:
+        keys (list) : List of primary key columns
+        """
+        if isinstance(primary_key, (list, tuple)):
+            return list(primary_key)
+        return [key.strip() for key in str(primary_key).split(',') if key.strip()]
+
+    def incremental_load(self, main_table, stage_table, primary_key):
+        """
+        A method to execute upsert/incremental operations on the tables provided as input in a single transaction
+
+        Parameters:
+        main_table (str)       : Name of the main table to which incremental records have to be inserted
+        stage_table (str)      : Name of the table which has incremental data pulled from source
+        primary_key (str/list) : Primary Key column(s) which are present in both main_table and stage_table
+
+        Returns:
+        counts (dict) : No of records inserted and updated in main table
+        """
         self.logger.info(f"Executing incremental_load method in Database class for main table {main_table} and stage table {stage_table}")
         try:
-            delete_query = f"""
-            DELETE FROM {self.schema}.{main_table} USING {self.schema}.{stage_table}
-            WHERE {self.schema}.{main_table}.{primary_key} = {self.schema}.{stage_table}.{primary_key}
-            """
-            insert_query = f"""
-            INSERT INTO {self.schema}.{main_table}
-            SELECT * FROM {self.schema}.{stage_table}
-            """
-            self.engine.execute(delete_query)
-            self.logger.info(f"Deleted records in main table {main_table} matching with the ones in stage table {stage_table}")
-            self.engine.execute(insert_query)
-            self.logger.info(f"Inserted incremental records in main table {main_table}")
+            keys = self.key_columns(primary_key)
+            stage_columns = {col.name for col in self.get_table(stage_table).columns}
+            columns = [col.name for col in self.get_table(main_table).columns if col.name in stage_columns]
+            main, stage = f"{self.schema}.{main_table}", f"{self.schema}.{stage_table}"
+            join_condition = " AND ".join(f"{main}.{key} = {stage}.{key}" for key in keys)
+            counts = None
+            if self.upsert_method == "merge":
+                try:
+                    counts = self.merge_load(main, stage, keys, columns, join_condition)
+                except Exception as e:
+                    if not self.merge_unsupported(e):
+                        raise # eg duplicate keys in the stage table, delete and insert would load every duplicate into main
+                    self.logger.warning(f"MERGE is not supported for {main} with error --> {e}, falling back to delete and insert")
+            if counts is None:
+                counts = self.delete_insert_load(main_table, stage_table, columns, join_condition)
+            self.logger.info(f"Inserted {counts['inserted']} and updated {counts['updated']} records in main table {main_table}")
             self.logger.info(f"incremental_load method executed successfully for {stage_table} and {main_table}")
+            return counts
         except Exception as e:
             self.logger.error(f"Failed to execute incremental_load method in Database class for main table {main_table} & stage table {stage_table}, error --> {e}")
             raise
 
+    @staticmethod
+    def merge_unsupported(error):
+        """
+        A static method to tell whether MERGE failed because the database does not support it, every other MERGE error is a data error
+
+        Parameters:
+        error (Exception) : Error raised by the MERGE
+
+        Returns:
+        unsupported (bool) : True if the error is a syntax error at MERGE
+        """
+        return 'syntax error at or near "merge"' in str(error).lower()
+
+    def merge_load(self, main, stage, keys, columns, join_condition):
+        """
+        A method to upsert stage records into main table using MERGE in a single transaction
+
+        Parameters:
+        main (str)           : schema.table name of the main table
+        stage (str)          : schema.table name of the stage table
+        keys (list)          : Primary key columns
+        columns (list)       : Columns present in both main and stage table
+        join_condition (str) : Join condition on primary key columns
+
+        Returns:
+        counts (dict) : No of records inserted and updated in main table
+        """
+        update_columns = [col for col in columns if col not in keys] or columns
+        match_query = f"SELECT COUNT(*) FROM {stage} WHERE EXISTS (SELECT 1 FROM {main} WHERE {join_condition})" # Stage rows with a match, duplicate keys in main are not counted twice
+        merge_query = f"""
+        MERGE INTO {main} USING {stage} ON {join_condition}
+        WHEN MATCHED THEN UPDATE SET {', '.join(f"{col} = {stage}.{col}" for col in update_columns)}
+        WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) VALUES ({', '.join(f"{stage}.{col}" for col in columns)})
+        """
+        with self.engine.begin() as connection, self.metrics.phase("merge", main) as record:
+            updated = connection.execute(match_query).scalar()
+            total = connection.execute(f"SELECT COUNT(*) FROM {stage}").scalar()
+            connection.execute(merge_query)
+            record["rows"] = total
+        self.logger.info(f"Merged records from {stage} into {main}")
+        return {"inserted": total - updated, "updated": updated}
+
+    def delete_insert_load(self, main_table, stage_table, columns, join_condition):
+        """
+        A method to upsert stage records into main table using DELETE USING and INSERT SELECT in a single transaction
+        ALTER TABLE APPEND is never used here as it cannot run inside the transaction of the delete
+
+        Parameters:
+        main_table (str)     : Name of the main table
+        stage_table (str)    : Name of the stage table
+        columns (list)       : Columns present in both main and stage table
+        join_condition (str) : Join condition on primary key columns
+
+        Returns:
+        counts (dict) : No of records inserted and updated in main table
+        """
+        main, stage = f"{self.schema}.{main_table}", f"{self.schema}.{stage_table}"
+        delete_query = f"""
+        DELETE FROM {main} USING {stage}
+        WHERE {join_condition}
+        """
+        if self.transfer_method == "append":
+            self.logger.info("transfer_method append is not used for delete_insert upserts, the delete and INSERT SELECT commit in one transaction")
+        with self.engine.begin() as connection:
+            with self.metrics.phase("delete_using", main_table) as record:
+                deleted = record["rows"] = connection.execute(delete_query).rowcount
+            self.logger.info(f"Deleted records in main table {main} matching with the ones in stage table {stage}")
+            inserted = self.insert_select(main, stage, columns, connection)
+        return {"inserted": inserted - deleted, "updated": deleted}
+
+    def is_append_compatible(self, main_table, stage_table):
+        """
+        A method to check if ALTER TABLE APPEND can be used, which requires both tables to have the same columns with the same data types
+
+        Parameters:
+        main_table (str)  : Name of the main table
+        stage_table (str) : Name of the stage table
+
+        Returns:
+        compatible (bool) : True if the columns and data types of both tables match
+        """
+        def column_types(table_name):
+            return {col.name: str(col.type.compile(dialect=self.engine.dialect)) for col in self.get_table(table_name).columns}
+        main_columns, stage_columns = column_types(main_table), column_types(stage_table)
+        if main_columns != stage_columns:
+            mismatch = {col for col in set(main_columns) | set(stage_columns) if main_columns.get(col) != stage_columns.get(col)}
+            self.logger.warning(f"Columns of {main_table} and {stage_table} differ ({', '.join(sorted(mismatch))}), ALTER TABLE APPEND can not be used")
+            return False
+        return True
+
+    def insert_select(self, main, stage, columns, connection):
+        """
+        A method to copy the stage rows into main table with INSERT SELECT on an explicit column list
+
+        Parameters:
+        main (str)          : schema.table name of the main table
+        stage (str)         : schema.table name of the stage table
+        columns (list)      : Columns present in both main and stage table
+        connection (object) : Open connection to run the insert in its transaction
+
+        Returns:
+        rows (int) : No of records inserted
+        """
+        insert_query = f"""
+        INSERT INTO {main} ({', '.join(columns)})
+        SELECT {', '.join(columns)} FROM {stage}
+        """
+        with self.metrics.phase("insert_select", main) as record:
+            rows = record["rows"] = connection.execute(insert_query).rowcount
+        self.logger.info(f"Inserted {rows} records in {main} from {stage} using INSERT SELECT")
+        return rows
+
+    def transfer_rows(self, main_table, stage_table, columns=None):
+        """
+        A method to move the staged rows into main table, using ALTER TABLE APPEND if transfer method is append and the tables are compatible or else INSERT SELECT, a failed APPEND falls back to INSERT SELECT
+
+        Parameters:
+        main_table (str)  : Name of the main table
+        stage_table (str) : Name of the stage table
+        columns (list)    : Columns present in both main and stage table, by default derived from the tables
+
+        Returns:
+        rows (int) : No of records moved to main table
+        """
+        self.logger.info(f"Executing transfer_rows method in Database class from {stage_table} to {main_table}")
+        main, stage = f"{self.schema}.{main_table}", f"{self.schema}.{stage_table}"
+        try:
+            if columns is None:
+                stage_columns = {col.name for col in self.get_table(stage_table).columns}
+                columns = [col.name for col in self.get_table(main_table).columns if col.name in stage_columns]
+            rows = None
+            if self.transfer_method == "append" and self.is_append_compatible(main_table, stage_table):
+                try:
+                    with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection, self.metrics.phase("alter_table_append", main_table) as record:
+                        rows = record["rows"] = connection.execute(f"SELECT COUNT(*) FROM {stage}").scalar()
+                        connection.execute(f"ALTER TABLE {main} APPEND FROM {stage}")
+                    self.logger.info(f"Moved {rows} records from {stage} to {main} using ALTER TABLE APPEND")
+                except Exception as e:
+                    # ALTER TABLE APPEND is all or nothing, the stage rows are still in place when it fails (eg column encoding or nullability differs)
+                    self.logger.warning(f"ALTER TABLE APPEND from {stage} to {main} failed, falling back to INSERT SELECT, error --> {e}")
+                    rows = None
+            if rows is None:
+                with self.engine.begin() as connection:
+                    rows = self.insert_select(main, stage, columns, connection)
+            self.logger.info(f"transfer_rows method executed successfully from {stage_table} to {main_table}")
+            return rows
+        except Exception as e:
+            self.logger.error(f"Failed to execute transfer_rows method in Database class from {stage_table} to {main_table}, error --> {e}")
+            raise
+
+    def drop_duplicates_dataframe(self, data, primary_key, orderby_col):
+        """
+        A method to keep only the latest row per primary key in the DataFrame before it is staged
+
+        Parameters:
+        data (DataFrame)       : Pandas DataFrame which has to be deduplicated
+        primary_key (str/list) : Primary Key column(s), composite keys as list or comma separated values
+        orderby_col (str/list) : Column(s) used to pick the latest row, highest value is kept
+
+        Returns:
+        data (DataFrame) : Pandas DataFrame with unique rows per primary key
+        """
+        self.logger.info("Executing drop_duplicates_dataframe method in Database class")
+        try:
+            orderby_cols = self.key_columns(orderby_col)
+            with self.metrics.phase("dedup_dataframe", None, len(data), data.memory_usage(index=False).sum()):
+                unique_data = data.sort_values(orderby_cols, ascending=False, kind="stable", na_position="first").drop_duplicates(subset=self.key_columns(primary_key), keep="first")
+            self.logger.info(f"No of Duplicates removed : {len(data) - len(unique_data)}")
+            return unique_data
+        except Exception as e:
+            self.logger.error(f"Failed to execute drop_duplicates_dataframe method in Database class, error --> {e}")
+            raise
+
     def drop_duplicates(self, stage_table, primary_key, orderby_col) :
+        """
+        A method to keep only the latest row per primary key in the stage table, rebuilt from the windowed select in a single transaction
+
+        Parameters:
+        stage_table (str)      : Name of the stage table which has to be deduplicated
+        primary_key (str/list) : Primary Key column(s), composite keys as list or comma separated values
+        orderby_col (str/list) : Column(s) used to pick the latest row, highest value is kept
+
+        Returns : None
+        """
         try :
             self.logger.info(f"Executing drop_duplicates method in Database class for stage table {stage_table}")
+            columns = ', '.join(col.name for col in self.get_table(stage_table).columns)
+            orderby = ', '.join(f"{col} DESC" for col in self.key_columns(orderby_col))
             create_temp_table_query = f"""
-            create table {self.schema}.{stage_table}_temp as
-            SELECT * FROM (
-            SELECT *, ROW_NUMBER() OVER (PARTITION BY {primary_key} ORDER BY {orderby_col} DESC) AS row_num
-            FROM {self.schema}.{stage_table})
+            create table {self.schema}.{stage_table}_temp (like {self.schema}.{stage_table})
             """
-            duplicate_delete_query = f"""
-            DELETE FROM {self.schema}.{stage_table}_temp
-            where row_num > 1
+            insert_unique_query = f"""
+            INSERT INTO {self.schema}.{stage_table}_temp ({columns})
+            SELECT {columns} FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY {', '.join(self.key_columns(primary_key))} ORDER BY {orderby}) AS row_num
+            FROM {self.schema}.{stage_table})
+            where row_num = 1
             """
-            drop_row_num_column_query = f"""
-            Alter table {self.schema}.{stage_table}_temp drop column row_num
+            drop_query = f"""
+            drop table {self.schema}.{stage_table}
             """
-            drop_and_rename_query = f"""
-            drop table {self.schema}.{stage_table};
+            rename_query = f"""
             Alter table {self.schema}.{stage_table}_temp rename to {stage_table}
             """
-            self.engine.execute(create_temp_table_query)
-            self.logger.info(f"Created an {stage_table}_temp with row number column")
-            r=self.engine.execute(duplicate_delete_query)
-            self.logger.info(f"No of Duplicates removed : {r.rowcount}")
-            self.logger.info(f"Removed the duplicates from {stage_table}_temp table")
-            self.engine.execute(drop_row_num_column_query)
-            self.logger.info(f"Dropped the row number column from {stage_table}_temp table")
-            self.engine.execute(drop_and_rename_query)
+            with self.engine.begin() as connection, self.metrics.phase("dedup", stage_table) as record:
+                total = record["rows"] = connection.execute(f"SELECT COUNT(*) FROM {self.schema}.{stage_table}").scalar()
+                connection.execute(create_temp_table_query)
+                self.logger.info(f"Created an {stage_table}_temp like {stage_table}")
+                unique = connection.execute(insert_unique_query).rowcount
+                self.logger.info(f"No of Duplicates removed : {total - unique}")
+                connection.execute(drop_query)
+                connection.execute(rename_query)
+            self.invalidate_table(stage_table)
             self.logger.info(f"Rename the {stage_table}_temp to {stage_table}")
         except Exception as e:
             self.logger.error(f"Failed to execute drop_duplicates method in Database class for stage table {stage_table}, error --> {e}")
@@ -278,8 +933,9 @@ class Database:
                    FROM {schema}.{log_table} log
                    WHERE log.{log_table_primary_key} = {schema}.{main_table}.{primary_key})"""
             self.logger.info(f"Soft_delete script executed sucessfully for {main_table}")
-            results = self.engine.execute(soft_deletes_query)
-            no_rows_updated = results.rowcount
+            with self.metrics.phase("soft_deletes", main_table) as record:
+                results = self.engine.execute(soft_deletes_query)
+                no_rows_updated = record["rows"] = results.rowcount
             self.logger.info(f"Toatal no of records has been processed : {no_rows_updated}")
             print(f"Toatal no of records has been processed : {no_rows_updated}")
 
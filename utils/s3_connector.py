@@ -8,13 +8,23 @@
 ########################################################
 
 #### Importing Necessary Package ####
+import threading
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
+
+clients = {}
+lock = threading.Lock()
 
 class S3Connector:
-    def __init__(self, logger, profile_name=None, aws_access_key_id=None, aws_secret_access_key=None, region_name=None, role_arn=None, session_name=None):
+    def __init__(self, logger, profile_name=None, aws_access_key_id=None, aws_secret_access_key=None, region_name=None, role_arn=None, session_name=None, max_pool_connections=50, retry_mode="adaptive", max_attempts=10, tcp_keepalive=True):
         """
         Initializes the S3Connector object.
 
+        Clients are shared across the process keyed by profile, keys, role and region, so every S3Connector built with the same
+        inputs reuses the same warm connection pool, and assumed-role credentials are refreshed automatically before they expire.
+
         Parameters:
         logger (Logger)             : Logger object for logging.
         profile_name (str)          : AWS profile name.
@@ -23,6 +33,10 @@ class S3Connector:
         region_name (str)           : AWS region name.
         role_arn (str)              : ARN of the role to assume.
         session_name (str)          : Session name for the assumed role.
+        max_pool_connections (int)  : Connections kept in the client pool, by default 50.
+        retry_mode (str)            : botocore retry mode (legacy / standard / adaptive), by default adaptive.
+        max_attempts (int)          : Attempts made per request including retries, by default 10.
+        tcp_keepalive (bool)        : Enable TCP keepalive on the pooled connections, by default True.
 
         Returns: None
         """
@@ -33,35 +47,48 @@ class S3Connector:
         self.region_name = region_name
         self.role_arn = role_arn
         self.session_name = session_name
+        self.client_config = Config(max_pool_connections=max_pool_connections, retries={"mode": retry_mode, "max_attempts": max_attempts}, tcp_keepalive=tcp_keepalive)
+        key = (profile_name, aws_access_key_id, region_name, role_arn, session_name, max_pool_connections, retry_mode, max_attempts, tcp_keepalive)
 
-        # Initialize the session
-        try:
-            self.logger.info("Initializing S3 session")
-            if self.aws_access_key and self.aws_secret_key:
-                self.s3_session = boto3.Session(aws_access_key_id=self.aws_access_key_id,aws_secret_access_key=self.aws_secret_access_key,region_name=self.region_name)
-            else:self.s3_session = boto3.Session(profile_name=profile_name)
-            self.logger.info("Boto3 session initialized successfully.")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize boto3 session, error --> {e}")
-            raise
+        with lock:
+            cached = clients.get(key)
+            if cached:
+                self.s3_session, self.credentials, self.s3_client = cached
+                self.logger.info(f"Reusing cached S3 client for profile {profile_name}")
+                return
 
-        # Assume role if role ARN and session name are provided
-        self.credentials = None
-        if self.role_arn and self.session_name:
+            # Initialize the session
             try:
-                self.logger.info("ARN Role and Session Name found, temporary role will be established")
-                self.credentials = self.assume_role()
+                self.logger.info("Initializing S3 session")
+                if self.aws_access_key and self.aws_secret_key:
+                    self.s3_session = boto3.Session(aws_access_key_id=self.aws_access_key,aws_secret_access_key=self.aws_secret_key,region_name=self.region_name)
+                else:self.s3_session = boto3.Session(profile_name=profile_name)
+                self.logger.info("Boto3 session initialized successfully.")
             except Exception as e:
-                self.logger.error(f"Role assumption failed with error --> {e}")
+                self.logger.error(f"Failed to initialize boto3 session, error --> {e}")
                 raise
 
-        # Establish S3 connection
-        try:
-            self.s3_client = self.s3_connection()
-            self.logger.info("S3 connection established successfully.")
-        except Exception as e:
-            self.logger.error(f"Failed to establish S3 connection with error --> {e}")
-            raise
+            # Assume role if role ARN and session name are provided
+            self.credentials = None
+            if self.role_arn and self.session_name:
+                try:
+                    self.logger.info("ARN Role and Session Name found, temporary role will be established")
+                    self.credentials = RefreshableCredentials.create_from_metadata(metadata=self.refresh_credentials(), refresh_using=self.refresh_credentials, method="sts-assume-role")
+                    botocore_session = botocore.session.get_session()
+                    botocore_session._credentials = self.credentials
+                    self.s3_session = boto3.Session(botocore_session=botocore_session, region_name=self.region_name)
+                except Exception as e:
+                    self.logger.error(f"Role assumption failed with error --> {e}")
+                    raise
+
+            # Establish S3 connection
+            try:
+                self.s3_client = self.s3_connection()
+                clients[key] = (self.s3_session, self.credentials, self.s3_client)
+                self.logger.info("S3 connection established successfully.")
+            except Exception as e:
+                self.logger.error(f"Failed to establish S3 connection with error --> {e}")
+                raise
 
     def s3_connection(self):
         """Establishes the S3 connection
@@ -75,15 +102,10 @@ class S3Connector:
         try:
             if self.credentials:
                 self.logger.info("Connecting using assumed role credentials")
-                s3_client= self.s3_session.client('s3',
-                    aws_access_key_id=self.credentials["access_key"],
-                    aws_secret_access_key=self.credentials['secret_key'],
-                    aws_session_token=self.credentials['session_token'],
-                    region_name=self.region_name
-                )
+                s3_client= self.s3_session.client('s3', region_name=self.region_name, config=self.client_config)
                 self.logger.info("Connection using assumed role successful")
             else:
-                s3_client=self.s3_session.client('s3')
+                s3_client=self.s3_session.client('s3', config=self.client_config)
                 self.logger.info("S3 client connection successful")
             return s3_client
         except Exception as e:
@@ -96,7 +118,7 @@ class S3Connector:
         Parameter:None
 
         Returns:
-        assumed_credentials (dict) : A dictionary containing the temporary credentials.
+        assumed_credentials (dict) : A dictionary containing the temporary credentials and their expiry time.
         """
         self.logger.info("Executing assume_role method")
         try:
@@ -110,7 +132,8 @@ class S3Connector:
             assumed_credentials={
                 'access_key': credentials['AccessKeyId'],
                 'secret_key': credentials['SecretAccessKey'],
-                'session_token': credentials['SessionToken']
+                'session_token': credentials['SessionToken'],
+                'expiry_time': credentials['Expiration'].isoformat()
             }
             self.logger.info("Role assumed successfully.")
             return assumed_credentials
@@ -118,3 +141,14 @@ class S3Connector:
             self.logger.error(f"Failed to execute assume_role method with error --> {e}")
             raise
 
+    def refresh_credentials(self):
+        """Assumes the role again and returns the credentials in the format botocore expects, called by botocore shortly before the cached credentials expire
+
+        Parameter:None
+
+        Returns:
+        metadata (dict) : access_key, secret_key, token and expiry_time of the temporary credentials.
+        """
+        credentials = self.assume_role()
+        self.logger.info(f"Assumed role credentials valid till {credentials['expiry_time']}")
+        return {"access_key": credentials["access_key"], "secret_key": credentials["secret_key"], "token": credentials["session_token"], "expiry_time": credentials["expiry_time"]}
@@ -9,14 +9,226 @@
 
 #### Importing Necessary Packages ####
 from s3_connector import S3Connector
-from io import BytesIO, StringIO
+from io import BytesIO, StringIO, RawIOBase
 from datetime import datetime
 import pandas as pd
-import sys, os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import os
+import re
+import json
+import queue
+import threading
+import fnmatch
+import gzip
+import bz2
+import shutil
+from time import perf_counter
+import tempfile
 import traceback
 
+csv_codecs = {None: None, 'gzip': 'gzip', 'bzip2': 'bzip2', 'zstd': 'zstd'} # codec : ContentEncoding set on the object
+parquet_codecs = {None: 'snappy', 'snappy': 'snappy', 'zstd': 'zstd', 'none': 'none'} # codec : pyarrow compression
+
+def compressed_stream(sink, compression=None):
+    """
+    Wraps a writable binary file object with the streaming compressor of the codec provided.
+
+    Parameters:
+    sink (object)               : Writable binary file object.
+    compression (str, optional) : gzip / bzip2 / zstd, by default None.
+
+    Returns:
+    stream (object) : File object to write to, the sink itself if no compression, close it before the sink to flush the trailer.
+    """
+    compression = compression.lower() if compression else None
+    if compression not in csv_codecs:
+        raise ValueError(f"Unsupported compression {compression} provided for csv, expected one of gzip / bzip2 / zstd.")
+    if compression is None:
+        return sink
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=sink, mode='wb')
+    if compression == 'bzip2':
+        return bz2.BZ2File(sink, mode='wb')
+    import zstandard
+    return zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+
+def parquet_codec(compression=None):
+    """
+    Returns the pyarrow compression of the Parquet codec provided.
+
+    Parameters:
+    compression (str, optional) : snappy / zstd / none, by default snappy.
+
+    Returns:
+    codec (str) : pyarrow compression name.
+    """
+    compression = compression.lower() if compression else None
+    if compression not in parquet_codecs:
+        raise ValueError(f"Unsupported compression {compression} provided for parquet, expected one of snappy / zstd / none.")
+    return parquet_codecs[compression]
+
+class S3MultipartWriter(RawIOBase):
+    """
+    A writable file object which uploads everything written to it as an S3 multipart upload, holding at most one part in memory
+    """
+    def __init__(self, logger, s3_client, bucket, key, part_size=8 * 1024 * 1024, extra_args=None, max_concurrency=1):
+        """
+        Initializes the S3MultipartWriter object.
+
+        Parameters:
+        logger (Logger)             : Logger object for logging.
+        s3_client (object)          : boto3 S3 client.
+        bucket (str)                : S3 bucket name where the object will be written.
+        key (str)                   : S3 object key.
+        part_size (int, optional)   : Size in bytes of each uploaded part, minimum 5 MB, by default 8 MB.
+        extra_args (dict, optional) : Extra arguments for the upload (ContentType, ContentEncoding, Metadata...).
+        max_concurrency (int, optional) : Parts uploaded in parallel, memory is bounded by part_size * (max_concurrency + 1), by default 1.
+
+        Returns:
+        None
+        """
+        super().__init__()
+        self.logger = logger
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self.extra_args = extra_args or {}
+        self.buffer = bytearray()
+        self.position = 0
+        self.upload_id = None
+        self.parts = []
+        self.part_number = 0
+        self.max_concurrency = max(max_concurrency, 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency) if self.max_concurrency > 1 else None
+        self.futures = set()
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def write(self, data):
+        """
+        Buffers the data and uploads a part every time the buffer reaches part_size.
+
+        Parameters:
+        data (bytes) : Data to be written.
+
+        Returns:
+        size (int) : No of bytes written.
+        """
+        self.buffer.extend(data)
+        self.position += len(data)
+        while len(self.buffer) >= self.part_size:
+            self.upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def upload_part(self, body):
+        """
+        Uploads one part of the multipart upload, starting the upload on the first part. With max_concurrency above 1 the part is
+        submitted to the thread pool and the call only blocks while max_concurrency parts are already in flight.
+
+        Parameters:
+        body (bytes) : Part data.
+
+        Returns:
+        None
+        """
+        if self.upload_id is None:
+            self.upload_id = self.s3_client.create_multipart_upload(Bucket=self.bucket, Key=self.key, **self.extra_args)["UploadId"]
+        self.part_number += 1
+        if self.executor is None:
+            self.parts.append(self.send_part(self.part_number, body))
+            return
+        while len(self.futures) >= self.max_concurrency:
+            done, self.futures = wait(self.futures, return_when=FIRST_COMPLETED)
+            self.parts.extend(future.result() for future in done)
+        self.futures.add(self.executor.submit(self.send_part, self.part_number, body))
+
+    def send_part(self, part_number, body):
+        """
+        Sends one part to S3.
+
+        Parameters:
+        part_number (int) : Part number in the multipart upload.
+        body (bytes)      : Part data.
+
+        Returns:
+        part (dict) : PartNumber and ETag of the uploaded part.
+        """
+        response = self.s3_client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=part_number, Body=body)
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def wait_parts(self):
+        """
+        Waits for the parts in flight and collects their ETags.
+
+        Parameters:None
+
+        Returns:
+        None
+        """
+        if self.futures:
+            done, self.futures = wait(self.futures)
+            self.parts.extend(future.result() for future in done)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def close(self):
+        """
+        Uploads the remaining buffer and completes the upload, objects smaller than one part are written with a single put_object.
+
+        Parameters:None
+
+        Returns:
+        None
+        """
+        if self.closed:
+            return
+        try:
+            if self.upload_id is None:
+                self.s3_client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer), **self.extra_args)
+            else:
+                if self.buffer:
+                    self.upload_part(bytes(self.buffer))
+                self.wait_parts()
+                self.parts.sort(key=lambda part: part["PartNumber"])
+                self.s3_client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, MultipartUpload={"Parts": self.parts})
+            self.logger.info(f"{self.bucket}/{self.key} written to S3 - {self.position} bytes in {max(len(self.parts), 1)} parts")
+            self.buffer = bytearray()
+        finally:
+            super().close()
+
+    def abort(self):
+        """
+        Aborts the multipart upload so no partial object or orphan parts are left in S3.
+
+        Parameters:None
+
+        Returns:
+        None
+        """
+        try:
+            self.wait_parts()
+        except Exception as e:
+            self.logger.warning(f"Part upload failed while aborting {self.bucket}/{self.key}, error --> {e}")
+        if self.upload_id is not None:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+            self.logger.info(f"Multipart upload of {self.bucket}/{self.key} aborted")
+        self.buffer = bytearray()
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
 class S3Operations:
-    def __init__(self, logger, profile_name, partition=None, aws_access_key_id=None, aws_secret_access_key=None, region_name=None, role_arn=None, session_name=None):
+    def __init__(self, logger, profile_name, partition=None, aws_access_key_id=None, aws_secret_access_key=None, region_name=None, role_arn=None, session_name=None, cache_dir=None, cache_max_bytes=1024 * 1024 * 1024):
         """
         Initializes the S3Operations object and establishes an S3 connection.
 
@@ -29,6 +241,8 @@ class S3Operations:
         region_name (str, optional)           : AWS region name.
         role_arn (str, optional)              : ARN of the role to assume for access.
         session_name (str, optional)          : Session name for the assumed role.
+        cache_dir (str, optional)             : Local folder to cache fetched objects and their parsed form keyed by ETag, by default objects are not cached.
+        cache_max_bytes (int, optional)       : Size in bytes of the local cache before least recently used entries are evicted, by default 1 GB.
 
         Returns:
         None
@@ -38,24 +252,199 @@ class S3Operations:
         self.logger.info("S3Operations class has been initiated")
         self.profile = profile_name
         self.s3_client = S3Connector(logger, self.profile, aws_access_key_id, aws_secret_access_key, region_name, role_arn, session_name).s3_client
+        self.object_cache = None
+        if cache_dir:
+            from object_cache import get_object_cache
+            self.object_cache = get_object_cache(logger=logger, cache_dir=cache_dir, max_bytes=cache_max_bytes)
 
-    def transform_and_load(self, data, data_path, bucket, prefix, file_name, datatypes=None):
+    def transform_and_load(self, data, data_path, bucket, prefix, file_name, datatypes=None, engine="arrow", row_group_size=100000, compression=None):
         """
         Typecasts the data in the DataFrame to specified datatypes and uploads the parquet file to S3.
 
         Parameters:
         data (DataFrame)            : The pandas DataFrame to be transformed and uploaded.
-        data_path (str)            : Local path where the Parquet file will be temporarily saved.
+        data_path (str)            : Local path where the Parquet file will be temporarily saved, only used by spark engine.
         bucket (str)               : S3 bucket name where the file will be uploaded.
         prefix (str)               : S3 prefix (path) for the file.
         file_name (str)            : Name of the file to be uploaded.
         datatypes (dict, optional) : Dictionary mapping column names to their expected data types for typecasting.
+        engine (str, optional)     : arrow / spark, by default arrow.
+        row_group_size (int, optional) : Max rows per Parquet row group for arrow engine, by default 100000.
+        compression (str, optional)    : snappy / zstd / none, by default snappy.
 
         Returns:
         None
 
         Notes:
-        - Converts the pandas DataFrame to a Spark DataFrame, typecasts columns according to datatypes, writes the DataFrame to a Parquet file into a path provided as input and will upload the file to s3.
+        - arrow engine casts the columns with pyarrow compute and streams the row groups straight to S3 without a local file or JVM.
+        - spark engine converts the pandas DataFrame to a Spark DataFrame, typecasts columns according to datatypes, writes the DataFrame to a Parquet file into a path provided as input and will upload the file to s3.
+        """
+        if engine.lower() == "spark":
+            return self.spark_transform_and_load(data=data, data_path=data_path, bucket=bucket, prefix=prefix, file_name=file_name, datatypes=datatypes, compression=compression)
+        self.logger.info("Performing type casting using transform method in s3_operations class with arrow engine")
+        import pyarrow.parquet as pq
+        try:
+            codec = parquet_codec(compression)
+            table = self.arrow_table(data=data, datatypes=datatypes)
+            with S3MultipartWriter(self.logger, self.s3_client, bucket, prefix + file_name, extra_args={"ContentType": "application/vnd.apache.parquet", "Metadata": {"compression": codec}}) as sink:
+                with pq.ParquetWriter(sink, table.schema, compression=codec) as writer:
+                    writer.write_table(table, row_group_size=row_group_size)
+            self.logger.info(f"{file_name} uploaded to {bucket}{prefix} successfully ")
+        except Exception as e:
+            self.logger.error(f"Failed to type cast data in transform method in s3_operations module with error --> {e} {traceback.format_exc()}")
+            raise
+
+    def arrow_table(self, data, datatypes=None):
+        """
+        Converts the DataFrame to an Arrow table with the columns cast to the specified datatypes, columns not provided are cast to string.
+
+        Parameters:
+        data (DataFrame)            : The pandas DataFrame to be converted.
+        datatypes (dict, optional) : Dictionary mapping column names to their expected data types for typecasting.
+
+        Returns:
+        table (pyarrow.Table) : Typecasted Arrow table without pandas schema metadata.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        casting = {
+            'int': pa.int32(),
+            'boolean': pa.bool_(),
+            'timestamp': pa.timestamp('us'),
+            'datetime': pa.timestamp('us'),
+            'date': pa.date32(),
+            'float': pa.float32(),
+            'long': pa.int64()
+        }
+        datatypes = {col_name: dtype.lower() for col_name, dtype in (datatypes or {}).items()}
+        table = pa.Table.from_pandas(data, preserve_index=False).replace_schema_metadata(None)
+        for index, col_name in enumerate(table.column_names):
+            column = table.column(index)
+            target = casting.get(datatypes.get(col_name), pa.string())
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                # Only blanks are nulled, 'nan' / 'None' can be real text and missing values are already null (from_pandas reads NaN / None as null)
+                column = pc.if_else(pc.equal(column, ''), pa.scalar(None, column.type), column)
+            if column.type != target:
+                column = self.coerce_column(column, target, col_name)
+            table = table.set_column(index, col_name, column)
+        return table
+
+    def coerce_column(self, column, target, col_name):
+        """
+        Casts an Arrow column to the target type the way the Spark cast did, values which cannot be converted become null instead of failing the upload.
+
+        Parameters:
+        column (pyarrow.ChunkedArray) : Column to be cast.
+        target (pyarrow.DataType)     : Target type.
+        col_name (str)                : Column name, used in the log.
+
+        Returns:
+        column (pyarrow.ChunkedArray) : Column of the target type.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        try:
+            return pc.cast(column, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+        series = column.to_pandas()
+        if pa.types.is_timestamp(target) or pa.types.is_date(target):
+            series = pd.to_datetime(series, errors="coerce")
+            if pa.types.is_date(target):
+                series = series.dt.date
+        elif pa.types.is_integer(target) or pa.types.is_floating(target):
+            series = pd.to_numeric(series, errors="coerce")
+        elif pa.types.is_boolean(target):
+            series = series.map(lambda value: value if isinstance(value, bool) else {"true": True, "t": True, "yes": True, "y": True, "1": True, "false": False, "f": False, "no": False, "n": False, "0": False}.get(str(value).strip().lower()), na_action="ignore")
+        casted = pc.cast(pa.chunked_array([pa.array(series, from_pandas=True)]), target, safe=False)
+        coerced = casted.null_count - column.null_count
+        if coerced:
+            self.logger.warning(f"{coerced} values of {col_name} could not be converted to {target} and were set to null")
+        return casted
+
+    def partitioned_parquet(self, data, bucket, prefix, file_name, partition_cols, datatypes=None, target_file_size=128 * 1024 * 1024, row_group_size=100000, max_workers=4, keep_partition_cols=True, manifest=True, compression=None):
+        """
+        Writes the DataFrame as Hive-partitioned Parquet files (prefix/col=value/...), one or more files per partition capped at a target size, uploaded concurrently.
+
+        Parameters:
+        data (DataFrame)                   : The pandas DataFrame to be uploaded.
+        bucket (str)                       : S3 bucket name where the files will be uploaded.
+        prefix (str)                       : S3 prefix under which the partitions are written.
+        file_name (str)                    : Name of the file, partition files are named <stem>_<part>.parquet.
+        partition_cols (list)              : Columns to partition by, in path order.
+        datatypes (dict, optional)         : Dictionary mapping column names to their expected data types for typecasting.
+        target_file_size (int, optional)   : Target size in bytes of each file, rows per file are estimated from the compressed size of a sample written to Parquet, by default 128 MB.
+        row_group_size (int, optional)     : Max rows per Parquet row group, by default 100000.
+        max_workers (int, optional)        : Files uploaded in parallel, by default 4.
+        keep_partition_cols (bool, optional) : Keep the partition columns inside the files so Redshift COPY maps every column, set False for Spectrum-only layouts, by default True.
+        manifest (bool, optional)          : Write a Redshift COPY manifest listing every file written as prefix/_<stem>.manifest, hidden from Spectrum / Athena / Hive scans of the prefix, by default True.
+        compression (str, optional)        : snappy / zstd / none, by default snappy.
+
+        Returns:
+        result (dict) : keys written and manifest_key (None if manifest is False).
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from urllib.parse import quote
+        try:
+            self.logger.info(f"Performing partitioned_parquet method to write {file_name} partitioned by {partition_cols} in s3_operations class")
+            if isinstance(partition_cols, str):
+                partition_cols = [partition_cols]
+            missing = [col_name for col_name in partition_cols if col_name not in data.columns]
+            if missing:
+                raise KeyError(f"Partition columns {missing} not found in data")
+            codec = parquet_codec(compression)
+            table = self.arrow_table(data=data, datatypes=datatypes)
+            if not keep_partition_cols:
+                table = table.drop(partition_cols)
+            stem = file_name.rsplit(".", 1)[0]
+            sample = table.slice(0, min(table.num_rows, row_group_size))
+            sample_sink = pa.BufferOutputStream()
+            pq.write_table(sample, sample_sink, compression=codec)
+            bytes_per_row = max(sample_sink.getvalue().size / max(sample.num_rows, 1), 1) # Compressed size per row, the in-memory size is several times larger
+            rows_per_file = max(int(target_file_size // bytes_per_row), 1)
+            files = []
+            for values, indices in data.groupby(partition_cols, dropna=False, sort=True).indices.items():
+                values = values if isinstance(values, tuple) else (values,)
+                partition_path = "".join(f"{col_name}={'__HIVE_DEFAULT_PARTITION__' if pd.isna(value) else quote(str(value), safe='')}/" for col_name, value in zip(partition_cols, values))
+                partition_table = table.take(indices)
+                for part, start in enumerate(range(0, partition_table.num_rows, rows_per_file)):
+                    files.append((f"{prefix}{partition_path}{stem}_{part:05d}.parquet", partition_table.slice(start, rows_per_file)))
+            self.logger.info(f"{len(files)} files to be written across partitions of {file_name}")
+
+            def write(key, file_table):
+                with S3MultipartWriter(self.logger, self.s3_client, bucket, key, extra_args={"ContentType": "application/vnd.apache.parquet", "Metadata": {"compression": codec}}) as sink:
+                    with pq.ParquetWriter(sink, file_table.schema, compression=codec) as writer:
+                        writer.write_table(file_table, row_group_size=row_group_size)
+                return {"url": f"s3://{bucket}/{key}", "mandatory": True, "meta": {"content_length": sink.position}}
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                entries = list(executor.map(lambda file: write(*file), files))
+            manifest_key = None
+            if manifest:
+                manifest_key = f"{prefix}_{stem}.manifest" # Leading underscore keeps query engines from reading it as a data file
+                self.s3_client.put_object(Bucket=bucket, Key=manifest_key, Body=json.dumps({"entries": entries}).encode('utf-8'), ContentType="application/json")
+                self.logger.info(f"COPY manifest written to {bucket}/{manifest_key}")
+            return {"keys": [key for key, file_table in files], "manifest_key": manifest_key}
+        except Exception as e:
+            self.logger.error(f"Failed to execute partitioned_parquet method in s3_operations module with error --> {e} {traceback.format_exc()}")
+            raise
+
+    def spark_transform_and_load(self, data, data_path, bucket, prefix, file_name, datatypes=None, compression=None):
+        """
+        Typecasts the data in the DataFrame to specified datatypes using Spark and uploads the parquet file to S3.
+
+        Parameters:
+        data (DataFrame)            : The pandas DataFrame to be transformed and uploaded.
+        data_path (str)            : Local path where the Parquet file will be temporarily saved.
+        bucket (str)               : S3 bucket name where the file will be uploaded.
+        prefix (str)               : S3 prefix (path) for the file.
+        file_name (str)            : Name of the file to be uploaded.
+        datatypes (dict, optional) : Dictionary mapping column names to their expected data types for typecasting.
+        compression (str, optional): snappy / zstd / none, by default snappy.
+
+        Returns:
+        None
         """
         self.logger.info("Performing type casting using transform method in s3_operations class")
         java_path = os.popen('dirname $(dirname $(readlink -f $(which java)))').read().strip()
@@ -80,12 +469,12 @@ class S3Operations:
             if datatypes:
                 for col_name, dtype in datatypes.items():
                     spark_df=spark_df.withColumn(col_name,F.when(F.isnan(F.col(col_name)), F.lit(None)).otherwise(F.col(col_name)).cast(casting.get(dtype.lower(), StringType())))
-            spark_df.coalesce(1).write.parquet(data_path, mode='overwrite')
+            spark_df.coalesce(1).write.option("compression", parquet_codec(compression)).parquet(data_path, mode='overwrite')
             self.logger.info(f"Temporary Parquet file created at {data_path}")
             spark.stop()
             files = os.listdir(data_path)
             for file in files:
-                if file.endswith(".snappy.parquet"):
+                if file.endswith(".parquet"):
                     full_file_path = os.path.join(data_path, file)
                     try:
                         self.s3_client.upload_file(full_file_path, bucket, prefix + file_name)
@@ -99,7 +488,7 @@ class S3Operations:
             self.logger.error(f"Failed to type cast data in transform method in s3_operations module with error --> {e} {traceback.format_exc()}")
             raise
 
-    def upload_file(self, file_name, file_type, data, bucket,prefix,data_path=None, dtypes=None,hour_partition=None, output_delimiter=None):
+    def upload_file(self, file_name, file_type, data, bucket,prefix,data_path=None, dtypes=None,hour_partition=None, output_delimiter=None, parquet_engine="arrow", compression=None, chunk_rows=100000, part_size=8 * 1024 * 1024, max_concurrency=4, partition_cols=None, target_file_size=128 * 1024 * 1024, manifest=True, row_group_size=100000):
         """
         Uploads a file to an S3 bucket.
 
@@ -112,9 +501,18 @@ class S3Operations:
         prefix (str)     : The S3 prefix (path) for the file.
         dtypes (dict, optional) : Dictionary mapping column names to their expected data types for typecasting (relevant for Parquet files).
         output_delimiter (str) : Delimiter of output file uploaded to s3
+        parquet_engine (str, optional) : arrow / spark engine used to write Parquet files, by default arrow.
+        compression (str, optional)    : gzip / bzip2 / zstd for CSV files, by default uncompressed. snappy / zstd / none for Parquet files, by default snappy.
+        chunk_rows (int, optional)     : Rows serialized at a time for CSV files, by default 100000.
+        part_size (int, optional)      : Size in bytes of each multipart upload part, by default 8 MB.
+        max_concurrency (int, optional): Parts uploaded in parallel, by default 4.
+        partition_cols (list, optional): Columns to Hive-partition Parquet files by, written concurrently as prefix/col=value/ files, by default None.
+        target_file_size (int, optional): Target size in bytes of each partitioned Parquet file, by default 128 MB.
+        manifest (bool, optional)      : Write a Redshift COPY manifest for partitioned Parquet files, by default True.
+        row_group_size (int, optional) : Max rows per Parquet row group, by default 100000.
 
         Returns:
-        None
+        result (dict) : keys and manifest_key written for partitioned Parquet files, None otherwise.
 
         Notes:
         - Handles the uploading of various file types (CSV, Excel, Parquet) to S3.
@@ -131,14 +529,15 @@ class S3Operations:
             else:
                 object_name = prefix
             buffer_data = StringIO() if file_type.lower()=='csv' else BytesIO()
-            if file_type.lower() == 'parquet':
-                self.transform_and_load(data=data, datatypes=dtypes, file_name=file_name, bucket=bucket, prefix=object_name, data_path=data_path)
+            if file_type.lower() == 'parquet' and partition_cols:
+                result = self.partitioned_parquet(data=data, bucket=bucket, prefix=object_name, file_name=file_name, partition_cols=partition_cols, datatypes=dtypes, target_file_size=target_file_size, row_group_size=row_group_size, max_workers=max_concurrency, manifest=manifest, compression=compression)
+                self.logger.info(f"File {file_name} uploaded successfully to {bucket}/{object_name} as {len(result['keys'])} partitioned files.")
+                return result
+            elif file_type.lower() == 'parquet':
+                self.transform_and_load(data=data, datatypes=dtypes, file_name=file_name, bucket=bucket, prefix=object_name, data_path=data_path, engine=parquet_engine, row_group_size=row_group_size, compression=compression)
                 self.logger.info(f"{file_name} has been uploaded to {object_name}")
             elif file_type.lower()=='csv':
-                data.to_csv(buffer_data, sep=delimiter,  index=False)
-                buffer_data.seek(0)
-                byte_data = BytesIO(buffer_data.getvalue().encode('utf-8'))
-                self.s3_client.upload_fileobj(byte_data, bucket, object_name + file_name)
+                self.stream_csv(data=data, bucket=bucket, key=object_name + file_name, delimiter=delimiter, compression=compression, chunk_rows=chunk_rows, part_size=part_size, max_concurrency=max_concurrency)
             elif file_type.lower() == 'excel':
                 data.to_excel(buffer_data, index=False)
                 buffer_data.seek(0)
@@ -154,24 +553,169 @@ class S3Operations:
             self.logger.error(f"Failed to upload file {file_name} to {bucket}/{object_name}, error --> {e} {traceback.format_exc()}")
             raise
 
-    def getobject_s3(self, key, file_type,bucket_name, extra_features=None):
+    def stream_csv(self, data, bucket, key, delimiter=',', compression=None, chunk_rows=100000, part_size=8 * 1024 * 1024, max_concurrency=4):
+        """
+        Serializes the DataFrame to CSV in row chunks straight into an S3 multipart upload, so only one chunk and the parts in flight are held in memory.
+
+        Parameters:
+        data (DataFrame)               : The data to upload.
+        bucket (str)                   : The bucket to upload to.
+        key (str)                      : S3 object key.
+        delimiter (str, optional)      : Delimiter of the CSV file, by default ','.
+        compression (str, optional)    : gzip / bzip2 / zstd, set as the ContentEncoding of the object, by default None.
+        chunk_rows (int, optional)     : Rows serialized at a time, by default 100000.
+        part_size (int, optional)      : Size in bytes of each multipart upload part, by default 8 MB.
+        max_concurrency (int, optional): Parts uploaded in parallel, by default 4.
+
+        Returns:
+        None
+        """
+        self.logger.info(f"Performing stream_csv method to upload {key} in s3_operations class")
+        extra_args = {"ContentType": "text/csv"}
+        if compression:
+            extra_args["ContentEncoding"] = csv_codecs.get(compression.lower(), compression)
+        with S3MultipartWriter(self.logger, self.s3_client, bucket, key, part_size=part_size, extra_args=extra_args, max_concurrency=max_concurrency) as sink:
+            stream = compressed_stream(sink, compression)
+            for start in range(0, max(len(data), 1), chunk_rows):
+                stream.write(data.iloc[start:start + chunk_rows].to_csv(sep=delimiter, index=False, header=start == 0).encode('utf-8'))
+            if stream is not sink:
+                stream.close()
+
+    def codec_benchmark(self, data, sample_rows=100000, datatypes=None, row_group_size=100000, csv_compressions=(None, 'gzip', 'bzip2', 'zstd'), parquet_compressions=('snappy', 'zstd', 'none')):
+        """
+        Writes a sample of the DataFrame in memory with every codec and reports the output size and time, to pick the codec of a feed.
+
+        Parameters:
+        data (DataFrame)                  : The data to sample.
+        sample_rows (int, optional)       : Rows taken from the top of the data, by default 100000.
+        datatypes (dict, optional)        : Dictionary mapping column names to their expected data types for Parquet typecasting.
+        row_group_size (int, optional)    : Max rows per Parquet row group, by default 100000.
+        csv_compressions (tuple, optional)     : CSV codecs to benchmark, by default uncompressed / gzip / bzip2 / zstd.
+        parquet_compressions (tuple, optional) : Parquet codecs to benchmark, by default snappy / zstd / none.
+
+        Returns:
+        report (DataFrame) : file_type, compression, bytes, seconds and ratio to uncompressed CSV per codec, codecs whose package is missing are skipped.
+        """
+        import pyarrow.parquet as pq
+        try:
+            self.logger.info(f"Performing codec_benchmark method on {min(len(data), sample_rows)} rows in s3_operations class")
+            sample = data.head(sample_rows)
+            results = []
+            for compression in csv_compressions:
+                try:
+                    start = perf_counter()
+                    buffer = BytesIO()
+                    stream = compressed_stream(buffer, compression)
+                    stream.write(sample.to_csv(index=False).encode('utf-8'))
+                    if stream is not buffer:
+                        stream.close()
+                    results.append({"file_type": "csv", "compression": compression or "none", "bytes": buffer.getbuffer().nbytes, "seconds": round(perf_counter() - start, 4)})
+                except ImportError as e:
+                    self.logger.warning(f"Skipping csv {compression} benchmark, error --> {e}")
+            table = self.arrow_table(data=sample, datatypes=datatypes)
+            for compression in parquet_compressions:
+                start = perf_counter()
+                buffer = BytesIO()
+                pq.write_table(table, buffer, compression=parquet_codec(compression), row_group_size=row_group_size)
+                results.append({"file_type": "parquet", "compression": compression or "snappy", "bytes": buffer.getbuffer().nbytes, "seconds": round(perf_counter() - start, 4)})
+            report = pd.DataFrame(results)
+            baseline = report.loc[(report["file_type"] == "csv") & (report["compression"] == "none"), "bytes"]
+            report["ratio"] = (report["bytes"] / baseline.iloc[0]).round(3) if not baseline.empty else None
+            self.logger.info(f"Codec benchmark \n {report.to_string(index=False)}")
+            return report
+        except Exception as e:
+            self.logger.error(f"Failed executing codec_benchmark method in s3_operations class with error --> {e} {traceback.format_exc()}")
+            raise
+
+    @staticmethod
+    def arrow_csv_options(extra_features=None, usecols=None, block_size=None):
+        """
+        Maps the pandas read_csv options of extra_features to pyarrow.csv options, so the arrow engine parses the file the same way.
+
+        Parameters:
+        extra_features (dict, optional) : pandas read_csv options, sep / delimiter, quotechar, escapechar, header, names, skiprows, usecols, encoding, na_values and dtype (per column) are supported.
+                                          With header None and no names the columns are named f0, f1... instead of 0, 1...
+        usecols (list, optional)        : Columns to be read.
+        block_size (int, optional)      : Bytes parsed per block, by default the pyarrow default.
+
+        Returns:
+        options (dict) : read_options, parse_options and convert_options for pyarrow.csv read_csv / open_csv.
+
+        Raises:
+        ValueError : If an option has no arrow equivalent, rather than parsing the file differently without notice.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pv
+        features = dict(extra_features or {})
+        usecols = features.pop("usecols", None) or usecols
+        unsupported = set(features) - {"sep", "delimiter", "quotechar", "escapechar", "header", "names", "skiprows", "encoding", "na_values", "dtype"}
+        if unsupported:
+            raise ValueError(f"Options {sorted(unsupported)} are not supported by the arrow engine, use engine='pandas'")
+        delimiter = features.get("sep", features.get("delimiter", ","))
+        if not isinstance(delimiter, str) or len(delimiter) != 1:
+            raise ValueError(f"Only a single character separator is supported by the arrow engine, got {delimiter!r}")
+        header = features.get("header", None if "names" in features else 0) # As in pandas, names without header means the file has no header row
+        skiprows = features.get("skiprows", 0)
+        if not isinstance(skiprows, int) or (header is not None and not isinstance(header, int)):
+            raise ValueError("Only int skiprows / header are supported by the arrow engine")
+        read_options = {"encoding": features.get("encoding", "utf8"), "skip_rows": skiprows + (header or 0)}
+        if "names" in features:
+            read_options["column_names"] = list(features["names"])
+            if header is not None:
+                read_options["skip_rows"] += 1 # The header row is replaced by names
+        elif header is None:
+            read_options["autogenerate_column_names"] = True
+        if block_size:
+            read_options["block_size"] = block_size
+        parse_options = {"delimiter": delimiter, "quote_char": features.get("quotechar", '"'), "escape_char": features.get("escapechar") or False}
+        convert_options = {}
+        if usecols:
+            convert_options["include_columns"] = list(usecols)
+        if "na_values" in features:
+            na_values = features["na_values"]
+            if isinstance(na_values, dict):
+                raise ValueError("Per column na_values are not supported by the arrow engine")
+            convert_options["null_values"] = list(pv.ConvertOptions().null_values) + ([na_values] if isinstance(na_values, str) else list(na_values))
+        if "dtype" in features:
+            if not isinstance(features["dtype"], dict):
+                raise ValueError("Only per column dtype is supported by the arrow engine")
+            convert_options["column_types"] = {col_name: pa.string() if dtype in (str, object, "str", "string", "object") else pa.from_numpy_dtype(pd.api.types.pandas_dtype(dtype)) for col_name, dtype in features["dtype"].items()}
+        return {"read_options": pv.ReadOptions(**read_options), "parse_options": pv.ParseOptions(**parse_options), "convert_options": pv.ConvertOptions(**convert_options)}
+
+    def getobject_s3(self, key, file_type,bucket_name, extra_features=None, chunksize=None, usecols=None, engine="pandas", as_arrow=False, spill_to_disk=False):
         """
         Retrieves an object from S3 and returns it as a pandas DataFrame.
 
         Parameters:
         key (str)                       : The S3 object key (file path).
         file_type (str)                 : Type of file ('csv', 'excel', 'parquet').
-        extra_features (dict, optional) : Additional parameters for pandas read function.
+        extra_features (dict, optional) : Additional parameters for pandas read function, mapped to pyarrow.csv options with engine arrow (see arrow_csv_options).
+        chunksize (int, optional)       : Rows per chunk, if provided an iterator of chunks is returned instead of one DataFrame.
+        usecols (list, optional)        : Columns to be read, others are skipped while parsing.
+        engine (str, optional)          : pandas / arrow - parser used for csv and text files, by default pandas.
+        as_arrow (bool, optional)       : Yield Arrow record batches instead of DataFrames when reading in chunks, by default False.
+        spill_to_disk (bool, optional)  : Download to a local temporary file and parse it memory-mapped, by default False. Parquet is always spilled when read in chunks.
 
         Returns:
-        DataFrame: The data loaded into a pandas DataFrame if file is found.
+        DataFrame: The data loaded into a pandas DataFrame if file is found, or an iterator of DataFrames / Arrow record batches if chunksize is provided.
 
         Notes:
         - Retrieves a file from S3 and returns it as a pandas DataFrame, with support for various file types.
+        - Chunks are parsed straight from the streaming body (or the memory-mapped spill) without decoding the object to one str.
         """
+        if chunksize:
+            return self.iter_object_s3(key=key, file_type=file_type, bucket_name=bucket_name, extra_features=extra_features, chunksize=chunksize, usecols=usecols, engine=engine, as_arrow=as_arrow, spill_to_disk=spill_to_disk)
         try:
             self.logger.info("Performing getobject_s3 method to fetch files from s3 in s3_operations class")
+            extra_features = dict(extra_features or {})
+            if usecols:
+                extra_features["columns" if file_type.lower() == 'parquet' else "usecols"] = usecols
+            if self.object_cache is not None:
+                return self.cached_object_s3(key=key, file_type=file_type, bucket_name=bucket_name, extra_features=extra_features, usecols=usecols, engine=engine)
             response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+            if file_type.lower() in ['csv', 'text'] and engine.lower() == 'arrow':
+                import pyarrow.csv as pv
+                return pv.read_csv(response['Body'], **self.arrow_csv_options(extra_features, usecols)).to_pandas()
             data = response['Body'].read().decode('utf-8') if file_type.lower() in ["csv","text"] else response['Body'].read()
             read_functions = {
                 'csv': pd.read_csv,
@@ -180,51 +724,307 @@ class S3Operations:
                 'text' : pd.read_csv
             }
             buffer = StringIO(data) if file_type.lower() in ['csv', 'text'] else BytesIO(data)
-            df = read_functions[file_type.lower()](buffer, **(extra_features or {}))
+            df = read_functions[file_type.lower()](buffer, **extra_features)
             return df
         except Exception as e:
             self.logger.error(f"Failed executing getobject_s3 method in s3_operations class to retrieve object {key} from S3 with error --> {e} {traceback.format_exc()}")
             raise
 
-    def list_files(self, bucket, file_name, prefix, marker=None):
+    def cached_raw(self, key, bucket_name, etag=None):
+        """
+        Returns the local path of the object in the cache, validating with a HEAD request and downloading it only if the ETag is not cached.
+
+        Parameters:
+        key (str)            : The S3 object key.
+        bucket_name (str)    : The bucket name.
+        etag (str, optional) : ETag of the object if already known, by default a HEAD request is made.
+
+        Returns:
+        path (str) : Local path of the raw object.
+        """
+        etag = etag or self.s3_client.head_object(Bucket=bucket_name, Key=key)["ETag"]
+        path = self.object_cache.get(bucket_name, key, etag)
+        if path is None:
+            def download(temp_path):
+                body = self.s3_client.get_object(Bucket=bucket_name, Key=key, IfMatch=etag)['Body']
+                with open(temp_path, "wb") as file:
+                    shutil.copyfileobj(body, file, 1024 * 1024)
+            path = self.object_cache.put(bucket_name, key, etag, download)
+        return path
+
+    def cached_object_s3(self, key, file_type, bucket_name, extra_features=None, usecols=None, engine="pandas"):
+        """
+        Retrieves an object through the local cache, an unchanged object costs one HEAD request and is read from its cached Parquet form without parsing.
+
+        Parameters:
+        key (str)                       : The S3 object key (file path).
+        file_type (str)                 : Type of file ('csv', 'excel', 'parquet', 'text').
+        bucket_name (str)               : The bucket name.
+        extra_features (dict, optional) : Additional parameters for pandas read function.
+        usecols (list, optional)        : Columns to be read.
+        engine (str, optional)          : pandas / arrow - parser used for csv and text files, by default pandas.
+
+        Returns:
+        DataFrame: The data loaded into a pandas DataFrame.
+        """
+        extra_features = extra_features or {}
+        etag = self.s3_client.head_object(Bucket=bucket_name, Key=key)["ETag"]
+        variant = repr((file_type.lower(), engine.lower(), sorted(extra_features.items(), key=str)))
+        parsed_path = self.object_cache.get(bucket_name, key, etag, variant)
+        if parsed_path is not None:
+            return pd.read_parquet(parsed_path)
+        raw_path = self.cached_raw(key=key, bucket_name=bucket_name, etag=etag)
+        if file_type.lower() in ['csv', 'text'] and engine.lower() == 'arrow':
+            import pyarrow.csv as pv
+            df = pv.read_csv(raw_path, **self.arrow_csv_options(extra_features, usecols)).to_pandas()
+        else:
+            read_functions = {
+                'csv': pd.read_csv,
+                'excel': pd.read_excel,
+                'parquet': pd.read_parquet,
+                'text' : pd.read_csv
+            }
+            df = read_functions[file_type.lower()](raw_path, **extra_features)
+        try:
+            self.object_cache.put(bucket_name, key, etag, lambda temp_path: df.to_parquet(temp_path), variant)
+        except Exception as e:
+            self.logger.warning(f"Parsed form of {key} could not be cached, only the raw object is cached, error --> {e}")
+        return df
+
+    def iter_object_s3(self, key, file_type, bucket_name, chunksize, extra_features=None, usecols=None, engine="pandas", as_arrow=False, spill_to_disk=False):
+        """
+        Retrieves an object from S3 and yields it in chunks so memory is bounded by the chunk size rather than the object size.
+
+        Parameters:
+        key (str)                       : The S3 object key (file path).
+        file_type (str)                 : Type of file ('csv', 'text', 'parquet').
+        bucket_name (str)               : The bucket name.
+        chunksize (int)                 : Rows per chunk.
+        extra_features (dict, optional) : Additional parameters for pandas read_csv function.
+        usecols (list, optional)        : Columns to be read, others are skipped while parsing.
+        engine (str, optional)          : pandas / arrow - parser used for csv and text files, by default pandas.
+        as_arrow (bool, optional)       : Yield Arrow record batches instead of DataFrames, by default False.
+        spill_to_disk (bool, optional)  : Download to a local temporary file and parse it memory-mapped, by default False.
+
+        Returns:
+        chunk (DataFrame / RecordBatch) : Generator of chunks.
+        """
+        spill_path = None
+        try:
+            self.logger.info(f"Performing iter_object_s3 method to fetch {key} in chunks of {chunksize} rows in s3_operations class")
+            file_type = file_type.lower()
+            if file_type not in ['csv', 'text', 'parquet']:
+                raise ValueError(f"Chunked read is not supported for file_type {file_type}.")
+            if self.object_cache is not None:
+                source = self.cached_raw(key=key, bucket_name=bucket_name)
+            elif spill_to_disk or file_type == 'parquet':
+                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}") as spill:
+                    self.s3_client.download_fileobj(bucket_name, key, spill)
+                    spill_path = spill.name
+                self.logger.info(f"{key} spilled to {spill_path}")
+                source = spill_path
+            else:
+                source = None
+            if source is None:
+                source = self.s3_client.get_object(Bucket=bucket_name, Key=key)['Body']
+            chunks = 0
+            if file_type == 'parquet':
+                import pyarrow.parquet as pq
+                batches = pq.ParquetFile(source, memory_map=True).iter_batches(batch_size=chunksize, columns=usecols)
+            elif engine.lower() == 'arrow':
+                import pyarrow as pa
+                import pyarrow.csv as pv
+                batches = pv.open_csv(pa.memory_map(source) if isinstance(source, str) else source, **self.arrow_csv_options(extra_features, usecols, block_size=1 << 24))
+            else:
+                batches = None
+                extra_features = dict(extra_features or {})
+                if usecols:
+                    extra_features["usecols"] = usecols
+                for chunk in pd.read_csv(source, chunksize=chunksize, memory_map=isinstance(source, str), **extra_features):
+                    chunks += 1
+                    yield chunk
+            if batches is not None:
+                for batch in batches:
+                    for start in range(0, batch.num_rows, chunksize):
+                        chunks += 1
+                        part = batch.slice(start, chunksize)
+                        yield part if as_arrow else part.to_pandas()
+            self.logger.info(f"{key} read in {chunks} chunks")
+        except Exception as e:
+            self.logger.error(f"Failed executing iter_object_s3 method in s3_operations class to retrieve object {key} from S3 with error --> {e} {traceback.format_exc()}")
+            raise
+        finally:
+            if spill_path and os.path.exists(spill_path):
+                os.remove(spill_path)
+
+    @staticmethod
+    def compile_filter(pattern=None, pattern_type="substring"):
+        """
+        Compiles a key filter once so it is not rebuilt for every listed key.
+
+        Parameters:
+        pattern (str, optional)      : Pattern to match the keys against, every key matches if not provided.
+        pattern_type (str, optional) : substring / glob / regex - substring and regex are searched in the full key, glob is matched against the file name, by default substring.
+
+        Returns:
+        matcher (function) : Function which takes a key and returns True if it matches.
+        """
+        if not pattern:
+            return lambda key: True
+        if pattern_type.lower() == "glob":
+            regex = re.compile(fnmatch.translate(pattern))
+            return lambda key: regex.match(key.rsplit("/", 1)[-1]) is not None
+        if pattern_type.lower() == "regex":
+            regex = re.compile(pattern)
+            return lambda key: regex.search(key) is not None
+        if pattern_type.lower() == "substring":
+            return lambda key: pattern in key
+        raise ValueError(f"Unsupported pattern_type {pattern_type}, expected substring / glob / regex")
+
+    def list_prefix(self, bucket, prefix, delimiter=None, matcher=None):
+        """
+        Lists a single prefix page by page with list_objects_v2, yielding matching keys as each page arrives.
+
+        Parameters:
+        bucket (str)                  : The bucket name.
+        prefix (str)                  : The prefix to list.
+        delimiter (str, optional)     : Delimiter to group keys by, sub-prefixes are then yielded as ("prefix", value) instead of being listed.
+        matcher (function, optional)  : Compiled filter from compile_filter.
+
+        Returns:
+        entry (tuple) : Generator of ("key", object dict) and ("prefix", sub-prefix) tuples.
+        """
+        params = {"Bucket": bucket, "Prefix": prefix}
+        if delimiter:
+            params["Delimiter"] = delimiter
+        pages = 0
+        for page in self.s3_client.get_paginator("list_objects_v2").paginate(**params):
+            pages += 1
+            for content in page.get("Contents", []):
+                if matcher is None or matcher(content["Key"]):
+                    yield "key", content
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield "prefix", common_prefix["Prefix"]
+        self.logger.info(f"Listed s3://{bucket}/{prefix} in {pages} pages")
+
+    def iter_files(self, bucket, prefix, pattern=None, pattern_type="substring", recursive=False, fan_out=False, max_workers=8, details=False):
+        """
+        Lazily lists the files under a prefix, yielding matching keys while later pages are still being listed.
+
+        Parameters:
+        bucket (str)                 : The bucket name.
+        prefix (str)                 : The prefix of the files to list.
+        pattern (str, optional)      : Pattern the keys should match, see compile_filter.
+        pattern_type (str, optional) : substring / glob / regex, by default substring.
+        recursive (bool, optional)   : List every key below the prefix instead of only the immediate files, by default False.
+        fan_out (bool, optional)     : With recursive, list each immediate sub-prefix in a thread pool, by default False.
+        max_workers (int, optional)  : Threads used for the fan out, by default 8.
+        details (bool, optional)     : Yield the object dict (Key, Size, ETag, LastModified) instead of the key, by default False.
+
+        Returns:
+        key (str / dict) : Generator of matching keys.
+        """
+        try:
+            self.logger.info(f"Performing iter_files method to list s3://{bucket}/{prefix} in s3_operations class")
+            matcher = self.compile_filter(pattern, pattern_type)
+            delimiter = "/" if (not recursive or fan_out) else None
+            sub_prefixes = []
+            count = 0
+            for kind, value in self.list_prefix(bucket, prefix, delimiter, matcher):
+                if kind == "prefix":
+                    sub_prefixes.append(value)
+                    continue
+                count += 1
+                yield value if details else value["Key"]
+            if recursive and fan_out and sub_prefixes:
+                self.logger.info(f"Fanning out listing over {len(sub_prefixes)} sub-prefixes with {max_workers} threads")
+                results = queue.Queue(maxsize=10000)
+                done = object()
+                stop = threading.Event()
+                def publish(value):
+                    # Bounded waits so a worker blocked on a full queue notices the consumer stopped early
+                    while not stop.is_set():
+                        try:
+                            results.put(value, timeout=0.5)
+                            return True
+                        except queue.Full:
+                            continue
+                    return False
+                def worker(sub_prefix):
+                    try:
+                        for kind, value in self.list_prefix(bucket, sub_prefix, None, matcher):
+                            if not publish(value):
+                                return
+                    except Exception as e:
+                        publish(e)
+                    finally:
+                        publish(done)
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                try:
+                    for sub_prefix in sub_prefixes:
+                        executor.submit(worker, sub_prefix)
+                    pending = len(sub_prefixes)
+                    while pending:
+                        value = results.get()
+                        if value is done:
+                            pending -= 1
+                        elif isinstance(value, Exception):
+                            raise value
+                        else:
+                            count += 1
+                            yield value if details else value["Key"]
+                finally:
+                    stop.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
+            self.logger.info(f"{count} matching files found under s3://{bucket}/{prefix}")
+        except Exception as e:
+            self.logger.error(f"Failed in executing iter_files method in s3_operations class to list files in bucket {bucket} with error --> {e}")
+            raise
+
+    def list_files(self, bucket, file_name, prefix, pattern_type="substring", recursive=False, fan_out=False, max_workers=8):
         """
         Lists files in a specific S3 bucket with an optional prefix.
 
         Parameters:
-        bucket (str)           : The bucket name.
-        file_name (str)        : The name or pattern of the files to list.
-        prefix (str, optional) : The prefix of the files to list.
-        marker (str, optional) : A marker to continue listing files from a specific point.
+        bucket (str)                 : The bucket name.
+        file_name (str)              : The name or pattern of the files to list.
+        prefix (str, optional)       : The prefix of the files to list.
+        pattern_type (str, optional) : substring / glob / regex, by default substring.
+        recursive (bool, optional)   : List every key below the prefix instead of only the immediate files, by default False.
+        fan_out (bool, optional)     : With recursive, list each immediate sub-prefix in a thread pool, by default False.
+        max_workers (int, optional)  : Threads used for the fan out, by default 8.
 
         Returns:
         keys (list)            : A list of matching filenames in the specified S3 bucket if found.
+
+        Raises:
+        FileNotFoundError : If no files match under the prefix.
         """
         try:
             self.logger.info("Performing list_files method to list files from s3 prefix in s3_operations class")
-            keys = []
-            if marker:
-                response = self.s3_client.list_objects(Bucket=bucket, Delimiter="/", Prefix=prefix, Marker=marker)
-            else:
-                response = self.s3_client.list_objects(Bucket=bucket, Delimiter="/", Prefix=prefix)
-            self.logger.info("Connected to S3")
-            if response["ResponseMetadata"].get("HTTPStatusCode", None) == 200:
-                for data in response.get('Contents', []):
-                    if file_name in data["Key"]:
-                        keys.append(data["Key"])
-                if response.get('IsTruncated')==True:
-                    self.logger.info("Response has been truncated, going to next page using list_files method in s3_operations class")
-                    keys.extend(self.list_files(bucket=bucket, file_name=file_name, prefix=prefix, marker=response.get('NextMarker')))
-            else:
-                self.logger.info(f'failed with - {response["ResponseMetadata"].get("HTTPStatusCode", "unable to fetch status code")}')
-                raise Exception
+            keys = list(self.iter_files(bucket=bucket, prefix=prefix, pattern=file_name, pattern_type=pattern_type, recursive=recursive, fan_out=fan_out, max_workers=max_workers))
             if not keys:
                 self.logger.info("No files found")
-                sys.exit(1)
+                raise FileNotFoundError(f"No files matching {file_name} found in s3://{bucket}/{prefix}")
             return keys
         except Exception as e:
             self.logger.error(f"Failed in executing list_files method in s3_operations class to list files in bucket {bucket} with error --> {e}")
             raise
 
+    def partition_key(self, dest_key):
+        """
+        Returns the destination key of a copy, with the year / month / day partition appended when partitioning is enabled.
+
+        Parameters:
+        dest_key (str): The destination object key (path in S3).
+
+        Returns:
+        key (str): The key the object is copied to.
+        """
+        if str(self.partition or "n").lower()=='y':
+            return dest_key+f"year={datetime.today().strftime('%Y')}/month={datetime.today().strftime('%m')}/day={datetime.today().strftime('%d')}/"
+        return dest_key
+
     def s3_to_s3_copy(self,source_bucket, source_key, dest_bucket, dest_key):
         """
         Copies an object from one S3 location to another S3 location.
@@ -239,13 +1039,11 @@ class S3Operations:
         response (dict): The response from the copy operation.
         """
         try:
-            if self.partition.lower()=='y':
-                object=dest_key+f"year={datetime.today().strftime('%Y')}/month={datetime.today().strftime('%m')}/day={datetime.today().strftime('%d')}/"
-            else:object=dest_key
+            object=self.partition_key(dest_key)
             copy_source = {'Bucket': source_bucket, 'Key': source_key}
             response = self.s3_client.copy_object(CopySource=copy_source, Bucket=dest_bucket, Key=object)
-            self.logger.info(response)
             self.logger.info(f"{source_bucket}{source_key} has been copied to {dest_bucket}{dest_key}")
+            return response
         except Exception as e:
             self.logger.error(f"Failed executing  method in s3_operations class with error --> {e} {traceback.format_exc()}")
             raise
@@ -266,8 +1064,104 @@ class S3Operations:
         try:
             self.s3_to_s3_copy(source_bucket=source_bucket,source_key=source_key,dest_bucket=dest_bucket,dest_key=dest_key)
             response=self.s3_client.delete_object(Bucket=source_bucket, Key=source_key)
-            self.logger.info(response)
             self.logger.info(f"{source_bucket}{source_key} has been deleted")
+            return response
         except Exception as e:
             self.logger.error(f"Failed executing  s3_to_s3_move method in s3_operations class with error --> {e} {traceback.format_exc()}")
             raise
+
+    def copy_one(self, source_bucket, source_key, dest_bucket, dest_key, transfer_config):
+        """
+        Copies one object server side, as a single copy_object call below the multipart threshold and as a multipart copy above it.
+
+        Parameters:
+        source_bucket (str)        : The source bucket name.
+        source_key (str)           : The source object key.
+        dest_bucket (str)          : The destination bucket name.
+        dest_key (str)             : The destination object key.
+        transfer_config (object)   : boto3 TransferConfig with the multipart threshold, part size and concurrency.
+
+        Returns:
+        result (dict) : Result of the copy for the key.
+        """
+        result = {"source": f"{source_bucket}/{source_key}", "destination": f"{dest_bucket}/{dest_key}", "status": "copied", "error": None}
+        try:
+            self.s3_client.copy(CopySource={'Bucket': source_bucket, 'Key': source_key}, Bucket=dest_bucket, Key=dest_key, Config=transfer_config)
+        except Exception as e:
+            result["status"], result["error"] = "copy_failed", str(e)
+            self.logger.error(f"Failed to copy {source_bucket}/{source_key} to {dest_bucket}/{dest_key} with error --> {e}")
+        return result
+
+    def bulk_copy(self, pairs, delete_source=False, max_workers=16, multipart_threshold=1024 * 1024 * 1024, part_size=256 * 1024 * 1024):
+        """
+        Copies many objects concurrently and optionally deletes the copied sources in batches, i.e. a bulk move.
+
+        Parameters:
+        pairs (list)                         : List of (source_bucket, source_key, dest_bucket, dest_key) tuples.
+        delete_source (bool, optional)       : Delete each source once its copy succeeded, by default False.
+        max_workers (int, optional)          : Objects copied in parallel, by default 16.
+        multipart_threshold (int, optional)  : Size in bytes above which an object is copied as multipart, by default 1 GB (copy_object is limited to 5 GB).
+        part_size (int, optional)            : Size in bytes of each copied part, by default 256 MB.
+
+        Returns:
+        report (list) : One dict per pair with source, destination, status (copied / moved / copy_failed / delete_failed) and error.
+
+        Notes:
+        - Destination keys get the same year / month / day partition as s3_to_s3_copy when partitioning is enabled.
+        - Sources are deleted with delete_objects in batches of up to 1000 keys per bucket, only once every copy of the source succeeded.
+          A source listed in several pairs is deleted once and every pair reports the outcome.
+        """
+        try:
+            from boto3.s3.transfer import TransferConfig
+            self.logger.info(f"Performing bulk_copy method for {len(pairs)} objects with {max_workers} threads in s3_operations class")
+            pairs = [(source_bucket, source_key, dest_bucket, self.partition_key(dest_key)) for source_bucket, source_key, dest_bucket, dest_key in pairs]
+            transfer_config = TransferConfig(multipart_threshold=multipart_threshold, multipart_chunksize=part_size, max_concurrency=4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                report = list(executor.map(lambda pair: self.copy_one(*pair, transfer_config), pairs))
+            if delete_source:
+                copied = {}
+                for (source_bucket, source_key, dest_bucket, dest_key), result in zip(pairs, report):
+                    if (source_bucket, source_key) != (dest_bucket, dest_key):
+                        copied.setdefault(source_bucket, {}).setdefault(source_key, []).append(result)
+                for source_bucket, results in copied.items():
+                    keys = []
+                    for key, key_results in results.items():
+                        if all(result["status"] == "copied" for result in key_results):
+                            keys.append(key)
+                        elif any(result["status"] == "copied" for result in key_results):
+                            self.logger.warning(f"{source_bucket}/{key} is kept as one of its copies failed")
+                    for start in range(0, len(keys), 1000):
+                        batch = keys[start:start + 1000]
+                        try:
+                            response = self.s3_client.delete_objects(Bucket=source_bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True})
+                            errors = {error["Key"]: error.get("Message", error.get("Code")) for error in response.get("Errors", [])}
+                        except Exception as e:
+                            errors = {key: str(e) for key in batch}
+                        for key in batch:
+                            for result in results[key]:
+                                if key in errors:
+                                    result["status"], result["error"] = "delete_failed", errors[key]
+                                else:
+                                    result["status"] = "moved"
+                        self.logger.info(f"Deleted {len(batch) - len(errors)} of {len(batch)} source objects in {source_bucket}")
+            statuses = pd.Series([result["status"] for result in report], dtype="object").value_counts().to_dict()
+            self.logger.info(f"bulk_copy completed with {statuses}")
+            return report
+        except Exception as e:
+            self.logger.error(f"Failed executing bulk_copy method in s3_operations class with error --> {e} {traceback.format_exc()}")
+            raise
+
+    def bulk_move(self, pairs, max_workers=16, multipart_threshold=1024 * 1024 * 1024, part_size=256 * 1024 * 1024):
+        """
+        Moves many objects concurrently, copying them and deleting the sources in batches of up to 1000 keys.
+
+        Parameters:
+        pairs (list)                         : List of (source_bucket, source_key, dest_bucket, dest_key) tuples.
+        max_workers (int, optional)          : Objects copied in parallel, by default 16.
+        multipart_threshold (int, optional)  : Size in bytes above which an object is copied as multipart, by default 1 GB.
+        part_size (int, optional)            : Size in bytes of each copied part, by default 256 MB.
+
+        Returns:
+        report (list) : One dict per pair with source, destination, status (moved / copy_failed / delete_failed) and error.
+        """
+        return self.bulk_copy(pairs=pairs, delete_source=True, max_workers=max_workers, multipart_threshold=multipart_threshold, part_size=part_size)
@@ -0,0 +1,161 @@
+#######################################################
+#Name: Kola Devi Revanth
+#Date: 18-10-2026
+#Version : 1.0
+#Version Comments: Initial Version
+#Objective: Schema cache module to keep reflected table metadata (column names and types) in memory and optionally on local disk
+#userstory:
+########################################################
+
+#### Importing Necessary Packages ####
+import os
+import time
+import pickle
+import threading
+
+class SchemaCache:
+    """
+    A class SchemaCache which caches reflected column names and types keyed by schema.table with a TTL
+    """
+    def __init__(self, logger, ttl=3600, cache_dir=None):
+        """
+        The constructor for SchemaCache class
+
+        Parameters:
+        logger (object)       : Logger object where log entries are to be made
+        ttl (int)             : Seconds after which a cached entry expires, by default 3600
+        cache_dir (str)       : Local folder where entries are persisted across runs, by default entries are kept in memory only
+        """
+        self.logger = logger
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.entries = {}
+        self.lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(schema, table_name):
+        """
+        A static method to build the cache key for a table
+
+        Parameters:
+        schema (str)     : Schema name
+        table_name (str) : Table name
+
+        Returns:
+        key (str) : schema.table in lower case
+        """
+        return f"{schema}.{table_name}".lower()
+
+    def file_path(self, key):
+        """
+        A method to return the local file path of a cached entry
+
+        Parameters:
+        key (str) : schema.table cache key
+
+        Returns:
+        path (str) : Path of the pickled entry in cache_dir
+        """
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, schema, table_name):
+        """
+        A method to fetch the cached columns of a table if present and not expired
+
+        Parameters:
+        schema (str)     : Schema name
+        table_name (str) : Table name
+
+        Returns:
+        columns (list) : List of (column name, SQLAlchemy type) tuples or None if not cached / expired
+        """
+        key = self.cache_key(schema, table_name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and self.cache_dir and os.path.exists(self.file_path(key)):
+                try:
+                    with open(self.file_path(key), "rb") as file:
+                        entry = pickle.load(file)
+                    self.entries[key] = entry
+                except Exception as e:
+                    self.logger.warning(f"Unable to read schema cache file for {key}, error --> {e}")
+                    entry = None
+            if entry is None:
+                return None
+            if time.time() - entry["cached_at"] > self.ttl:
+                self.logger.info(f"Schema cache entry for {key} has expired")
+                self.entries.pop(key, None)
+                return None
+            self.logger.info(f"Schema cache hit for {key}")
+            return entry["columns"]
+
+    def put(self, schema, table_name, columns):
+        """
+        A method to store the columns of a table in the cache
+
+        Parameters:
+        schema (str)     : Schema name
+        table_name (str) : Table name
+        columns (list)   : List of (column name, SQLAlchemy type) tuples
+
+        Returns : None
+        """
+        key = self.cache_key(schema, table_name)
+        entry = {"columns": list(columns), "cached_at": time.time()}
+        with self.lock:
+            self.entries[key] = entry
+            if self.cache_dir:
+                try:
+                    temp_path = f"{self.file_path(key)}.{os.getpid()}.tmp"
+                    with open(temp_path, "wb") as file:
+                        pickle.dump(entry, file)
+                    os.replace(temp_path, self.file_path(key))
+                except Exception as e:
+                    self.logger.warning(f"Unable to write schema cache file for {key}, error --> {e}")
+        self.logger.info(f"Schema cache updated for {key}")
+
+    def invalidate(self, schema, table_name=None):
+        """
+        A method to remove a table, or every table of a schema if table_name is not provided, from the cache
+
+        Parameters:
+        schema (str)     : Schema name
+        table_name (str) : Table name, by default None
+
+        Returns : None
+        """
+        prefix = f"{schema}.".lower()
+        with self.lock:
+            if table_name:
+                keys = [self.cache_key(schema, table_name)]
+            else:
+                keys = [key for key in self.entries if key.startswith(prefix)]
+                if self.cache_dir:
+                    keys.extend(file[:-4] for file in os.listdir(self.cache_dir) if file.startswith(prefix) and file.endswith(".pkl"))
+            for key in set(keys):
+                self.entries.pop(key, None)
+                if self.cache_dir and os.path.exists(self.file_path(key)):
+                    os.remove(self.file_path(key))
+        self.logger.info(f"Schema cache invalidated for {schema}.{table_name or '*'}")
+
+caches = {}
+
+def get_schema_cache(logger, ttl=3600, cache_dir=None):
+    """
+    A method to return the process-wide SchemaCache for the cache_dir provided so every Database object shares it
+
+    Parameters:
+    logger (object)       : Logger object where log entries are to be made
+    ttl (int)             : Seconds after which a cached entry expires, by default 3600
+    cache_dir (str)       : Local folder where entries are persisted across runs, by default None
+
+    Returns:
+    cache (SchemaCache) : Shared SchemaCache object
+    """
+    cache = caches.get(cache_dir)
+    if cache is None:
+        cache = caches[cache_dir] = SchemaCache(logger, ttl, cache_dir)
+    cache.logger, cache.ttl = logger, ttl
+    return cache